@@ -0,0 +1,66 @@
+"""Compare the memory held by a Quiz and by a QuestionBank of the same questions.
+
+Usage:
+    python benchmarks/bench_bank.py [QUESTION_COUNT]
+"""
+
+import gc
+import os
+import sys
+import tempfile
+import tracemalloc
+from typing import Any, Callable
+
+from common import make_quiz_text
+
+from text_to_qti.parser.markdown_parser import MarkdownParser
+from text_to_qti.parser.question_bank import QuestionBank
+from text_to_qti.parser.question_models import QuizMetadata
+
+
+def retained(func: Callable[[], Any]) -> int:
+    """Return the bytes still allocated by ``func``'s result once it returns."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = func()
+        gc.collect()
+        size, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del result
+    return size
+
+
+def main() -> None:
+    """Run the question bank benchmark."""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    with tempfile.NamedTemporaryFile(
+        "w", suffix=".txt", encoding="utf-8", delete=False
+    ) as f:
+        f.write(make_quiz_text(count))
+        path = f.name
+
+    try:
+        print(f"{count} questions")
+        parser = MarkdownParser()
+        for label, func in (
+            ("Quiz", lambda: parser.parse_file(path)),
+            (
+                "QuestionBank",
+                lambda: QuestionBank(
+                    QuizMetadata(title="Bank"), parser.iter_questions(path)
+                ),
+            ),
+        ):
+            size = retained(func)
+            print(
+                f"{label:<32} {size / 2**20:>10.1f} MiB held "
+                f"{size / count:>8.0f} B/question"
+            )
+    finally:
+        os.unlink(path)
+
+
+if __name__ == "__main__":
+    main()
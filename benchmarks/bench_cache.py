@@ -0,0 +1,43 @@
+"""Compare parsing a file with loading it from the parse cache.
+
+Usage:
+    python benchmarks/bench_cache.py [QUESTION_COUNT]
+"""
+
+import os
+import sys
+import tempfile
+
+from common import make_quiz_text, measure, report
+
+from text_to_qti.parser.markdown_parser import MarkdownParser
+from text_to_qti.parser.parse_cache import ParseCache
+
+
+def main() -> None:
+    """Run the parse cache benchmark."""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "bank.txt")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(make_quiz_text(count))
+        print(f"{count} questions, {os.path.getsize(path) / 2**20:.1f} MiB file")
+
+        cache = ParseCache(os.path.join(directory, "cache"))
+        uncached = MarkdownParser()
+        cached = MarkdownParser(cache=cache)
+
+        seconds, peak, quiz = measure(lambda: uncached.parse_file(path))
+        report("parse_file", seconds, peak)
+        cached.parse_file(path)
+        seconds, peak, hit = measure(lambda: cached.parse_file(path))
+        report("parse_file (cache hit)", seconds, peak)
+        entry_size = sum(p.stat().st_size for p in cache.directory.iterdir())
+        print(f"cache entry {entry_size / 2**20:.1f} MiB")
+        ignore = {"questions": {"__all__": {"id"}}}
+        same = quiz.model_dump(exclude=ignore) == hit.model_dump(exclude=ignore)
+        print("outputs identical" if same else "OUTPUTS DIFFER")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""Compare the validate-then-parse pipeline with the single-pass check_file.
+
+Usage:
+    python benchmarks/bench_check.py [QUESTION_COUNT]
+"""
+
+import os
+import sys
+import tempfile
+
+from common import make_quiz_text, measure, report
+
+from text_to_qti.parser.markdown_parser import MarkdownParser
+from text_to_qti.parser.syntax_validator import SyntaxValidator
+
+
+def main() -> None:
+    """Run the check benchmark."""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    with tempfile.NamedTemporaryFile(
+        "w", suffix=".txt", encoding="utf-8", delete=False
+    ) as f:
+        f.write(make_quiz_text(count))
+        path = f.name
+
+    try:
+        print(f"{count} questions, {os.path.getsize(path) / 2**20:.1f} MiB file")
+        parser = MarkdownParser()
+        validator = SyntaxValidator()
+
+        def two_pass() -> None:
+            validator.validate_file(path)
+            parser.parse_file(path)
+
+        seconds, peak, _ = measure(two_pass)
+        report("validate_file + parse_file", seconds, peak)
+        seconds, peak, result = measure(lambda: parser.check_file(path))
+        report("check_file", seconds, peak)
+        assert result.ok
+        seconds, peak, _ = measure(lambda: validator.validate_file(path))
+        report("validate_file", seconds, peak)
+        seconds, peak, _ = measure(lambda: parser.check_file(path, build=False))
+        report("check_file(build=False)", seconds, peak)
+    finally:
+        os.unlink(path)
+
+
+if __name__ == "__main__":
+    main()
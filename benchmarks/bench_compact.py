@@ -0,0 +1,70 @@
+"""Compare pretty-printed and compact packages: size and time per 1k items.
+
+Usage:
+    python benchmarks/bench_compact.py [QUESTION_COUNT]
+"""
+
+import os
+import sys
+import tempfile
+import time
+import zipfile
+
+from common import make_quiz_text
+
+from text_to_qti.parser.markdown_parser import MarkdownParser
+from text_to_qti.qti.generator import QTIGenerator
+
+ASSESSMENT = "ASSESSMENT_001/ASSESSMENT_001.xml"
+
+
+def package(quiz, path: str, repeat: int = 3, **options) -> float:
+    """Return the best time to write the package of a quiz."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        QTIGenerator(quiz, **options).generate(path)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    """Run the compact output benchmark."""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5_000
+    quiz = MarkdownParser().parse_content(make_quiz_text(count))
+    per_k = 1000 / count
+    print(f"{count} questions, figures per 1k items")
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "quiz.zip")
+        for renderer in ("lxml", "template"):
+            results = {}
+            for compact in (False, True):
+                seconds = package(quiz, path, renderer=renderer, compact=compact)
+                with zipfile.ZipFile(path) as zf:
+                    raw = zf.getinfo(ASSESSMENT).file_size
+                zipped = os.path.getsize(path)
+                results[compact] = (seconds, raw, zipped)
+                label = f"{renderer} {'compact' if compact else 'pretty'}"
+                print(
+                    f"{label:<20} {seconds * 1000 * per_k:>8.1f} ms "
+                    f"{raw * per_k / 1024:>9.1f} KiB XML "
+                    f"{zipped * per_k / 1024:>8.1f} KiB zipped"
+                )
+            (pretty_s, pretty_raw, pretty_zip), (
+                compact_s,
+                compact_raw,
+                compact_zip,
+            ) = (
+                results[False],
+                results[True],
+            )
+            print(
+                f"{'saved':<20} {(pretty_s - compact_s) * 1000 * per_k:>8.1f} ms "
+                f"{(pretty_raw - compact_raw) * per_k / 1024:>9.1f} KiB XML "
+                f"{(pretty_zip - compact_zip) * per_k / 1024:>8.1f} KiB zipped"
+            )
+
+
+if __name__ == "__main__":
+    main()
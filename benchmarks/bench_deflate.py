@@ -0,0 +1,73 @@
+"""Compare package compression settings: time and size of the packaged quiz.
+
+The assessment is rendered once, so only packaging is timed. Parallel
+compression only pays off with more than one CPU.
+
+Usage:
+    python benchmarks/bench_deflate.py [QUESTION_COUNT]
+"""
+
+import io
+import os
+import sys
+import tempfile
+import time
+
+from common import make_quiz_text
+
+from text_to_qti.packager.zip_creator import ZIPCreator
+from text_to_qti.parser.markdown_parser import MarkdownParser
+from text_to_qti.qti.assessment import AssessmentGenerator
+from text_to_qti.qti.canvas_metadata import CanvasMetadataGenerator
+from text_to_qti.qti.manifest import ManifestGenerator
+
+CONFIGURATIONS = (
+    ("store", {"store": True}),
+    ("level 1", {"compress_level": 1}),
+    ("level 6", {}),
+    ("level 9", {"compress_level": 9}),
+    ("level 6, 2 threads", {"threads": 2}),
+    ("level 6, 4 threads", {"threads": 4}),
+)
+
+
+def package(creator: ZIPCreator, path: str, documents, repeat: int = 3) -> float:
+    """Return the best time to write a package of rendered documents."""
+    manifest, assessment, metadata = documents
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        creator.create_package(
+            path, manifest, lambda entry: entry.write(assessment), metadata
+        )
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    """Run the compression benchmark."""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    quiz = MarkdownParser().parse_content(make_quiz_text(count))
+    output = io.BytesIO()
+    AssessmentGenerator(renderer="template").write(quiz, output)
+    documents = (
+        ManifestGenerator().render(quiz),
+        output.getvalue(),
+        CanvasMetadataGenerator().render(quiz),
+    )
+    size = len(documents[1])
+    print(f"{count} questions, {size / 2**20:.1f} MiB assessment, {os.cpu_count()} CPU")
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "quiz.zip")
+        for label, options in CONFIGURATIONS:
+            seconds = package(ZIPCreator(**options), path, documents)
+            print(
+                f"{label:<24} {seconds * 1000:>8.1f} ms "
+                f"{size / seconds / 2**20:>8.1f} MiB/s "
+                f"{os.path.getsize(path) / 1024:>9.1f} KiB zipped"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""Compare building and rendering the manifest and Canvas metadata documents.
+
+Usage:
+    python benchmarks/bench_documents.py [REPEAT]
+"""
+
+import sys
+import timeit
+
+from text_to_qti.parser.markdown_parser import MarkdownParser
+from text_to_qti.qti.canvas_metadata import CanvasMetadataGenerator
+from text_to_qti.qti.manifest import ManifestGenerator
+from text_to_qti.qti.utils import element_to_string
+
+QUIZ = """---
+title: Small Quiz
+description: One question, as in a per-request conversion
+---
+## Question 1
+[Type: true_false]
+The sky is blue.
+*a) True
+b) False
+"""
+
+
+def main() -> None:
+    """Run the document benchmark."""
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 5_000
+    quiz = MarkdownParser().parse_content(QUIZ)
+    print(f"{repeat} calls per generator")
+
+    for generator in (ManifestGenerator(), CanvasMetadataGenerator()):
+        built = element_to_string(generator.generate(quiz), with_declaration=True)
+        if generator.render(quiz) != built:
+            print("OUTPUTS DIFFER")
+        for label, func in (
+            (
+                "generate + serialize",
+                lambda g=generator: element_to_string(
+                    g.generate(quiz), with_declaration=True
+                ),
+            ),
+            ("render", lambda g=generator: g.render(quiz)),
+        ):
+            seconds = min(timeit.repeat(func, number=repeat, repeat=3))
+            name = f"{type(generator).__name__} {label}"
+            print(f"{name:<48} {seconds / repeat * 1e6:>8.1f} us/call")
+
+
+if __name__ == "__main__":
+    main()
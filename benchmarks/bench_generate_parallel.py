@@ -0,0 +1,45 @@
+"""Compare serial and parallel item generation for a large bank.
+
+Usage:
+    python benchmarks/bench_generate_parallel.py [QUESTION_COUNT] [RENDERER]
+"""
+
+import io
+import os
+import sys
+
+from common import make_quiz_text, measure, report
+
+from text_to_qti.parser.markdown_parser import MarkdownParser
+from text_to_qti.qti.assessment import AssessmentGenerator
+
+
+def main() -> None:
+    """Run the parallel generation benchmark."""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    renderer = sys.argv[2] if len(sys.argv) > 2 else "lxml"
+    quiz = MarkdownParser().parse_content(make_quiz_text(count))
+    print(f"{count} questions, {renderer} renderer, {os.cpu_count()} CPUs")
+
+    outputs = []
+    baseline = None
+    for workers in (1, 2, 4, 8):
+        generator = AssessmentGenerator(renderer=renderer, workers=workers)
+
+        def write() -> bytes:
+            output = io.BytesIO()
+            generator.write(quiz, output)
+            return output.getvalue()
+
+        seconds, peak, data = measure(write, repeat=1)
+        baseline = baseline or seconds
+        report(f"workers={workers}", seconds, peak)
+        print(f"{'':<32} {baseline / seconds:>9.1f}x")
+        outputs.append(data)
+
+    identical = all(data == outputs[0] for data in outputs)
+    print("outputs identical" if identical else "OUTPUTS DIFFER")
+
+
+if __name__ == "__main__":
+    main()
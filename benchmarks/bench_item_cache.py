@@ -0,0 +1,46 @@
+"""Compare writing the assessment with and without a warm item cache.
+
+Usage:
+    python benchmarks/bench_item_cache.py [QUESTION_COUNT]
+"""
+
+import io
+import sys
+
+from common import make_quiz_text, measure, report
+
+from text_to_qti.parser.markdown_parser import MarkdownParser
+from text_to_qti.qti.assessment import AssessmentGenerator
+from text_to_qti.qti.item_cache import ItemCache
+
+
+def main() -> None:
+    """Run the item cache benchmark."""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    quiz = MarkdownParser().parse_content(make_quiz_text(count))
+    cache = ItemCache(max_bytes=2**30)
+    AssessmentGenerator(item_cache=cache).write(quiz, io.BytesIO())
+    print(f"{count} questions")
+
+    outputs = []
+    for label, generator in (
+        ("lxml", AssessmentGenerator()),
+        ("template", AssessmentGenerator(renderer="template")),
+        ("warm item cache", AssessmentGenerator(item_cache=cache)),
+    ):
+
+        def write() -> bytes:
+            output = io.BytesIO()
+            generator.write(quiz, output)
+            return output.getvalue()
+
+        seconds, peak, data = measure(write)
+        report(label, seconds, peak)
+        outputs.append(data)
+
+    identical = all(data == outputs[0] for data in outputs)
+    print("outputs identical" if identical else "OUTPUTS DIFFER")
+
+
+if __name__ == "__main__":
+    main()
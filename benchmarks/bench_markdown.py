@@ -0,0 +1,41 @@
+"""Compare ways of rendering question text and feedback from Markdown.
+
+Usage:
+    python benchmarks/bench_markdown.py [QUESTION_COUNT]
+"""
+
+import sys
+
+import markdown
+from common import make_quiz_text, measure, report
+
+from text_to_qti.parser.markdown_parser import MarkdownParser
+from text_to_qti.parser.markdown_renderer import EXTENSIONS, MarkdownRenderer
+
+
+def main() -> None:
+    """Run the Markdown rendering benchmark."""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000
+    quiz = MarkdownParser().parse_content(make_quiz_text(count))
+    texts = [question.text for question in quiz.questions] + [
+        question.feedback for question in quiz.questions if question.feedback
+    ]
+    print(f"{count} questions, {len(texts)} texts, {len(set(texts))} unique")
+
+    def converter_per_text() -> None:
+        for text in texts:
+            markdown.Markdown(extensions=list(EXTENSIONS)).convert(text)
+
+    warm = MarkdownRenderer(cache_size=len(texts))
+    warm.render_quiz(quiz)
+    for label, func in (
+        ("converter per text", converter_per_text),
+        ("one converter", lambda: MarkdownRenderer(cache_size=0).render_quiz(quiz)),
+        ("one converter, cached", lambda: warm.render_quiz(quiz)),
+    ):
+        seconds, peak, _ = measure(func)
+        report(label, seconds, peak)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""Compare packaging a quiz whose images are stored with deflating them.
+
+Images are random bytes, as incompressible as PNG or JPEG data. Every
+question references one of them, so each is hashed and bundled once.
+
+Usage:
+    python benchmarks/bench_media.py [IMAGE_COUNT] [IMAGE_MIB]
+"""
+
+import itertools
+import os
+import re
+import sys
+import tempfile
+
+from common import make_quiz_text, measure, report
+
+from text_to_qti.parser.markdown_parser import MarkdownParser
+from text_to_qti.qti.generator import QTIGenerator
+from text_to_qti.qti.media import MediaResolver
+
+
+def main() -> None:
+    """Run the media bundling benchmark."""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    size = int(float(sys.argv[2]) * 2**20) if len(sys.argv) > 2 else 2**21
+    print(f"{count} images of {size / 2**20:.1f} MiB, 1000 questions")
+
+    with tempfile.TemporaryDirectory() as directory:
+        for n in range(count):
+            data = os.urandom(size)
+            for suffix in (".png", ".dat"):
+                with open(os.path.join(directory, f"image{n}{suffix}"), "wb") as f:
+                    f.write(data)
+
+        text = make_quiz_text(1000)
+        path = os.path.join(directory, "quiz.zip")
+        for label, suffix in (("stored (.png)", ".png"), ("deflated (.dat)", ".dat")):
+            numbers = itertools.count()
+            quiz = MarkdownParser().parse_content(
+                re.sub(
+                    "Consider every choice carefully.",
+                    lambda _: f'<img src="image{next(numbers) % count}{suffix}">',
+                    text,
+                )
+            )
+
+            def package() -> None:
+                QTIGenerator(
+                    quiz, renderer="template", media=MediaResolver(directory)
+                ).generate(path)
+
+            seconds, peak, _ = measure(package)
+            report(label, seconds, peak)
+            print(f"{'':<24} {os.path.getsize(path) / 2**20:>8.1f} MiB zipped")
+
+
+if __name__ == "__main__":
+    main()
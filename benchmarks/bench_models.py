@@ -0,0 +1,95 @@
+"""Compare validated and trusted construction of the question models.
+
+Usage:
+    python benchmarks/bench_models.py [QUESTION_COUNT]
+"""
+
+import sys
+
+from common import make_quiz_text, measure, report
+
+from text_to_qti.parser.markdown_parser import MarkdownParser
+from text_to_qti.parser.question_models import (
+    AnswerChoice,
+    Question,
+    construct_trusted,
+)
+
+
+def main() -> None:
+    """Run the model construction benchmark."""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    quiz = MarkdownParser().parse_content(make_quiz_text(count))
+    rows = [
+        (q.id, q.type, q.text, [(c.letter, c.text, c.is_correct) for c in q.choices])
+        for q in quiz.questions
+    ]
+    print(f"{count} questions")
+
+    def validated() -> list:
+        return [
+            Question(
+                id=question_id,
+                type=question_type,
+                text=text,
+                choices=[
+                    AnswerChoice(letter=letter, text=answer, is_correct=correct)
+                    for letter, answer, correct in choices
+                ],
+            )
+            for question_id, question_type, text, choices in rows
+        ]
+
+    def model_construct() -> list:
+        return [
+            Question.model_construct(
+                id=question_id,
+                type=question_type,
+                text=text,
+                choices=[
+                    AnswerChoice.model_construct(
+                        letter=letter, text=answer, is_correct=correct
+                    )
+                    for letter, answer, correct in choices
+                ],
+            )
+            for question_id, question_type, text, choices in rows
+        ]
+
+    def trusted() -> list:
+        return [
+            construct_trusted(
+                Question,
+                {
+                    "id": question_id,
+                    "type": question_type,
+                    "text": text,
+                    "choices": [
+                        construct_trusted(
+                            AnswerChoice,
+                            {"letter": letter, "text": answer, "is_correct": correct},
+                        )
+                        for letter, answer, correct in choices
+                    ],
+                    "points": 1,
+                    "feedback": None,
+                },
+            )
+            for question_id, question_type, text, choices in rows
+        ]
+
+    results = []
+    for label, func in (
+        ("validated", validated),
+        ("model_construct", model_construct),
+        ("construct_trusted", trusted),
+    ):
+        seconds, peak, questions = measure(func)
+        report(label, seconds, peak)
+        results.append(questions)
+
+    print("outputs identical" if results[0] == results[2] else "OUTPUTS DIFFER")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""Compare packaging a course's quizzes one ZIP each and all in one ZIP.
+
+Usage:
+    python benchmarks/bench_multi.py [QUIZ_COUNT] [QUESTIONS_PER_QUIZ] [WORKERS]
+"""
+
+import os
+import sys
+import tempfile
+
+from common import make_quiz_text, measure, report
+
+from text_to_qti.parser.markdown_parser import MarkdownParser
+from text_to_qti.qti.generator import QTIGenerator
+from text_to_qti.qti.package_builder import PackageBuilder
+
+
+def main() -> None:
+    """Run the multi-assessment package benchmark."""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 40
+    size = int(sys.argv[2]) if len(sys.argv) > 2 else 250
+    workers = int(sys.argv[3]) if len(sys.argv) > 3 else os.cpu_count() or 1
+    quiz = MarkdownParser().parse_content(make_quiz_text(size))
+    quizzes = [quiz] * count
+    print(f"{count} quizzes of {size} questions, {workers} worker(s)")
+
+    with tempfile.TemporaryDirectory() as directory:
+
+        def separate() -> None:
+            for n, quiz in enumerate(quizzes):
+                QTIGenerator(quiz, renderer="template").generate(
+                    os.path.join(directory, f"quiz{n}.zip")
+                )
+
+        path = os.path.join(directory, "course.zip")
+        for label, func in (
+            ("one ZIP per quiz", separate),
+            (
+                "one ZIP",
+                lambda: PackageBuilder(quizzes, renderer="template").generate(path),
+            ),
+            (
+                f"one ZIP, {workers} workers",
+                lambda: PackageBuilder(
+                    quizzes, renderer="template", workers=workers
+                ).generate(path),
+            ),
+        ):
+            seconds, peak, _ = measure(func)
+            report(label, seconds, peak)
+
+
+if __name__ == "__main__":
+    main()
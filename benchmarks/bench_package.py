@@ -0,0 +1,69 @@
+"""Compare building the assessment as a tree with streaming it into the ZIP.
+
+lxml allocates outside the Python heap, so memory is measured as the growth
+of RSS to its peak while packaging, in a fresh process per mode (Unix only).
+
+Usage:
+    python benchmarks/bench_package.py [QUESTION_COUNT]
+"""
+
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+from common import make_quiz_text
+
+from text_to_qti.parser.markdown_parser import MarkdownParser
+from text_to_qti.parser.question_bank import QuestionBank
+from text_to_qti.qti.generator import QTIGenerator
+
+
+def peak_rss() -> int:
+    """Return the peak resident set size of this process in bytes."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def current_rss() -> int:
+    """Return the resident set size of this process in bytes."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        # Without procfs the growth is only measured past earlier peaks
+        return peak_rss()
+
+
+def run(mode: str, count: int) -> None:
+    """Package a synthetic bank in one mode and print time and RSS growth."""
+    quiz = MarkdownParser().parse_content(make_quiz_text(count))
+    # Keep the bank compact so the quiz does not dominate the measurement
+    bank = QuestionBank.from_quiz(quiz)
+    del quiz
+    with tempfile.TemporaryDirectory() as directory:
+        generator = QTIGenerator(bank, streaming=mode == "streaming")
+        before = current_rss()
+        start = time.perf_counter()
+        generator.generate(os.path.join(directory, "out.zip"))
+        seconds = time.perf_counter() - start
+        growth = peak_rss() - before
+    print(f"{mode:<32} {seconds * 1000:>10.1f} ms {growth / 2**20:>10.1f} MiB RSS")
+
+
+def main() -> None:
+    """Run the packaging benchmark, one subprocess per mode."""
+    if len(sys.argv) > 2:
+        run(sys.argv[2], int(sys.argv[1]))
+        return
+
+    count = sys.argv[1] if len(sys.argv) > 1 else "50000"
+    print(f"{count} questions")
+    for mode in ("tree", "streaming"):
+        subprocess.run([sys.executable, __file__, count, mode], check=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""Time parse_file with increasing numbers of worker processes.
+
+Peak memory is traced in the parent process only.
+
+Usage:
+    python benchmarks/bench_parallel.py [QUESTION_COUNT] [WORKERS ...]
+"""
+
+import os
+import sys
+import tempfile
+
+from common import make_quiz_text, measure, report
+
+from text_to_qti.parser.markdown_parser import MarkdownParser
+
+
+def main() -> None:
+    """Run the parallel parsing benchmark."""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    worker_counts = [int(arg) for arg in sys.argv[2:]] or [1, 2, 4, 8]
+    with tempfile.NamedTemporaryFile(
+        "w", suffix=".txt", encoding="utf-8", delete=False
+    ) as f:
+        f.write(make_quiz_text(count))
+        path = f.name
+
+    try:
+        print(f"{count} questions, {os.path.getsize(path) / 2**20:.1f} MiB file")
+        parser = MarkdownParser()
+        baseline = None
+        for workers in worker_counts:
+            seconds, peak, quiz = measure(
+                lambda: parser.parse_file(path, workers=workers), repeat=1
+            )
+            report(f"{workers} worker(s)", seconds, peak)
+            if baseline is None:
+                baseline = quiz
+            assert quiz == baseline, "parallel parse produced a different quiz"
+        print("outputs identical")
+    finally:
+        os.unlink(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+"""Benchmark the tokenizer-based parser against the regex reference parser.
+
+Usage:
+    python benchmarks/bench_parser.py [QUESTION_COUNT]
+"""
+
+import sys
+from pathlib import Path
+
+from common import make_quiz_text, measure, report
+
+from text_to_qti.parser.markdown_parser import MarkdownParser
+
+# The reference parser lives with the tests, outside the installed package
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from tests.test_parser.regex_parser import RegexMarkdownParser  # noqa: E402
+
+
+def main() -> None:
+    """Run the parser benchmark."""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    content = make_quiz_text(count)
+    print(f"{count} questions, {len(content) / 2**20:.1f} MiB of text")
+
+    results = {}
+    for label, parser in (
+        ("regex (reference)", RegexMarkdownParser()),
+        ("tokenizer", MarkdownParser()),
+    ):
+        seconds, peak, quiz = measure(lambda: parser.parse_content(content))
+        report(label, seconds, peak)
+        results[label] = quiz
+
+    reference, tokenized = results.values()
+    assert reference == tokenized, "parsers produced different quizzes"
+    print("outputs identical")
+
+
+if __name__ == "__main__":
+    main()
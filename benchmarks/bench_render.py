@@ -0,0 +1,40 @@
+"""Compare writing the assessment XML with the lxml and template renderers.
+
+Usage:
+    python benchmarks/bench_render.py [QUESTION_COUNT]
+"""
+
+import io
+import sys
+
+from common import make_quiz_text, measure, report
+
+from text_to_qti.parser.markdown_parser import MarkdownParser
+from text_to_qti.qti.assessment import AssessmentGenerator
+
+
+def main() -> None:
+    """Run the renderer benchmark."""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    quiz = MarkdownParser().parse_content(make_quiz_text(count))
+    print(f"{count} questions")
+
+    outputs = []
+    for renderer in ("lxml", "template"):
+        generator = AssessmentGenerator(renderer=renderer)
+
+        def write() -> bytes:
+            output = io.BytesIO()
+            generator.write(quiz, output)
+            return output.getvalue()
+
+        seconds, peak, data = measure(write)
+        report(renderer, seconds, peak)
+        print(f"{'':<32} {count / seconds:>10.0f} items/s")
+        outputs.append(data)
+
+    print("outputs identical" if outputs[0] == outputs[1] else "OUTPUTS DIFFER")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+"""Measure the start-up time of the CLI in fresh interpreters.
+
+Usage:
+    python benchmarks/bench_startup.py [RUNS]
+"""
+
+import subprocess
+import sys
+import time
+
+# What each run imports: the CLI alone, as for --help, and the modules the
+# convert command loads once it runs
+TARGETS = (
+    ("import text_to_qti.cli", "import text_to_qti.cli"),
+    (
+        "import text_to_qti.cli + convert modules",
+        "import text_to_qti.cli, text_to_qti.parser.markdown_parser, "
+        "text_to_qti.qti.sharding, rich.progress",
+    ),
+)
+
+
+def main() -> None:
+    """Run the start-up benchmark."""
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    subprocess.run([sys.executable, "-c", "pass"], check=True)
+    for label, code in TARGETS:
+        best = float("inf")
+        for _ in range(runs):
+            start = time.perf_counter()
+            subprocess.run([sys.executable, "-c", code], check=True)
+            best = min(best, time.perf_counter() - start)
+        print(f"{label:45s} {best * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""Compare peak memory of parse_file and the streaming iter_questions API.
+
+Usage:
+    python benchmarks/bench_streaming.py [QUESTION_COUNT]
+"""
+
+import os
+import sys
+import tempfile
+
+from common import make_quiz_text, measure, report
+
+from text_to_qti.parser.markdown_parser import MarkdownParser
+
+
+def main() -> None:
+    """Run the streaming benchmark."""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    with tempfile.NamedTemporaryFile(
+        "w", suffix=".txt", encoding="utf-8", delete=False
+    ) as f:
+        f.write(make_quiz_text(count))
+        path = f.name
+
+    try:
+        print(f"{count} questions, {os.path.getsize(path) / 2**20:.1f} MiB file")
+        parser = MarkdownParser()
+
+        seconds, peak, _ = measure(lambda: parser.parse_file(path), repeat=1)
+        report("parse_file", seconds, peak)
+
+        def consume() -> int:
+            total = 0
+            for question in parser.iter_questions(path):
+                total += question.points
+            return total
+
+        seconds, peak, _ = measure(consume, repeat=1)
+        report("iter_questions", seconds, peak)
+    finally:
+        os.unlink(path)
+
+
+if __name__ == "__main__":
+    main()
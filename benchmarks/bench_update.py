@@ -0,0 +1,39 @@
+"""Compare rebuilding a package with updating it after a description change.
+
+The quiz is re-rendered every time; only the assessment's compression is
+skipped when the package is updated.
+
+Usage:
+    python benchmarks/bench_update.py [QUESTION_COUNT]
+"""
+
+import os
+import sys
+import tempfile
+
+from common import make_quiz_text, measure, report
+
+from text_to_qti.parser.markdown_parser import MarkdownParser
+from text_to_qti.qti.generator import QTIGenerator
+
+
+def main() -> None:
+    """Run the package update benchmark."""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    quiz = MarkdownParser().parse_content(make_quiz_text(count))
+    edited = quiz.model_copy(
+        update={"metadata": quiz.metadata.model_copy(update={"description": "Edited"})}
+    )
+    print(f"{count} questions, description changed between builds")
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "quiz.zip")
+        QTIGenerator(quiz, renderer="template").generate(path)
+        for label, update in (("rebuild", False), ("update", True)):
+            generator = QTIGenerator(edited, renderer="template", update=update)
+            seconds, peak, _ = measure(lambda: generator.generate(path))
+            report(label, seconds, peak)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""Compare a full rebuild with the incremental rebuild of the watch command.
+
+One question of the bank is edited before each rebuild.
+
+Usage:
+    python benchmarks/bench_watch.py [QUESTION_COUNT]
+"""
+
+import os
+import sys
+import tempfile
+import time
+from typing import Callable
+
+from common import make_quiz_text
+
+from text_to_qti.parser.markdown_parser import MarkdownParser
+from text_to_qti.qti.generator import QTIGenerator
+
+
+def best_of(rebuild: Callable[[str], None], content: str, runs: int = 5) -> float:
+    """Return the best time of ``rebuild`` on alternating edits of ``content``."""
+    edits = [
+        content.replace("item 7?", f"item 7 (revision {run})?") for run in range(runs)
+    ]
+    rebuild(content)
+    best = float("inf")
+    for edited in edits:
+        start = time.perf_counter()
+        rebuild(edited)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    """Run the watch benchmark."""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000
+    content = make_quiz_text(count)
+    print(f"{count} questions, one edited per rebuild")
+
+    with tempfile.TemporaryDirectory() as directory:
+        output = os.path.join(directory, "out.zip")
+
+        def full(text: str) -> None:
+            QTIGenerator(MarkdownParser().parse_content(text)).generate(output)
+
+        parser = MarkdownParser()
+        generator = QTIGenerator(parser.reparse_content(content), reuse_items=True)
+
+        def incremental(text: str) -> None:
+            generator.quiz = parser.reparse_content(text)
+            generator.generate(output)
+
+        for label, rebuild in (("full rebuild", full), ("incremental", incremental)):
+            seconds = best_of(rebuild, content)
+            print(f"{label:<32} {seconds * 1000:>10.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
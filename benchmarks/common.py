@@ -0,0 +1,85 @@
+"""Shared helpers for the benchmark scripts."""
+
+import time
+import tracemalloc
+from typing import Any, Callable, Tuple
+
+
+def make_quiz_text(count: int) -> str:
+    """Build a synthetic quiz with ``count`` questions of mixed types.
+
+    Args:
+        count: Number of questions to generate
+
+    Returns:
+        Quiz content as string
+    """
+    parts = [
+        "---\n"
+        "title: Benchmark Bank\n"
+        "description: Synthetic questions for benchmarking\n"
+        "points_per_question: 1\n"
+        "---\n"
+    ]
+    for n in range(1, count + 1):
+        if n % 3:
+            parts.append(
+                f"\n## Question {n}\n"
+                "[Type: multiple_choice]\n"
+                f"[Points: {n % 4 + 1}]\n"
+                f"[ID: Q{n:06d}]\n"
+                "\n"
+                f"Which option is correct for item {n}?\n"
+                "Consider every choice carefully.\n"
+                "\n"
+                "a) First option\n"
+                "*b) Second option\n"
+                "c) Third option\n"
+                "d) Fourth option\n"
+                "\n"
+                f"Feedback: The second option is correct for item {n}.\n"
+            )
+        else:
+            parts.append(
+                f"\n## Question {n}\n"
+                "[Type: true_false]\n"
+                f"[ID: Q{n:06d}]\n"
+                "\n"
+                f"Statement {n} is true.\n"
+                "\n"
+                "*a) True\n"
+                "b) False\n"
+            )
+    return "".join(parts)
+
+
+def measure(func: Callable[[], Any], repeat: int = 3) -> Tuple[float, int, Any]:
+    """Run ``func`` and report its best wall time and peak traced memory.
+
+    Args:
+        func: Zero-argument callable to benchmark
+        repeat: Number of timed runs
+
+    Returns:
+        Tuple of (best seconds, peak bytes, last result)
+    """
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return best, peak, result
+
+
+def report(label: str, seconds: float, peak: int) -> None:
+    """Print one benchmark result line."""
+    print(f"{label:<32} {seconds * 1000:>10.1f} ms {peak / 2**20:>10.1f} MiB peak")
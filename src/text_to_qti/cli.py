@@ -1,24 +1,109 @@
 """CLI for text-to-QTI converter."""
 
+import os
+import re
 import sys
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, ContextManager, List, Optional, Tuple, Union
 
 import click
-from rich.console import Console
-from rich.progress import Progress
 
-from text_to_qti.parser.markdown_parser import MarkdownParser
-from text_to_qti.parser.syntax_validator import SyntaxValidator
-from text_to_qti.qti.generator import QTIGenerator
-from text_to_qti.utils.errors import TextToQTIError
+from text_to_qti.utils.errors import TextToQTIError, ValidationError
 
-console = Console()
+# Commands import the parser, generators and rich when they run, so that
+# starting the CLI, e.g. for --help or --version, loads none of them
+if TYPE_CHECKING:
+    from rich.console import Console
+
+    from text_to_qti.parser.markdown_parser import MarkdownParser
+    from text_to_qti.qti.generator import QTIGenerator
+
+# Rich markup of the style a message starts with, dropped in plain output
+_STYLE = re.compile(r"^\[(?:cyan|green|red|yellow)\]")
+
+
+class _Output:
+    """Messages and progress of the commands.
+
+    Written through rich, unless plain output is chosen: messages are then
+    printed without markup, progress is not shown, and rich is never
+    imported.
+    """
+
+    def __init__(self) -> None:
+        """Initialize output, creating the rich console on first use."""
+        self.plain = False
+        # Whether messages go to stderr, as when stdout carries the package
+        self.stderr = False
+        self._console: Optional["Console"] = None
+
+    @property
+    def console(self) -> "Console":
+        """The rich console."""
+        if self._console is None:
+            from rich.console import Console
+
+            self._console = Console()
+        self._console.stderr = self.stderr
+        return self._console
+
+    def print(self, message: str) -> None:
+        """Print a message with rich markup.
+
+        Args:
+            message: Message, optionally starting with a style such as [red]
+        """
+        if self.plain:
+            click.echo(_STYLE.sub("", message), err=self.stderr)
+        else:
+            self.console.print(message)
+
+    def progress(self) -> ContextManager[Any]:
+        """Return a rich Progress, or a stand-in showing nothing if plain."""
+        if self.plain:
+            return _NoProgress()
+        from rich.progress import Progress
+
+        return Progress(console=self.console)
+
+
+class _NoProgress:
+    """Stand-in for rich.progress.Progress that shows nothing."""
+
+    def __enter__(self) -> "_NoProgress":
+        """Start showing progress."""
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        """Stop showing progress."""
+
+    def add_task(self, description: str, total: float) -> int:
+        """Add a task, returning its ID."""
+        return 0
+
+    def update(self, task: int, description: str) -> None:
+        """Update the description of a task."""
+
+    def advance(self, task: int) -> None:
+        """Advance a task by one step."""
+
+
+console = _Output()
 
 
 @click.group()
 @click.version_option()
-def cli() -> None:
+@click.option(
+    "--plain",
+    is_flag=True,
+    envvar="TEXT_TO_QTI_PLAIN",
+    help="Print plain messages without colour or progress bars, for scripts "
+    "and hooks (or set TEXT_TO_QTI_PLAIN=1)",
+)
+def cli(plain: bool) -> None:
     """Text to QTI Converter - Convert markdown quizzes to QTI format for Canvas."""
-    pass
+    console.plain = plain
 
 
 @cli.command()
@@ -26,8 +111,8 @@ def cli() -> None:
 @click.option(
     "--output",
     "-o",
-    type=click.Path(),
-    help="Output ZIP file path (default: output.zip)",
+    type=click.Path(allow_dash=True),
+    help="Output ZIP file path, or - for stdout (default: output.zip)",
 )
 @click.option(
     "--validate-only",
@@ -40,58 +125,230 @@ def cli() -> None:
     default="1.2",
     help="QTI version to generate",
 )
+@click.option(
+    "--all-errors",
+    is_flag=True,
+    help="Report every validation error instead of only the first",
+)
+@click.option(
+    "--content-ids",
+    is_flag=True,
+    help="Derive missing question IDs from question content instead of randomly",
+)
+@click.option(
+    "--cache-dir",
+    type=click.Path(file_okay=False),
+    envvar="TEXT_TO_QTI_CACHE_DIR",
+    help="Directory to cache parsed quizzes and rendered items in, to skip "
+    "work on unchanged files and questions",
+)
+@click.option(
+    "--stream",
+    is_flag=True,
+    help="Stream questions into the package to keep memory flat for large quizzes",
+)
+@click.option(
+    "--workers",
+    type=click.IntRange(min=1),
+    default=1,
+    help="Number of processes to parse and generate large quizzes with, "
+    "and of threads to compress the package with",
+)
+@click.option(
+    "--renderer",
+    type=click.Choice(["lxml", "template"]),
+    default="lxml",
+    help="How the assessment XML is rendered; template is faster, same output",
+)
+@click.option(
+    "--compact",
+    is_flag=True,
+    help="Write XML without indentation, for smaller and faster packages",
+)
+@click.option(
+    "--compress-level",
+    type=click.IntRange(0, 9),
+    default=6,
+    help="DEFLATE level of the package, from 0 (fastest) to 9 (smallest)",
+)
+@click.option(
+    "--store",
+    is_flag=True,
+    help="Store the package uncompressed, for local pipelines",
+)
+@click.option(
+    "--reproducible",
+    is_flag=True,
+    help="Write byte-identical packages for identical input and options "
+    "(implies --content-ids; honours SOURCE_DATE_EPOCH)",
+)
+@click.option(
+    "--shard-items",
+    type=click.IntRange(min=1),
+    help="Split the quiz into packages of at most this many questions",
+)
+@click.option(
+    "--shard-bytes",
+    type=click.IntRange(min=1),
+    help="Split the quiz into packages of at most this many bytes of assessment XML",
+)
+@click.option(
+    "--update",
+    is_flag=True,
+    help="Update an existing package, reusing the compressed entries that "
+    "did not change",
+)
+@click.option(
+    "--bundle-media",
+    is_flag=True,
+    help="Bundle the images referenced in questions and feedback, resolved "
+    "relative to the input file",
+)
+@click.option(
+    "--markdown",
+    is_flag=True,
+    help="Render question text and feedback from Markdown to HTML",
+)
 def convert(
-    input_file: str, output: str, validate_only: bool, qti_version: str
+    input_file: str,
+    output: str,
+    validate_only: bool,
+    qti_version: str,
+    all_errors: bool,
+    content_ids: bool,
+    cache_dir: Optional[str],
+    stream: bool,
+    workers: int,
+    renderer: str,
+    compact: bool,
+    compress_level: int,
+    store: bool,
+    reproducible: bool,
+    shard_items: Optional[int],
+    shard_bytes: Optional[int],
+    update: bool,
+    bundle_media: bool,
+    markdown: bool,
 ) -> None:
     """Convert a text file to QTI package."""
+    from text_to_qti.parser.markdown_parser import MarkdownParser
+    from text_to_qti.parser.parse_cache import ParseCache
+    from text_to_qti.qti.generator import QTIGenerator
+    from text_to_qti.qti.item_cache import ItemCache
+    from text_to_qti.qti.media import MediaResolver
+    from text_to_qti.qti.sharding import ShardedGenerator, summary_path
+
+    # Messages go to stderr when stdout carries the package
+    to_stdout = output == "-"
+    console.stderr = to_stdout
+    sharded = shard_items is not None or shard_bytes is not None
+    if sharded and to_stdout:
+        console.print("[red]✗ Error: Sharded packages cannot be written to stdout")
+        sys.exit(1)
     try:
-        with Progress() as progress:
-            task = progress.add_task("Processing...", total=4)
+        with console.progress() as progress:
+            task = progress.add_task("Processing...", total=3)
 
-            # Step 1: Validate
-            progress.update(task, description="[cyan]Validating syntax...")
-            validator = SyntaxValidator()
-            try:
-                validator.validate_file(input_file)
-            except TextToQTIError as e:
-                console.print(f"[red]✗ Validation Error: {e}")
+            # Step 1: Validate and parse in a single pass
+            progress.update(task, description="[cyan]Validating and parsing...")
+            cache = ParseCache(cache_dir) if cache_dir else None
+            parser = MarkdownParser(
+                content_ids=content_ids or reproducible, cache=cache
+            )
+            result = parser.check_file(
+                input_file, build=not validate_only, workers=workers
+            )
+            if result.diagnostics:
+                _print_diagnostics(result.diagnostics, all_errors)
                 sys.exit(1)
             progress.advance(task)
 
             if validate_only:
                 console.print("[green]✓ Validation successful!")
                 return
+            # The quiz is always built when there are no diagnostics
+            quiz = result.quiz
+            assert quiz is not None
 
-            # Step 2: Parse
-            progress.update(task, description="[cyan]Parsing questions...")
-            parser = MarkdownParser()
-            try:
-                quiz = parser.parse_file(input_file)
-            except TextToQTIError as e:
-                console.print(f"[red]✗ Parse Error: {e}")
-                sys.exit(1)
-            progress.advance(task)
-
-            # Step 3: Generate QTI
+            # Step 2: Generate QTI
             progress.update(task, description="[cyan]Generating QTI XML...")
             try:
-                generator = QTIGenerator(quiz, version=qti_version)
+                item_cache = (
+                    ItemCache(directory=Path(cache_dir) / "items")
+                    if cache_dir
+                    else None
+                )
+                media = MediaResolver(Path(input_file).parent) if bundle_media else None
+                markdown_renderer = parser.renderer if markdown else None
+                generator: Union[QTIGenerator, ShardedGenerator]
+                if sharded:
+                    generator = ShardedGenerator(
+                        quiz,
+                        max_items=shard_items,
+                        max_bytes=shard_bytes,
+                        version=qti_version,
+                        streaming=stream,
+                        workers=workers,
+                        renderer=renderer,
+                        item_cache=item_cache,
+                        compact=compact,
+                        compress_level=compress_level,
+                        store=store,
+                        reproducible=reproducible,
+                        update=update,
+                        media=media,
+                        markdown=markdown_renderer,
+                    )
+                else:
+                    generator = QTIGenerator(
+                        quiz,
+                        version=qti_version,
+                        streaming=stream,
+                        renderer=renderer,
+                        item_cache=item_cache,
+                        workers=workers,
+                        compact=compact,
+                        compress_level=compress_level,
+                        store=store,
+                        compress_threads=workers,
+                        reproducible=reproducible,
+                        update=update,
+                        media=media,
+                        markdown=markdown_renderer,
+                    )
             except TextToQTIError as e:
                 console.print(f"[red]✗ Generation Error: {e}")
                 sys.exit(1)
             progress.advance(task)
 
-            # Step 4: Package
+            # Step 3: Package
             progress.update(task, description="[cyan]Creating ZIP package...")
-            output_path = output or "output.zip"
             try:
-                result_path = generator.generate(output_path)
-            except TextToQTIError as e:
+                if isinstance(generator, ShardedGenerator):
+                    summary = generator.generate(output or "output.zip")
+                    result_path = str(summary_path(output or "output.zip"))
+                elif to_stdout:
+                    generator.generate(sys.stdout.buffer)
+                    sys.stdout.buffer.flush()
+                    result_path = "stdout"
+                else:
+                    result_path = str(generator.generate(output or "output.zip"))
+            except (OSError, TextToQTIError) as e:
                 console.print(f"[red]✗ Error: {e}")
                 sys.exit(1)
             progress.advance(task)
 
-        console.print(f"[green]✓ QTI package created: {result_path}")
+        if isinstance(generator, ShardedGenerator):
+            for shard in summary.shards:
+                console.print(
+                    f"[green]✓ QTI package created: {shard.path} "
+                    f"({len(shard.question_ids)} questions)"
+                )
+            for path in summary.removed:
+                console.print(f"[yellow]Removed stale shard: {path}")
+            console.print(f"[yellow]Shard summary: {result_path}")
+        else:
+            console.print(f"[green]✓ QTI package created: {result_path}")
         console.print(f"[yellow]Total questions: {len(quiz.questions)}")
         console.print(f"[yellow]Total points: {quiz.get_total_points()}")
 
@@ -105,16 +362,152 @@ def convert(
 
 @cli.command()
 @click.argument("input_file", type=click.Path(exists=True))
-def validate(input_file: str) -> None:
+@click.option(
+    "--all-errors",
+    is_flag=True,
+    help="Report every validation error instead of only the first",
+)
+def validate(input_file: str, all_errors: bool) -> None:
     """Validate a text file syntax."""
+    from text_to_qti.parser.markdown_parser import MarkdownParser
+
     try:
-        validator = SyntaxValidator()
-        validator.validate_file(input_file)
+        result = MarkdownParser().check_file(input_file, build=False)
+        if result.diagnostics:
+            _print_diagnostics(result.diagnostics, all_errors)
+            sys.exit(1)
         console.print("[green]✓ Validation successful!")
     except TextToQTIError as e:
         console.print(f"[red]✗ Validation Error: {e}")
         sys.exit(1)
 
 
+@cli.command()
+@click.argument("input_file", type=click.Path(exists=True))
+@click.option(
+    "--output",
+    "-o",
+    type=click.Path(),
+    help="Output ZIP file path (default: output.zip)",
+)
+@click.option(
+    "--qti-version",
+    type=click.Choice(["1.2", "2.1"]),
+    default="1.2",
+    help="QTI version to generate",
+)
+@click.option(
+    "--content-ids",
+    is_flag=True,
+    help="Derive missing question IDs from question content instead of randomly",
+)
+@click.option(
+    "--interval",
+    type=click.FloatRange(min=0.01),
+    default=0.5,
+    help="Seconds between checks for changes (default: 0.5)",
+)
+def watch(
+    input_file: str,
+    output: str,
+    qti_version: str,
+    content_ids: bool,
+    interval: float,
+) -> None:
+    """Rebuild the QTI package whenever a text file changes."""
+    from text_to_qti.parser.markdown_parser import MarkdownParser
+
+    output_path = output or "output.zip"
+    parser = MarkdownParser(content_ids=content_ids)
+    generator: Optional["QTIGenerator"] = None
+    last_seen: Optional[Tuple[int, int]] = None
+
+    console.print(f"[cyan]Watching {input_file} (press Ctrl+C to stop)")
+    try:
+        while True:
+            try:
+                stat = os.stat(input_file)
+            except OSError:
+                # Editors may briefly remove the file while saving it
+                pass
+            else:
+                if (stat.st_mtime_ns, stat.st_size) != last_seen:
+                    last_seen = (stat.st_mtime_ns, stat.st_size)
+                    generator = _rebuild(
+                        parser, generator, input_file, output_path, qti_version
+                    )
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        console.print("[yellow]Stopped watching")
+
+
+def _rebuild(
+    parser: "MarkdownParser",
+    generator: Optional["QTIGenerator"],
+    input_file: str,
+    output_path: str,
+    qti_version: str,
+) -> Optional["QTIGenerator"]:
+    """Re-parse a watched file and rewrite its package, reporting the outcome.
+
+    Only the question blocks changed since the last rebuild are parsed again,
+    and the item XML of the others is reused.
+
+    Args:
+        parser: Parser kept across rebuilds
+        generator: Generator of the last successful rebuild, if any
+        input_file: Watched quiz file
+        output_path: Output ZIP file path
+        qti_version: QTI version to generate
+
+    Returns:
+        The generator to keep for the next rebuild
+    """
+    from text_to_qti.qti.generator import QTIGenerator
+
+    start = time.perf_counter()
+    try:
+        with open(input_file, "r", encoding="utf-8") as f:
+            content = f.read()
+        quiz = parser.reparse_content(content)
+        if generator is None:
+            generator = QTIGenerator(quiz, version=qti_version, reuse_items=True)
+        generator.quiz = quiz
+        result_path = generator.generate(output_path)
+    except (OSError, ValueError, TextToQTIError) as e:
+        # Decoding errors and pydantic's ValidationError are ValueErrors
+        console.print(f"[red]✗ Error: {e}")
+        return generator
+
+    elapsed = (time.perf_counter() - start) * 1000
+    console.print(
+        f"[green]✓ Rebuilt {result_path}: {len(quiz.questions)} questions, "
+        f"{parser.reparsed} block(s) re-parsed, "
+        f"{generator.assessment_gen.reused} item(s) reused in {elapsed:.0f} ms"
+    )
+    return generator
+
+
+def _print_diagnostics(diagnostics: List[ValidationError], all_errors: bool) -> None:
+    """Print validation errors, or just the first one.
+
+    Args:
+        diagnostics: Validation errors in report order
+        all_errors: Whether to print every error
+    """
+    if not all_errors:
+        console.print(f"[red]✗ Validation Error: {diagnostics[0]}")
+        if len(diagnostics) > 1:
+            console.print(
+                f"[yellow]{len(diagnostics) - 1} more error(s); "
+                "use --all-errors to list them"
+            )
+        return
+
+    for diagnostic in diagnostics:
+        console.print(f"[red]✗ {diagnostic}")
+    console.print(f"[red]{len(diagnostics)} validation error(s)")
+
+
 if __name__ == "__main__":
     cli()
@@ -0,0 +1,249 @@
+"""DEFLATE compression of ZIP entries across threads."""
+
+import functools
+import io
+import zipfile
+import zlib
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import IO, Deque, Optional, Union
+
+# Uncompressed bytes deflated per task, as in pigz
+BLOCK_SIZE = 128 * 2**10
+
+# Data before a block that its matches may refer to
+_WINDOW_SIZE = 32 * 2**10
+
+# Private attributes of zipfile's entry write handles that raw entries
+# replace: the compressor, and the CRC-32 and size of the uncompressed data
+_RAW_ENTRY_ATTRIBUTES = ("_compressor", "_crc", "_file_size")
+
+
+class ParallelDeflateWriter(io.BufferedIOBase):
+    """Writable ZIP entry deflated in blocks by a pool of threads.
+
+    Data is cut into blocks that threads compress as raw deflate, each primed
+    with the 32 KiB before it as dictionary and ended with a sync flush, which
+    pads it to a byte boundary without ending the stream. The blocks in order
+    then form one standard deflate stream, which the last block finishes, so
+    the entry is read like any other. Priming keeps the output within a few
+    bytes per block of a single-threaded stream; zlib releases the GIL while
+    it compresses, so the threads run in parallel.
+
+    Data that fits in one block is compressed on the calling thread. If
+    this Python's zipfile does not support raw entries (see
+    ``raw_entries_supported``), the entry is compressed by zipfile on the
+    calling thread instead.
+    """
+
+    def __init__(
+        self,
+        zf: zipfile.ZipFile,
+        name: Union[str, zipfile.ZipInfo],
+        level: int,
+        threads: int,
+        block_size: int = BLOCK_SIZE,
+    ) -> None:
+        """Open the entry.
+
+        Args:
+            zf: ZIP file open for writing with ZIP_DEFLATED compression
+            name: Entry name, or its header
+            level: zlib compression level, 0-9
+            threads: Number of threads to compress with
+            block_size: Uncompressed bytes per block
+        """
+        super().__init__()
+        self._level = level
+        self._threads = threads
+        self._block_size = block_size
+
+        self._raw = raw_entries_supported()
+        self._entry = open_raw_entry(zf, name) if self._raw else zf.open(name, "w")
+
+        self._buffer = bytearray()
+        self._dictionary = b""
+        self._crc = 0
+        self._size = 0
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pending: Deque["Future[bytes]"] = deque()
+
+    def writable(self) -> bool:
+        """Return True; the entry is write-only."""
+        return True
+
+    def write(self, data) -> int:
+        """Buffer data, compressing every full block.
+
+        Args:
+            data: Bytes-like object
+
+        Returns:
+            Number of bytes written
+        """
+        if self.closed:
+            raise ValueError("I/O operation on closed file.")
+        if not self._raw:
+            return self._entry.write(data)
+        self._buffer += data
+        block_size = self._block_size
+        while len(self._buffer) >= block_size:
+            block = bytes(self._buffer[:block_size])
+            del self._buffer[:block_size]
+            self._submit(block, final=False)
+        return memoryview(data).nbytes
+
+    def close(self) -> None:
+        """Compress the rest of the data and finish the entry."""
+        if self.closed:
+            return
+        entry = self._entry
+        try:
+            if self._raw:
+                self._submit(bytes(self._buffer), final=True)
+                self._buffer.clear()
+                while self._pending:
+                    entry.write(self._pending.popleft().result())
+                finish_raw_entry(entry, self._crc, self._size)
+        finally:
+            if self._executor is not None:
+                self._executor.shutdown()
+            entry.close()
+            super().close()
+
+    def _submit(self, block: bytes, final: bool) -> None:
+        """Queue a block for compression, writing those already compressed."""
+        self._crc = zlib.crc32(block, self._crc)
+        self._size += len(block)
+        dictionary = self._dictionary
+        if len(block) >= _WINDOW_SIZE:
+            self._dictionary = block[-_WINDOW_SIZE:]
+        else:
+            self._dictionary = (dictionary + block)[-_WINDOW_SIZE:]
+
+        if self._executor is None:
+            if final:
+                self._entry.write(_deflate(block, dictionary, self._level, final))
+                return
+            self._executor = ThreadPoolExecutor(self._threads)
+        self._pending.append(
+            self._executor.submit(_deflate, block, dictionary, self._level, final)
+        )
+        # Bounded, so memory stays flat when compression falls behind
+        while len(self._pending) > 2 * self._threads:
+            self._entry.write(self._pending.popleft().result())
+
+
+def open_raw_entry(zf: zipfile.ZipFile, name: Union[str, zipfile.ZipInfo]) -> IO[bytes]:
+    """Open a ZIP entry that is written already compressed.
+
+    zipfile cannot write compressed data, so the entry is given a compressor
+    that passes data through as is; ``finish_raw_entry`` must then set the
+    CRC-32 and size of the uncompressed data before the entry is closed.
+    This relies on zipfile internals, so callers check
+    ``raw_entries_supported`` first.
+
+    Args:
+        zf: ZIP file open for writing
+        name: Entry name, or its header, with the compression method of the
+            data written
+
+    Returns:
+        The entry, open for writing
+
+    Raises:
+        AttributeError: If zipfile's write handles lack the attributes
+            replaced
+    """
+    entry = zf.open(name, "w")
+    missing = [
+        attribute
+        for attribute in _RAW_ENTRY_ATTRIBUTES
+        if not hasattr(entry, attribute)
+    ]
+    if missing:
+        entry.close()
+        raise AttributeError(f"zipfile entries have no {', '.join(missing)}")
+    entry._compressor = _PassThrough()  # type: ignore[attr-defined]
+    return entry
+
+
+def finish_raw_entry(entry: IO[bytes], crc: int, size: int) -> None:
+    """Set the CRC-32 and size of the data of an entry from ``open_raw_entry``.
+
+    Args:
+        entry: Entry, before it is closed
+        crc: CRC-32 of the uncompressed data
+        size: Size of the uncompressed data
+    """
+    entry._crc = crc  # type: ignore[attr-defined]
+    entry._file_size = size  # type: ignore[attr-defined]
+
+
+@functools.lru_cache(maxsize=None)
+def raw_entries_supported() -> bool:
+    """Return whether this Python's zipfile supports raw entries.
+
+    Raw entries (see ``open_raw_entry``) depend on private attributes of
+    zipfile that have changed between releases. A small entry is written
+    that way and read back, once per process, so that if they change,
+    parallel compression and package updates fall back to plain zipfile
+    writes instead of producing entries with wrong CRCs or sizes.
+
+    Returns:
+        Whether raw entries are written correctly
+    """
+    data = b"text-to-qti raw entry probe\n" * 64
+    buffer = io.BytesIO()
+    try:
+        with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as zf:
+            entry = open_raw_entry(zf, "probe")
+            with entry:
+                entry.write(_deflate(data, b"", 6, final=True))
+                finish_raw_entry(entry, zlib.crc32(data), len(data))
+        with zipfile.ZipFile(buffer) as zf:
+            return zf.read("probe") == data
+    except (AttributeError, TypeError, ValueError, zipfile.BadZipFile, zlib.error):
+        return False
+
+
+def set_compress_level(info: zipfile.ZipInfo, level: Optional[int]) -> None:
+    """Set the compression level of an entry written from its header.
+
+    Python 3.13 made the private ``ZipInfo._compresslevel`` public as
+    ``compress_level``; entries keep zipfile's default level on versions
+    with neither.
+
+    Args:
+        info: Entry header
+        level: zlib compression level, or None for the default
+    """
+    for attribute in ("compress_level", "_compresslevel"):
+        if hasattr(zipfile.ZipInfo, attribute):
+            setattr(info, attribute, level)
+            return
+
+
+class _PassThrough:
+    """Stand-in for the compressor of a ZIP entry that writes data as is."""
+
+    def compress(self, data: bytes) -> bytes:
+        """Return the data unchanged."""
+        return data
+
+    def flush(self) -> bytes:
+        """Return no data."""
+        return b""
+
+
+def _deflate(block: bytes, dictionary: bytes, level: int, final: bool) -> bytes:
+    """Compress a block as part of a raw deflate stream."""
+    if dictionary:
+        compressor = zlib.compressobj(
+            level, zlib.DEFLATED, -zlib.MAX_WBITS, zdict=dictionary
+        )
+    else:
+        compressor = zlib.compressobj(level, zlib.DEFLATED, -zlib.MAX_WBITS)
+    return compressor.compress(block) + compressor.flush(
+        zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH
+    )
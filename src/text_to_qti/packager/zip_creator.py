@@ -1,64 +1,447 @@
 """QTI ZIP package creator."""
 
+import io
+import os
+import shutil
+import stat
+import struct
+import tempfile
+import time
 import zipfile
+import zlib
 from pathlib import Path
+from typing import IO, Callable, Dict, Iterable, Optional, Sequence, Tuple, Union
 
 from lxml import etree
 
-from text_to_qti.qti.utils import element_to_string
+from text_to_qti.packager.deflate import (
+    ParallelDeflateWriter,
+    finish_raw_entry,
+    open_raw_entry,
+    raw_entries_supported,
+    set_compress_level,
+)
+from text_to_qti.qti.media import CHUNK_SIZE, MediaFile
+from text_to_qti.qti.utils import element_to_bytes
 from text_to_qti.utils.errors import GenerationError
 
+# zlib's default trade-off between speed and size
+DEFAULT_COMPRESS_LEVEL = 6
+
+# Entry timestamp of reproducible packages, the earliest a ZIP file can hold,
+# unless SOURCE_DATE_EPOCH is set
+REPRODUCIBLE_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+
+# Host system and permissions (regular file, rw-r--r--) of reproducible
+# entries; zipfile records the platform it runs on
+_UNIX_SYSTEM = 3
+_FILE_ATTRIBUTES = 0o100644 << 16
+
+# Permissions zipfile gives entries written from bytes (rw-------)
+_WRITESTR_ATTRIBUTES = 0o600 << 16
+
+# Local file header: signature, versions, flags, sizes and the lengths of
+# the name and extra field that follow it
+_LOCAL_HEADER = struct.Struct("<4s2B4HL2L2H")
+_LOCAL_HEADER_SIGNATURE = b"PK\x03\x04"
+_FH_FILENAME_LENGTH = 10
+_FH_EXTRA_FIELD_LENGTH = 11
+
+# An assessment document as an element, or a function streaming it to a file
+AssessmentXML = Union[etree._Element, Callable[[IO[bytes]], None]]
+
+# A document as an element, or already rendered
+DocumentXML = Union[etree._Element, str]
+
 
 class ZIPCreator:
     """Create QTI ZIP packages for Canvas import (Canvas compatible format)."""
 
     ASSESSMENT_ID = "ASSESSMENT_001"
 
+    def __init__(
+        self,
+        compress_level: int = DEFAULT_COMPRESS_LEVEL,
+        store: bool = False,
+        threads: int = 1,
+        reproducible: bool = False,
+        update: bool = False,
+    ) -> None:
+        """Initialize creator.
+
+        Args:
+            compress_level: DEFLATE compression level, from 0 (fastest) to 9
+                (smallest)
+            store: Whether entries are stored uncompressed instead, for
+                packages that stay on local disks
+            threads: Number of threads to compress the assessment with; with
+                more than one it is deflated in blocks in parallel (see
+                ParallelDeflateWriter)
+            reproducible: Whether entries get a fixed timestamp, permissions
+                and host system instead of the current ones, so the same
+                documents and options always give the same bytes. The
+                timestamp is taken from the SOURCE_DATE_EPOCH environment
+                variable when set, as in reproducible builds
+            update: Whether an existing package at the output path is
+                updated: entries whose content has not changed are copied
+                from it still compressed instead of compressed again, and
+                the new package then replaces it atomically. Assessments are
+                rendered into memory first to compare them. Ignored when
+                writing to file objects
+
+        Raises:
+            GenerationError: If the compression level is out of range
+        """
+        if not 0 <= compress_level <= 9:
+            raise GenerationError(
+                f"Compression level must be between 0 and 9: {compress_level}"
+            )
+        self.compress_level = compress_level
+        self.store = store
+        self.threads = threads
+        self.reproducible = reproducible
+        self.update = update
+
     def create_package(
         self,
-        output_path: str,
-        manifest_xml: etree._Element,
-        assessment_xml: etree._Element,
-        canvas_metadata_xml: etree._Element,
-    ) -> Path:
+        output_path: Union[str, Path, IO[bytes]],
+        manifest_xml: DocumentXML,
+        assessment_xml: AssessmentXML,
+        canvas_metadata_xml: DocumentXML,
+        pretty_print: bool = True,
+        media: Sequence[MediaFile] = (),
+    ) -> Optional[Path]:
         """Create QTI ZIP package (Canvas compatible format).
 
         Args:
-            output_path: Path for output ZIP file
-            manifest_xml: imsmanifest.xml element
-            assessment_xml: Assessment XML element with embedded items
-            canvas_metadata_xml: Canvas assessment_meta.xml element
+            output_path: Path for output ZIP file, or a writable binary file
+                object to write it to, which is left open. The package is
+                written as it is produced; file objects that cannot seek,
+                such as pipes and sockets, get entries with data descriptors
+            manifest_xml: imsmanifest.xml element, or the rendered document
+            assessment_xml: Assessment XML element with embedded items, or a
+                function that streams the whole document into the ZIP entry
+            canvas_metadata_xml: Canvas assessment_meta.xml element, or the
+                rendered document
+            pretty_print: Whether elements are serialized pretty printed
+            media: Files to bundle, each copied in chunks to the path of its
+                ``href``; already compressed formats are stored as they are
 
         Returns:
-            Path to created ZIP file
+            Path to created ZIP file, or None if written to a file object
+
+        Raises:
+            GenerationError: If packaging fails
+        """
+        return self.create_multi_package(
+            output_path,
+            manifest_xml,
+            [(self.ASSESSMENT_ID, assessment_xml, canvas_metadata_xml)],
+            pretty_print,
+            media,
+        )
+
+    def create_multi_package(
+        self,
+        output_path: Union[str, Path, IO[bytes]],
+        manifest_xml: DocumentXML,
+        assessments: Iterable[Tuple[str, AssessmentXML, DocumentXML]],
+        pretty_print: bool = True,
+        media: Sequence[MediaFile] = (),
+    ) -> Optional[Path]:
+        """Create a QTI ZIP package holding several assessments.
+
+        Each assessment gets a directory named after its identifier, holding
+        its document and Canvas metadata, as in ``create_package``.
+
+        Args:
+            output_path: Path for output ZIP file, or a writable binary file
+                object (see ``create_package``)
+            manifest_xml: imsmanifest.xml element listing every assessment,
+                or the rendered document
+            assessments: Identifier, assessment XML and Canvas metadata XML of
+                each assessment, as taken by ``create_package``; consumed as
+                the package is written, so it may produce them lazily
+            pretty_print: Whether elements are serialized pretty printed
+            media: Files to bundle, written after the assessments (see
+                ``create_package``)
+
+        Returns:
+            Path to created ZIP file, or None if written to a file object
 
         Raises:
             GenerationError: If packaging fails
         """
         try:
+            documents = (manifest_xml, assessments, pretty_print, media)
+            if not isinstance(output_path, (str, os.PathLike)):
+                self._write(output_path, *documents)
+                return None
+
             output_file = Path(output_path)
             output_file.parent.mkdir(parents=True, exist_ok=True)
+            if self.update and output_file.is_file():
+                self._update(output_file, *documents)
+            else:
+                self._write(output_file, *documents)
+            return output_file
+
+        except Exception as e:
+            raise GenerationError(f"Failed to create ZIP package: {e}") from e
 
-            with zipfile.ZipFile(output_file, "w", zipfile.ZIP_DEFLATED) as zf:
-                # Add manifest at root
-                manifest_str = element_to_string(manifest_xml, with_declaration=True)
-                zf.writestr("imsmanifest.xml", manifest_str)
+    def _update(
+        self,
+        output_file: Path,
+        manifest_xml: DocumentXML,
+        assessments: Iterable[Tuple[str, AssessmentXML, DocumentXML]],
+        pretty_print: bool,
+        media: Sequence[MediaFile],
+    ) -> None:
+        """Rewrite an existing package, reusing the entries that did not change.
 
-                # Add assessment with embedded items (Canvas format)
-                assessment_str = element_to_string(
-                    assessment_xml, with_declaration=True
-                )
-                zf.writestr(
-                    f"{self.ASSESSMENT_ID}/{self.ASSESSMENT_ID}.xml", assessment_str
+        The package is written to a temporary file next to it, which then
+        replaces it, so it is never left half written. The temporary file
+        gets the permissions of the package, which mkstemp would otherwise
+        narrow to the owner.
+        """
+        fd, temp_name = tempfile.mkstemp(
+            prefix=f".{output_file.name}.", suffix=".tmp", dir=output_file.parent
+        )
+        try:
+            with os.fdopen(fd, "wb") as target, open(output_file, "rb") as source:
+                previous: Optional[_PreviousPackage] = None
+                # Otherwise every entry is compressed again
+                if raw_entries_supported():
+                    try:
+                        previous = _PreviousPackage(source)
+                    except zipfile.BadZipFile:
+                        # Not a package, so nothing to reuse
+                        pass
+                self._write(
+                    target, manifest_xml, assessments, pretty_print, media, previous
                 )
+            os.chmod(temp_name, stat.S_IMODE(output_file.stat().st_mode))
+            os.replace(temp_name, output_file)
+        except BaseException:
+            os.unlink(temp_name)
+            raise
+
+    def _write(
+        self,
+        target: Union[Path, IO[bytes]],
+        manifest_xml: DocumentXML,
+        assessments: Iterable[Tuple[str, AssessmentXML, DocumentXML]],
+        pretty_print: bool,
+        media: Sequence[MediaFile],
+        previous: Optional["_PreviousPackage"] = None,
+    ) -> None:
+        """Write a package, copying unchanged entries from a previous one."""
+        compression = zipfile.ZIP_STORED if self.store else zipfile.ZIP_DEFLATED
+        with zipfile.ZipFile(
+            target, "w", compression, compresslevel=self.compress_level
+        ) as zf:
+            # Add manifest at root
+            self._write_document(
+                zf,
+                "imsmanifest.xml",
+                _document(manifest_xml, pretty_print),
+                previous,
+            )
+
+            for assessment_id, assessment_xml, canvas_metadata_xml in assessments:
+                # Add assessment with embedded items (Canvas format)
+                name = self._entry(zf, f"{assessment_id}/{assessment_id}.xml")
+                if previous is None:
+                    with self._open_entry(zf, name) as entry:
+                        _write_assessment(entry, assessment_xml, pretty_print)
+                else:
+                    # Rendered first, to compare it with the previous one
+                    buffer = io.BytesIO()
+                    _write_assessment(buffer, assessment_xml, pretty_print)
+                    data = buffer.getvalue()
+                    if not previous.copy(zf, name, len(data), zlib.crc32(data)):
+                        with self._open_entry(zf, name) as entry:
+                            entry.write(data)
 
                 # Add Canvas-specific metadata
-                metadata_str = element_to_string(
-                    canvas_metadata_xml, with_declaration=True
+                self._write_document(
+                    zf,
+                    f"{assessment_id}/assessment_meta.xml",
+                    _document(canvas_metadata_xml, pretty_print),
+                    previous,
                 )
-                zf.writestr(f"{self.ASSESSMENT_ID}/assessment_meta.xml", metadata_str)
 
-            return output_file
+            for media_file in media:
+                self._write_media(zf, media_file, previous)
 
-        except Exception as e:
-            raise GenerationError(f"Failed to create ZIP package: {e}") from e
+    def _write_document(
+        self,
+        zf: zipfile.ZipFile,
+        name: str,
+        data: bytes,
+        previous: Optional["_PreviousPackage"],
+    ) -> None:
+        """Write a small entry, copied from the previous package if unchanged."""
+        entry = self._entry(zf, name)
+        if previous is None or not previous.copy(
+            zf, entry, len(data), zlib.crc32(data)
+        ):
+            zf.writestr(entry, data)
+
+    def _write_media(
+        self,
+        zf: zipfile.ZipFile,
+        media_file: MediaFile,
+        previous: Optional["_PreviousPackage"],
+    ) -> None:
+        """Copy a bundled file into the package in chunks."""
+        entry = self._entry(zf, media_file.href)
+        if isinstance(entry, str):
+            # With the file's timestamp and permissions
+            entry = zipfile.ZipInfo.from_file(
+                media_file.path, media_file.href, strict_timestamps=False
+            )
+            set_compress_level(entry, zf.compresslevel)
+        entry.compress_type = (
+            zipfile.ZIP_STORED if media_file.stored else zf.compression
+        )
+        if previous is not None and previous.copy(
+            zf, entry, media_file.size, media_file.crc
+        ):
+            return
+        entry.file_size = media_file.size
+        with open(media_file.path, "rb") as source, zf.open(entry, "w") as target:
+            shutil.copyfileobj(source, target, CHUNK_SIZE)
+
+    def _entry(self, zf: zipfile.ZipFile, name: str) -> Union[str, zipfile.ZipInfo]:
+        """Return the name to write an entry as, or its normalized header."""
+        if not self.reproducible:
+            return name
+        info = zipfile.ZipInfo(name, _reproducible_date_time())
+        info.create_system = _UNIX_SYSTEM
+        info.external_attr = _FILE_ATTRIBUTES
+        info.compress_type = zf.compression
+        set_compress_level(info, zf.compresslevel)
+        return info
+
+    def _open_entry(
+        self, zf: zipfile.ZipFile, name: Union[str, zipfile.ZipInfo]
+    ) -> IO[bytes]:
+        """Open a large entry for writing, compressed across threads if enabled."""
+        if self.store or self.threads <= 1:
+            return zf.open(name, "w")
+        return ParallelDeflateWriter(  # type: ignore[return-value]
+            zf, name, self.compress_level, self.threads
+        )
+
+
+class _PreviousPackage:
+    """Existing package whose unchanged entries are reused as compressed."""
+
+    def __init__(self, file: IO[bytes]) -> None:
+        """Read the central directory of a package.
+
+        Args:
+            file: The package, open for reading
+
+        Raises:
+            zipfile.BadZipFile: If the file is not a ZIP file
+        """
+        self.file = file
+        with zipfile.ZipFile(file) as zf:
+            self.entries: Dict[str, zipfile.ZipInfo] = {
+                info.filename: info for info in zf.infolist()
+            }
+
+    def copy(
+        self,
+        zf: zipfile.ZipFile,
+        name: Union[str, zipfile.ZipInfo],
+        size: int,
+        crc: int,
+    ) -> bool:
+        """Write the previous entry as is if its content has not changed.
+
+        An entry is unchanged if it has the same name, compression method,
+        size and CRC-32. Its compressed bytes are copied without inflating
+        them, so it keeps the compression level it was written with.
+
+        Args:
+            zf: ZIP file being written
+            name: Entry name, or its header
+            size: Size of the new content of the entry
+            crc: CRC-32 of the new content
+
+        Returns:
+            Whether the entry was copied; if not, nothing was written
+
+        Raises:
+            zipfile.BadZipFile: If the previous entry cannot be read
+        """
+        if isinstance(name, zipfile.ZipInfo):
+            target = name
+        else:
+            # As zipfile writes entries given by name
+            target = zipfile.ZipInfo(name, time.localtime(time.time())[:6])
+            target.compress_type = zf.compression
+            set_compress_level(target, zf.compresslevel)
+            target.external_attr = _WRITESTR_ATTRIBUTES
+        info = self.entries.get(target.filename)
+        if (
+            info is None
+            or info.flag_bits & 0x1  # encrypted
+            or info.compress_type != target.compress_type
+            or info.file_size != size
+            or info.CRC != crc
+        ):
+            return False
+
+        file = self.file
+        file.seek(info.header_offset)
+        header = _LOCAL_HEADER.unpack(file.read(_LOCAL_HEADER.size))
+        if header[0] != _LOCAL_HEADER_SIGNATURE:
+            raise zipfile.BadZipFile(f"Bad local header of {info.filename}")
+        file.seek(header[_FH_FILENAME_LENGTH] + header[_FH_EXTRA_FIELD_LENGTH], 1)
+
+        # Sized up front, so that zipfile decides on ZIP64 as for the data
+        target.file_size = info.file_size
+        with open_raw_entry(zf, target) as entry:
+            remaining = info.compress_size
+            while remaining:
+                chunk = file.read(min(remaining, CHUNK_SIZE))
+                if not chunk:
+                    raise zipfile.BadZipFile(f"Truncated entry {info.filename}")
+                entry.write(chunk)
+                remaining -= len(chunk)
+            finish_raw_entry(entry, info.CRC, info.file_size)
+        return True
+
+
+def _write_assessment(
+    output: IO[bytes], assessment_xml: AssessmentXML, pretty_print: bool
+) -> None:
+    """Write an assessment document given as an element or a writer function."""
+    if callable(assessment_xml):
+        assessment_xml(output)
+    else:
+        output.write(element_to_bytes(assessment_xml, pretty_print))
+
+
+def _reproducible_date_time() -> Tuple[int, int, int, int, int, int]:
+    """Return the entry timestamp of reproducible packages."""
+    epoch = os.environ.get("SOURCE_DATE_EPOCH")
+    if not epoch:
+        return REPRODUCIBLE_DATE_TIME
+    try:
+        date_time = time.gmtime(int(epoch))[:6]
+    except (ValueError, OverflowError) as e:
+        raise GenerationError(f"Invalid SOURCE_DATE_EPOCH: {epoch}") from e
+    # ZIP timestamps start in 1980
+    return max(date_time, REPRODUCIBLE_DATE_TIME)
+
+
+def _document(xml: Union[etree._Element, str], pretty_print: bool) -> bytes:
+    """Return an XML document as UTF-8, serializing it if given as an element."""
+    if isinstance(xml, str):
+        return xml.encode("utf-8")
+    return element_to_bytes(xml, pretty_print)
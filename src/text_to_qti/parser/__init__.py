@@ -1,5 +1,6 @@
 """Parser module for converting markdown text to question objects."""
 
+from text_to_qti.parser.question_bank import QuestionBank, QuestionView
 from text_to_qti.parser.question_models import (
     AnswerChoice,
     Question,
@@ -11,7 +12,9 @@ from text_to_qti.parser.question_models import (
 __all__ = [
     "AnswerChoice",
     "Question",
+    "QuestionBank",
     "QuestionType",
+    "QuestionView",
     "Quiz",
     "QuizMetadata",
 ]
@@ -0,0 +1,151 @@
+"""Syntax rules applied to question blocks by the single-pass checker."""
+
+from typing import List, NamedTuple, Optional, Tuple
+
+from text_to_qti.parser.question_models import QuestionType, Quiz
+from text_to_qti.utils.errors import ValidationError
+
+
+class QuestionFields(NamedTuple):
+    """Fields read from a question block, before any validation."""
+
+    question_id: str
+    question_type: Optional[QuestionType]
+    points: int
+    text: str
+    # (letter, stripped text, is_correct, offset) in source order
+    choices: List[Tuple[str, str, bool, int]]
+    feedback: Optional[str]
+    # Malformed tags and choices in source order, as (kind, raw value, offset);
+    # kind is "type", "points" or "choice" (value is then the letter)
+    problems: List[Tuple[str, str, int]]
+    # Offsets of the ID and Points tag values, if present
+    id_offset: Optional[int]
+    points_offset: Optional[int]
+
+
+class CheckResult(NamedTuple):
+    """Outcome of checking a quiz file in a single pass."""
+
+    # None if there are diagnostics or the quiz was only validated
+    quiz: Optional[Quiz]
+    # Problems found: file-level ones first, then the rest in source order
+    diagnostics: List[ValidationError]
+
+    @property
+    def ok(self) -> bool:
+        """Whether the file has no problems."""
+        return not self.diagnostics
+
+
+def question_problems(
+    fields: QuestionFields, header_offset: int
+) -> List[Tuple[int, str]]:
+    """List the problems of a question block.
+
+    These are the rules enforced by ``SyntaxValidator`` and by the question
+    models, so a block without problems always builds a valid Question.
+
+    Args:
+        fields: Fields read from the block
+        header_offset: Offset of the block's header line
+
+    Returns:
+        (offset, description) of each problem, empty if the block is valid
+    """
+    problems: List[Tuple[int, str]] = []
+
+    for kind, value, offset in fields.problems:
+        if kind == "type":
+            message = (
+                f"Invalid question type '{value.strip().lower()}'. "
+                "Must be 'multiple_choice' or 'true_false'"
+            )
+        elif kind == "points":
+            message = f"Points value '{value}' is not an integer"
+        else:
+            message = f"Empty answer choice text for '{value})'"
+        problems.append((offset, message))
+
+    if fields.question_type is None and not any(
+        kind == "type" for kind, _, _ in fields.problems
+    ):
+        problems.append(
+            (
+                header_offset,
+                "No question type specified. "
+                "Use [Type: multiple_choice] or [Type: true_false]",
+            )
+        )
+    if fields.points < 1:
+        problems.append(
+            (
+                header_offset if fields.points_offset is None else fields.points_offset,
+                f"Points value '{fields.points}' must be at least 1",
+            )
+        )
+    if not fields.text:
+        problems.append((header_offset, "Question text is empty"))
+
+    choices = fields.choices
+    if not choices:
+        problems.append(
+            (
+                header_offset,
+                "No answer choices found. "
+                "Answer choices must be in format: a) Text or *a) Correct answer",
+            )
+        )
+        return problems
+    first_offset = choices[0][3]
+
+    letters = [choice[0] for choice in choices]
+    for i, letter in enumerate(letters):
+        if letter != chr(ord("a") + i):
+            problems.append(
+                (
+                    choices[i][3],
+                    "Answer letters must be sequential (a, b, c, ...). "
+                    f"Found: {', '.join(letters)}",
+                )
+            )
+            break
+
+    correct = [choice[3] for choice in choices if choice[2]]
+    if not correct:
+        problems.append(
+            (
+                first_offset,
+                "No correct answer specified. "
+                "Mark correct answer with * (e.g., *c) Correct answer)",
+            )
+        )
+
+    if fields.question_type is QuestionType.TRUE_FALSE:
+        if len(choices) != 2:
+            problems.append(
+                (
+                    first_offset,
+                    "True/False questions must have exactly 2 choices, "
+                    f"found {len(choices)}",
+                )
+            )
+    elif fields.question_type is QuestionType.MULTIPLE_CHOICE:
+        if len(choices) < 2:
+            problems.append(
+                (
+                    first_offset,
+                    "Multiple choice must have at least 2 choices, "
+                    f"found {len(choices)}",
+                )
+            )
+        if len(correct) > 1:
+            problems.append(
+                (
+                    correct[1],
+                    "Multiple choice must have exactly 1 correct answer, "
+                    f"found {len(correct)}",
+                )
+            )
+
+    return problems
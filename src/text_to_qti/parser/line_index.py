@@ -0,0 +1,34 @@
+"""Offset to line/column mapping for source positions in diagnostics."""
+
+from bisect import bisect_right
+from itertools import accumulate
+from typing import List, Tuple
+
+
+class LineIndex:
+    """Line start offsets of a text, built once and searched with bisect."""
+
+    __slots__ = ("starts",)
+
+    def __init__(self, text: str) -> None:
+        """Index the line starts of ``text``.
+
+        Args:
+            text: Source text with ``\\n`` line breaks
+        """
+        lines = text.split("\n")
+        self.starts: List[int] = list(
+            accumulate((len(line) + 1 for line in lines[:-1]), initial=0)
+        )
+
+    def position(self, offset: int) -> Tuple[int, int]:
+        """Return the 1-based line and column of ``offset``.
+
+        Args:
+            offset: Character offset into the indexed text
+
+        Returns:
+            Tuple of (line, column)
+        """
+        line = bisect_right(self.starts, offset)
+        return line, offset - self.starts[line - 1] + 1
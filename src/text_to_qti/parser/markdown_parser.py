@@ -1,19 +1,83 @@
 """Parser for converting markdown quiz files to Question objects."""
 
+import mmap
+import os
 import re
-from typing import List, Optional
+import uuid
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import (
+    TYPE_CHECKING,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Set,
+    TextIO,
+    Tuple,
+    Union,
+)
 
-import markdown
 import yaml
 
+from text_to_qti.parser.checks import CheckResult, QuestionFields, question_problems
+from text_to_qti.parser.line_index import LineIndex
+from text_to_qti.parser.markdown_renderer import MarkdownRenderer
+from text_to_qti.parser.parse_cache import ParseCache
 from text_to_qti.parser.question_models import (
     AnswerChoice,
     Question,
     QuestionType,
     Quiz,
     QuizMetadata,
+    construct_trusted,
+    content_id,
+)
+from text_to_qti.parser.tokenizer import (
+    FENCE,
+    HEADER_LINE_PATTERN,
+    LINE_PATTERN,
+    Token,
+    TokenType,
+    fenced_spans,
+    tokenize,
 )
-from text_to_qti.utils.errors import ParseError
+from text_to_qti.utils.errors import ParseError, ValidationError
+
+if TYPE_CHECKING:
+    import markdown
+
+# Enum member lookups are comparatively slow in the per-line loops
+_FRONT_MATTER = TokenType.FRONT_MATTER
+_HEADER = TokenType.HEADER
+_STRAY_HEADER = TokenType.STRAY_HEADER
+_METADATA = TokenType.METADATA
+_CHOICE = TokenType.CHOICE
+_FEEDBACK = TokenType.FEEDBACK
+_BLANK = TokenType.BLANK
+
+# Parallel parsing splits files into parts of at least this many characters,
+# aiming for a few parts per worker so uneven parts balance out
+PARALLEL_MIN_PART_SIZE = 64 * 1024
+PARALLEL_PARTS_PER_WORKER = 4
+
+
+class BlockResults(NamedTuple):
+    """Outcome of parsing the question blocks of (part of) a quiz file."""
+
+    questions: List[Question]
+    block_count: int
+    # Offset and body of the first fenced block, if any
+    front_matter: Optional[Tuple[int, str]]
+    # Block index (counted from 1) and error of the first failing block
+    failure: Optional[Tuple[int, Exception]]
+    # Problems found when checking as (offset, message), and (offset, header
+    # number, ID, whether explicit) of blocks with an explicit or content ID
+    diagnostics: List[Tuple[int, str]]
+    question_ids: List[Tuple[int, int, str, bool]]
 
 
 class MarkdownParser:
@@ -28,15 +92,38 @@ class MarkdownParser:
     METADATA_PATTERN = re.compile(r"^\[(\w+):\s*([^\]]+)\]\s*$", re.MULTILINE)
     ANSWER_PATTERN = re.compile(r"^(\*)?([a-z])\)\s+(.+)$", re.MULTILINE)
 
-    def __init__(self) -> None:
-        """Initialize the parser."""
-        self.markdown_converter = markdown.Markdown(extensions=["extra", "sane_lists"])
+    def __init__(
+        self, content_ids: bool = False, cache: Optional[ParseCache] = None
+    ) -> None:
+        """Initialize the parser.
 
-    def parse_file(self, file_path: str) -> Quiz:
+        Args:
+            content_ids: Whether questions without an ``[ID: ...]`` get an ID
+                derived from their content instead of a random one
+            cache: Cache of parsed files used by parse_file and check_file
+        """
+        self.renderer = MarkdownRenderer()
+        self.metadata: Optional[QuizMetadata] = None
+        self.content_ids = content_ids
+        self.cache = cache
+        # Blocks of the last reparse_content call, keyed by their text and the
+        # line after them, and how many of them had to be parsed
+        self._blocks: Dict[Tuple[str, str], BlockResults] = {}
+        self.reparsed = 0
+
+    @property
+    def markdown_converter(self) -> "markdown.Markdown":
+        """Markdown converter of the parser's renderer, built on first use."""
+        return self.renderer.converter
+
+    def parse_file(self, file_path: str, workers: int = 1) -> Quiz:
         """Parse a quiz file and return a Quiz object.
 
         Args:
             file_path: Path to the quiz file
+            workers: Number of processes to parse with. With more than one,
+                large files are split at question headers and the parts are
+                parsed in a process pool.
 
         Returns:
             Parsed Quiz object
@@ -44,19 +131,220 @@ class MarkdownParser:
         Raises:
             ParseError: If parsing fails
         """
+        if self.cache is None:
+            return self._parse_path(file_path, workers)
+
+        raw = self._read_bytes(file_path)
+        key = self.cache.key(raw, self.content_ids)
+        quiz = self.cache.get(key)
+        if quiz is None:
+            if workers > 1:
+                quiz = self._parse_path(file_path, workers)
+            else:
+                quiz = self.parse_content(self._decode(raw, file_path))
+            self.cache.put(key, quiz)
+        return quiz
+
+    def _parse_path(self, file_path: str, workers: int) -> Quiz:
+        """Parse a quiz file without the cache, as for parse_file."""
+        if workers > 1:
+            content, parts = self._plan_parts(file_path, workers)
+            if len(parts) > 1:
+                return self._build_quiz(self._map_parts(parts, workers))
+            return self.parse_content(content)
+
+        return self.parse_content(self._read_file(file_path))
+
+    def check_file(
+        self, file_path: str, build: bool = True, workers: int = 1
+    ) -> CheckResult:
+        """Validate a quiz file and build its Quiz in a single pass.
+
+        The file is read and tokenized once; every question block is checked
+        against the syntax rules and, if it has no problems, turned into a
+        Question directly.
+
+        Args:
+            file_path: Path to the quiz file
+            build: Whether to build the Quiz; with False the file is only
+                validated
+            workers: Number of processes to check with, as for parse_file
+
+        Returns:
+            CheckResult with the Quiz (if built and valid) and the diagnostics
+
+        Raises:
+            ParseError: If the file cannot be read
+        """
+        if self.cache is None:
+            return self._check_path(file_path, build, workers)
+
+        # Only files that parsed cleanly are cached, so a hit has no problems
+        raw = self._read_bytes(file_path)
+        key = self.cache.key(raw, self.content_ids)
+        quiz = self.cache.get(key)
+        if quiz is not None:
+            return CheckResult(quiz if build else None, [])
+
+        if workers > 1:
+            result = self._check_path(file_path, build, workers)
+        else:
+            result = self.check_content(self._decode(raw, file_path), build)
+        if result.quiz is not None:
+            self.cache.put(key, result.quiz)
+        return result
+
+    def _check_path(self, file_path: str, build: bool, workers: int) -> CheckResult:
+        """Check a quiz file without the cache, as for check_file."""
+        if workers > 1:
+            content, parts = self._plan_parts(file_path, workers)
+            if len(parts) > 1:
+                results = self._map_parts(parts, workers, check=True, build=build)
+                return self._build_check_result(results, build, content)
+            return self.check_content(content, build)
+
+        return self.check_content(self._read_file(file_path), build)
+
+    def check_content(self, content: str, build: bool = True) -> CheckResult:
+        """Validate quiz content and build its Quiz in a single pass.
+
+        Args:
+            content: Quiz content as string
+            build: Whether to build the Quiz; with False the content is only
+                validated
+
+        Returns:
+            CheckResult with the Quiz (if built and valid) and the diagnostics
+        """
+        results = self._parse_blocks(content, check=True, build=build)
+        return self._build_check_result([results], build, content)
+
+    def _read_file(self, file_path: str) -> str:
+        """Read a quiz file as text.
+
+        Raises:
+            ParseError: If the file is missing or not UTF-8
+        """
         try:
             with open(file_path, "r", encoding="utf-8") as f:
-                content = f.read()
+                return f.read()
+        except FileNotFoundError as e:
+            raise ParseError(f"File not found: {file_path}") from e
+        except UnicodeDecodeError as e:
+            raise ParseError(f"File must be UTF-8 encoded: {file_path}") from e
+
+    def _read_bytes(self, file_path: str) -> bytes:
+        """Read the raw content of a quiz file.
+
+        Raises:
+            ParseError: If the file is missing
+        """
+        try:
+            with open(file_path, "rb") as f:
+                return f.read()
         except FileNotFoundError as e:
             raise ParseError(f"File not found: {file_path}") from e
+
+    def _decode(self, raw: bytes, file_path: str) -> str:
+        """Decode raw file content as _read_file would read it.
+
+        Raises:
+            ParseError: If the content is not UTF-8
+        """
+        try:
+            return _translate_newlines(str(raw, "utf-8"))
         except UnicodeDecodeError as e:
             raise ParseError(f"File must be UTF-8 encoded: {file_path}") from e
 
-        return self.parse_content(content)
+    def _plan_parts(
+        self, file_path: str, workers: int
+    ) -> Tuple[str, List[Tuple[str, int, int, int]]]:
+        """Read a quiz file and split it into parts for parallel parsing.
+
+        Args:
+            file_path: Path to the quiz file
+            workers: Number of worker processes
+
+        Returns:
+            Tuple of the file text (with universal newlines) and the parts as
+            (file path, start byte, end byte, start offset in the text); small
+            files yield a single part
+
+        Raises:
+            ParseError: If the file cannot be read
+        """
+        try:
+            with open(file_path, "rb") as f:
+                if os.fstat(f.fileno()).st_size:
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as view:
+                        content = str(view, "utf-8")
+                else:
+                    content = ""
+        except FileNotFoundError as e:
+            raise ParseError(f"File not found: {file_path}") from e
+        except UnicodeDecodeError as e:
+            raise ParseError(f"File must be UTF-8 encoded: {file_path}") from e
+
+        part_size = max(
+            PARALLEL_MIN_PART_SIZE,
+            len(content) // (workers * PARALLEL_PARTS_PER_WORKER),
+        )
+        # Split points are only looked for at \n line breaks, so files with old
+        # Mac line endings are parsed serially
+        crlf_count = content.count("\r\n")
+        if content.count("\r") != crlf_count:
+            bounds: List[int] = []
+        else:
+            bounds = _split_points(content, part_size)
+
+        parts: List[Tuple[str, int, int, int]] = []
+        start = 0
+        byte_start = 0
+        text_start = 0
+        ascii_only = content.isascii()
+        for end in bounds + [len(content)]:
+            size = end - start if ascii_only else len(content[start:end].encode())
+            parts.append((file_path, byte_start, byte_start + size, text_start))
+            # Workers see \r\n as \n, which shifts later offsets
+            text_start += end - start
+            if crlf_count:
+                text_start -= content.count("\r\n", start, end)
+            start = end
+            byte_start += size
+
+        return _translate_newlines(content), parts
+
+    def _map_parts(
+        self,
+        parts: List[Tuple[str, int, int, int]],
+        workers: int,
+        check: bool = False,
+        build: bool = True,
+    ) -> Iterator[BlockResults]:
+        """Parse the parts of a quiz file across a process pool.
+
+        Workers map the file themselves and receive only byte offsets, so the
+        text is never pickled.
+
+        Args:
+            parts: Parts from _plan_parts
+            workers: Maximum number of worker processes
+            check: Whether to check the blocks instead of parsing them
+            build: Whether checked blocks are turned into questions
+
+        Yields:
+            BlockResults of each part, in file order
+        """
+        jobs = [part + (check, build, self.content_ids) for part in parts]
+        with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as pool:
+            yield from pool.map(_parse_part, jobs)
 
     def parse_content(self, content: str) -> Quiz:
         """Parse quiz content from a string.
 
+        The content is tokenized in a single pass; question blocks are parsed
+        as soon as the next header closes them.
+
         Args:
             content: Quiz content as string
 
@@ -66,90 +354,487 @@ class MarkdownParser:
         Raises:
             ParseError: If parsing fails
         """
-        # Extract and parse YAML front matter
-        metadata = self._extract_metadata(content)
+        return self._build_quiz([self._parse_blocks(content)])
+
+    def reparse_content(self, content: str) -> Quiz:
+        """Parse quiz content, reusing the blocks unchanged since the last call.
+
+        The content is split before every question header and each block is
+        parsed on its own, as parts are when parsing in parallel. A block whose
+        text and following line match a block of the previous call reuses its
+        results, including its Question objects, so only edited blocks are
+        parsed again; ``self.reparsed`` counts them.
+
+        Args:
+            content: Quiz content as string, with ``\n`` line breaks
+
+        Returns:
+            Parsed Quiz object
+
+        Raises:
+            ParseError: If parsing fails
+        """
+        bounds = [0] + _split_points(content, 1) + [len(content)]
+        previous = self._blocks
+        blocks: Dict[Tuple[str, str], BlockResults] = {}
+        results: List[BlockResults] = []
+        reparsed = 0
+
+        for start, end in zip(bounds, bounds[1:]):
+            line_end = content.find("\n", end)
+            following = content[end:] if line_end == -1 else content[end : line_end + 1]
+            key = (content[start:end], following)
+            # A repeated block is parsed again so it gets its own questions
+            part = None if key in blocks else previous.get(key)
+            if part is None:
+                part = self._parse_blocks(
+                    content[start:end] + following, end - start, not following
+                )
+                reparsed += 1
+            blocks.setdefault(key, part)
+            results.append(part)
+
+        self._blocks = blocks
+        self.reparsed = reparsed
+        return self._build_quiz(results)
 
-        # Remove YAML from content
-        content_without_yaml = self.YAML_PATTERN.sub("", content).strip()
+    def _parse_blocks(
+        self,
+        buffer: str,
+        end: Optional[int] = None,
+        final: bool = True,
+        check: bool = False,
+        build: bool = True,
+        offset: int = 0,
+    ) -> BlockResults:
+        """Parse every question block of ``buffer[:end]``.
 
-        # Extract questions
-        questions = self._extract_questions(content_without_yaml)
+        Question errors do not stop the scan; the first one is returned so the
+        caller can decide its precedence over YAML errors. When checking, every
+        block is checked against the syntax rules instead and its problems are
+        collected as diagnostics.
+
+        Args:
+            buffer: Source text
+            end: Offset to stop at (default: end of buffer)
+            final: Whether ``end`` is the end of the document
+            check: Whether to check the blocks instead of parsing them
+            build: Whether checked blocks are turned into questions
+            offset: Offset of ``buffer`` in the file, added to reported offsets
+
+        Returns:
+            BlockResults with block indices counted from 1
+        """
+        front_matter: Optional[Tuple[int, str]] = None
+        questions: List[Question] = []
+        block_count = 0
+        failure: Optional[Tuple[int, Exception]] = None
+        diagnostics: List[Tuple[int, str]] = []
+        question_ids: List[Tuple[int, int, str, bool]] = []
+
+        for header, tokens, block_front_matter in self._iter_blocks(buffer, end, final):
+            if front_matter is None and block_front_matter is not None:
+                start, stop = block_front_matter.start, block_front_matter.end
+                front_matter = (offset + start, buffer[start:stop])
+            if header is None:
+                continue
+            block_count += 1
+            if check:
+                number = header.match.group("number")  # type: ignore[union-attr]
+                fields = self._read_question_block(buffer, tokens)
+                if fields.id_offset is not None:
+                    question_ids.append(
+                        (
+                            offset + fields.id_offset,
+                            int(number),
+                            fields.question_id,
+                            True,
+                        )
+                    )
+                elif fields.question_id:
+                    question_ids.append(
+                        (offset + header.start, int(number), fields.question_id, False)
+                    )
+                problems = question_problems(fields, header.start)
+                diagnostics.extend(
+                    (offset + position, f"Question {number}: {problem}")
+                    for position, problem in problems
+                )
+                if build and not problems:
+                    questions.append(self._question_from_fields(fields, True))
+            elif failure is None:
+                error = self._collect_question(buffer, tokens, questions)
+                if error is not None:
+                    failure = (block_count, error)
+
+        return BlockResults(
+            questions, block_count, front_matter, failure, diagnostics, question_ids
+        )
+
+    def _build_quiz(self, results: Iterable[BlockResults]) -> Quiz:
+        """Assemble a Quiz from the results of consecutive parts of a file.
+
+        Args:
+            results: Results of each part, in file order
+
+        Returns:
+            Parsed Quiz object
+
+        Raises:
+            ParseError: If parsing fails
+        """
+        front_matter: Optional[Tuple[int, str]] = None
+        questions: List[Question] = []
+        block_count = 0
+        failure: Optional[Exception] = None
+
+        for part in results:
+            if front_matter is None:
+                front_matter = part.front_matter
+            if failure is None and part.failure is not None:
+                index, error = part.failure
+                failure = self._question_error(block_count + index, error)
+            questions.extend(part.questions)
+            block_count += part.block_count
+
+        metadata = self._build_metadata(front_matter and front_matter[1])
+
+        if not block_count:
+            raise ParseError(
+                "No questions found in quiz. Questions must start with '## Question N'"
+            )
+        if failure is not None:
+            raise failure
 
         # Create and return Quiz object
         quiz = Quiz(metadata=metadata, questions=questions)
         return quiz
 
-    def _extract_metadata(self, content: str) -> QuizMetadata:
-        """Extract YAML metadata from content.
+    def _build_check_result(
+        self, results: Iterable[BlockResults], build: bool, content: str
+    ) -> CheckResult:
+        """Assemble a CheckResult from the checked parts of a file.
 
         Args:
-            content: Content to parse
+            results: Results of each part, in file order
+            build: Whether the parts built their questions
+            content: Whole file text, used to locate problems
 
         Returns:
-            QuizMetadata object
+            CheckResult with the Quiz (if built and valid) and the diagnostics
+        """
+        front_matter: Optional[Tuple[int, str]] = None
+        questions: List[Question] = []
+        block_count = 0
+        problems: List[Tuple[int, str]] = []
+        seen_ids: Set[str] = set()
+
+        for part in results:
+            if front_matter is None:
+                front_matter = part.front_matter
+            questions.extend(part.questions)
+            block_count += part.block_count
+            problems.extend(part.diagnostics)
+            for offset, number, question_id, explicit in part.question_ids:
+                if question_id in seen_ids:
+                    if explicit:
+                        message = f"Duplicate question ID '{question_id}'"
+                    else:
+                        message = (
+                            "Same content as an earlier question "
+                            f"(content ID '{question_id}')"
+                        )
+                    problems.append((offset, f"Question {number}: {message}"))
+                seen_ids.add(question_id)
+
+        # File-level problems are reported first, as the validator did
+        diagnostics: List[ValidationError] = []
+        metadata: Optional[QuizMetadata] = None
+        try:
+            metadata = self._build_metadata(front_matter and front_matter[1])
+        except (ParseError, ValueError) as e:
+            diagnostics.append(self._front_matter_error(e, front_matter, content))
+        if not block_count:
+            diagnostics.append(
+                ValidationError(
+                    "No questions found. "
+                    "Questions must start with '## Question N' where N is a number."
+                )
+            )
+
+        if problems:
+            # Built once per file, and only when there is something to locate
+            index = LineIndex(content)
+            problems.sort(key=lambda problem: problem[0])
+            diagnostics.extend(
+                ValidationError(message, *index.position(offset))
+                for offset, message in problems
+            )
+
+        if diagnostics or not build:
+            return CheckResult(None, diagnostics)
+        # Every rule of the Quiz model was checked above
+        quiz = construct_trusted(Quiz, {"metadata": metadata, "questions": questions})
+        return CheckResult(quiz, [])
+
+    def _front_matter_error(
+        self,
+        error: Exception,
+        front_matter: Optional[Tuple[int, str]],
+        content: str,
+    ) -> ValidationError:
+        """Turn a front matter error into a diagnostic at its source position.
+
+        Args:
+            error: Error raised while building the metadata
+            front_matter: Offset and body of the front matter
+            content: Whole file text
+
+        Returns:
+            ValidationError pointing into the front matter
+        """
+        if front_matter is None:
+            return ValidationError(str(error))
+        line = content.count("\n", 0, front_matter[0]) + 1
+        mark = getattr(error.__cause__, "problem_mark", None)
+        if mark is None:
+            return ValidationError(str(error), line)
+        return ValidationError(str(error), line + mark.line, mark.column + 1)
+
+    def iter_questions(self, source: Union[str, TextIO]) -> Iterator[Question]:
+        """Parse a quiz file incrementally, yielding questions as they close.
+
+        The file is read line by line and each ``## Question N`` block is parsed
+        as soon as the next header (or the end of the file) is reached, so
+        memory is bounded by the largest block rather than the whole file.
+        Errors are raised when the offending block is reached. The front
+        matter, once read, is available as ``self.metadata``.
+
+        Args:
+            source: Path to the quiz file or an open text file handle
+
+        Yields:
+            Validated Question objects in file order
 
         Raises:
-            ParseError: If YAML is invalid
+            ParseError: If parsing fails
+        """
+        self.metadata = None
+        if not isinstance(source, str):
+            yield from self._iter_stream(source)
+            return
+
+        try:
+            with open(source, "r", encoding="utf-8") as f:
+                yield from self._iter_stream(f)
+        except FileNotFoundError as e:
+            raise ParseError(f"File not found: {source}") from e
+        except UnicodeDecodeError as e:
+            raise ParseError(f"File must be UTF-8 encoded: {source}") from e
+
+    def _iter_stream(self, handle: TextIO) -> Iterator[Question]:
+        """Split a text stream into header-delimited chunks and parse them.
+
+        Args:
+            handle: Open text file handle
+
+        Yields:
+            Validated Question objects in file order
         """
-        yaml_match = self.YAML_PATTERN.search(content)
-
-        if yaml_match:
-            yaml_content = yaml_match.group(1)
-            try:
-                yaml_data = yaml.safe_load(yaml_content) or {}
-            except yaml.YAMLError as e:
-                raise ParseError(f"Invalid YAML front matter: {e}") from e
-
-            # Set defaults
-            title = yaml_data.get("title", "Untitled Quiz")
-            description = yaml_data.get("description")
-            points_per_question = yaml_data.get("points_per_question", 1)
-            shuffle_answers = yaml_data.get("shuffle_answers", False)
-
-            return QuizMetadata(
-                title=title,
-                description=description,
-                points_per_question=points_per_question,
-                shuffle_answers=shuffle_answers,
+        seen_ids: Set[str] = set()
+        block_count = 0
+        lines: List[str] = []
+        # Headers inside a ``---`` fenced block do not start a new chunk. As in
+        # the tokenizer, the first non-blank line after an opening fence is
+        # part of the body even if it is a fence itself.
+        fenced = False
+        body_started = False
+
+        for line in handle:
+            is_fence = line.startswith(FENCE) and not line[len(FENCE) :].strip()
+            if fenced:
+                if body_started and is_fence:
+                    fenced = False
+                elif line.strip():
+                    body_started = True
+            elif is_fence and line.endswith("\n"):
+                fenced = True
+                body_started = False
+            elif line.startswith("##"):
+                match = LINE_PATTERN.match(line)
+                if match and match.lastgroup in ("header", "stray_header"):
+                    for question in self._parse_chunk(
+                        "".join(lines), line, block_count + 1
+                    ):
+                        block_count += 1
+                        self._check_unique_id(question, block_count, seen_ids)
+                        yield question
+                    lines = []
+            lines.append(line)
+
+        for question in self._parse_chunk("".join(lines), "", block_count + 1):
+            block_count += 1
+            self._check_unique_id(question, block_count, seen_ids)
+            yield question
+
+        if self.metadata is None:
+            self.metadata = self._build_metadata(None)
+        if not block_count:
+            raise ParseError(
+                "No questions found in quiz. Questions must start with '## Question N'"
             )
-        else:
-            # Use defaults
-            return QuizMetadata(title="Untitled Quiz")
 
-    def _extract_questions(self, content: str) -> List[Question]:
-        """Extract question blocks from content.
+    def _parse_chunk(self, chunk: str, following: str, index: int) -> List[Question]:
+        """Parse the question blocks of one chunk of a streamed file.
 
         Args:
-            content: Content to parse
+            chunk: Whole lines of the file, starting at a header (or at the
+                start of the file)
+            following: The line after the chunk, or "" at the end of the file
+            index: 1-based position of the chunk's first block in the file
 
         Returns:
-            List of Question objects
+            Parsed questions of the chunk
 
         Raises:
             ParseError: If parsing fails
         """
-        questions: List[Question] = []
-        question_blocks = self.QUESTION_PATTERN.findall(content)
+        results = self._parse_blocks(chunk + following, len(chunk), not following)
+        if results.front_matter is not None and self.metadata is None:
+            self.metadata = self._build_metadata(results.front_matter[1])
+        if results.failure is not None:
+            failed_index, error = results.failure
+            raise self._question_error(index + failed_index - 1, error)
+        return results.questions
 
-        if not question_blocks:
+    def _check_unique_id(
+        self, question: Question, index: int, seen_ids: Set[str]
+    ) -> None:
+        """Reject a streamed question whose ID was already used.
+
+        Raises:
+            ParseError: If the ID is a duplicate
+        """
+        if question.id in seen_ids:
             raise ParseError(
-                "No questions found in quiz. Questions must start with '## Question N'"
+                f"Error parsing Question {index}: Duplicate question ID: {question.id}"
             )
+        seen_ids.add(question.id)
+
+    def _iter_blocks(
+        self, buffer: str, end: Optional[int] = None, final: bool = True
+    ) -> Iterator[Tuple[Optional[Token], List[Token], Optional[Token]]]:
+        """Group the tokens of ``buffer[:end]`` into header-delimited blocks.
+
+        Args:
+            buffer: Source text
+            end: Offset to stop at (default: end of buffer)
+            final: Whether ``end`` is the end of the document
+
+        Yields:
+            Tuples of (header, tokens, front matter). The header is None for
+            text that does not belong to a question: the preamble, content
+            after a stray header and a trailing header with nothing after it.
+            The front matter is the first FRONT_MATTER token of the block.
+        """
+        header: Optional[Token] = None
+        tokens: List[Token] = []
+        front_matter: Optional[Token] = None
+
+        for token in tokenize(buffer, 0, end):
+            kind = token[0]
+            if kind is _HEADER or kind is _STRAY_HEADER:
+                yield header, tokens, front_matter
+                header = token if kind is _HEADER else None
+                tokens = []
+                front_matter = None
+                continue
+
+            if kind is _FRONT_MATTER and front_matter is None:
+                front_matter = token
+            tokens.append(token)
+
+        if final and header is not None and all(_is_blank(t) for t in tokens):
+            header = None
+        yield header, tokens, front_matter
+
+    def _build_metadata(self, yaml_content: Optional[str]) -> QuizMetadata:
+        """Build quiz metadata from YAML front matter.
+
+        Args:
+            yaml_content: Front matter body, or None if the file has none
+
+        Returns:
+            QuizMetadata object
 
-        for idx, block in enumerate(question_blocks, 1):
-            try:
-                question = self._parse_question_block(block)
-                questions.append(question)
-            except ParseError as e:
-                raise ParseError(f"Error parsing Question {idx}: {e.message}") from e
+        Raises:
+            ParseError: If YAML is invalid
+        """
+        if yaml_content is None:
+            # Use defaults
+            return QuizMetadata(title="Untitled Quiz")
+
+        try:
+            yaml_data = yaml.safe_load(yaml_content) or {}
+        except yaml.YAMLError as e:
+            raise ParseError(f"Invalid YAML front matter: {e}") from e
+        if not isinstance(yaml_data, dict):
+            raise ParseError("Invalid YAML front matter: expected key: value pairs")
+
+        # Set defaults
+        title = yaml_data.get("title", "Untitled Quiz")
+        description = yaml_data.get("description")
+        points_per_question = yaml_data.get("points_per_question", 1)
+        shuffle_answers = yaml_data.get("shuffle_answers", False)
+
+        return QuizMetadata(
+            title=title,
+            description=description,
+            points_per_question=points_per_question,
+            shuffle_answers=shuffle_answers,
+        )
+
+    def _collect_question(
+        self, buffer: str, tokens: List[Token], questions: List[Question]
+    ) -> Optional[Exception]:
+        """Parse one question block and append it to ``questions``.
+
+        Args:
+            buffer: Source text the tokens refer to
+            tokens: Tokens of the block, excluding its header
+            questions: List to append the parsed question to
+
+        Returns:
+            The error raised by the block, or None on success
+        """
+        try:
+            questions.append(self._parse_question_block(buffer, tokens))
+        except (ParseError, ValueError) as e:
+            return e
+        return None
 
-        return questions
+    def _question_error(self, index: int, error: Exception) -> Exception:
+        """Attach the question number to a ParseError raised by a block.
 
-    def _parse_question_block(self, block: str) -> Question:
+        Args:
+            index: 1-based position of the block in the file
+            error: Error raised while parsing the block
+
+        Returns:
+            The error to raise
+        """
+        if not isinstance(error, ParseError):
+            return error
+        wrapped = ParseError(f"Error parsing Question {index}: {error.message}")
+        wrapped.__cause__ = error
+        return wrapped
+
+    def _parse_question_block(self, buffer: str, tokens: List[Token]) -> Question:
         """Parse a single question block.
 
         Args:
-            block: Question block text
+            buffer: Source text the tokens refer to
+            tokens: Tokens of the block, excluding its header
 
         Returns:
             Parsed Question object
@@ -157,114 +842,264 @@ class MarkdownParser:
         Raises:
             ParseError: If parsing fails
         """
-        lines = block.split("\n")
+        fields = self._read_question_block(buffer, tokens)
+
+        if fields.problems:
+            kind, value, _ = fields.problems[0]
+            if kind == "type":
+                raise ParseError(
+                    f"Invalid question type: {value}. "
+                    "Must be 'multiple_choice' or 'true_false'"
+                )
+            if kind == "points":
+                raise ParseError(f"Invalid points value: {value}. Must be an integer")
+            # A choice with blank text, which the AnswerChoice model rejects
+            self._question_from_fields(fields)
+
+        # Validate
+        if not fields.question_type:
+            raise ParseError(
+                "Question type not specified. "
+                "Use [Type: multiple_choice] or [Type: true_false]"
+            )
+
+        if not fields.text:
+            raise ParseError("Question text is empty")
+
+        if not fields.choices:
+            raise ParseError("No answer choices found")
+
+        # Blocks that break a model rule go through the validators for the error
+        trusted = not question_problems(fields, 0)
+        return self._question_from_fields(fields, trusted)
+
+    def _read_question_block(self, buffer: str, tokens: List[Token]) -> QuestionFields:
+        """Read the fields of a question block without validating them.
+
+        Args:
+            buffer: Source text the tokens refer to
+            tokens: Tokens of the block, excluding its header
+
+        Returns:
+            QuestionFields of the block
+        """
         question_id: str = ""  # Generate ID only if not provided, don't set it later
         question_type: Optional[QuestionType] = None
         points = 1
         question_text = ""
         text_lines: List[str] = []
-        choices: List[AnswerChoice] = []
+        choices: List[Tuple[str, str, bool, int]] = []
         feedback: Optional[str] = None
+        feedback_lines: Optional[List[str]] = None
+        problems: List[Tuple[str, str, int]] = []
+        id_offset: Optional[int] = None
+        points_offset: Optional[int] = None
         in_choices = False
         in_feedback = False
 
-        line_idx = 0
-        while line_idx < len(lines):
-            line = lines[line_idx]
+        for kind, start, end, match in tokens:
+            # Feedback continues until the next blank line
+            if feedback_lines is not None:
+                if kind is _BLANK or kind is _FRONT_MATTER:
+                    feedback = " ".join(feedback_lines)
+                    feedback_lines = None
+                else:
+                    feedback_lines.append(buffer[start:end].strip())
+                continue
 
             # Parse metadata tags
-            meta_match = self.METADATA_PATTERN.match(line)
-            if meta_match:
-                key, value = meta_match.groups()
+            if kind is _METADATA:
+                key, value = match.group("key", "value")  # type: ignore[union-attr]
                 if key == "Type":
                     try:
                         question_type = QuestionType(value.strip().lower())
                     except ValueError:
-                        raise ParseError(
-                            f"Invalid question type: {value}. "
-                            "Must be 'multiple_choice' or 'true_false'"
-                        )
+                        problems.append(("type", value, match.start("value")))  # type: ignore[union-attr]
                 elif key == "Points":
+                    points_offset = match.start("value")  # type: ignore[union-attr]
                     try:
                         points = int(value.strip())
                     except ValueError:
-                        raise ParseError(
-                            f"Invalid points value: {value}. Must be an integer"
-                        )
+                        problems.append(("points", value, points_offset))
                 elif key == "ID":
                     question_id = value.strip()
-                line_idx += 1
+                    id_offset = match.start("value")  # type: ignore[union-attr]
                 continue
 
             # Check for answer choices
-            if line.strip() and not in_feedback:
-                choice_match = self.ANSWER_PATTERN.match(line)
-                if choice_match:
-                    is_correct, letter, text = choice_match.groups()
-                    choices.append(
-                        AnswerChoice(
-                            letter=letter,
-                            text=text.strip(),
-                            is_correct=is_correct is not None,
-                        )
-                    )
-                    in_choices = True
-                    line_idx += 1
-                    continue
+            if kind is _CHOICE and not in_feedback:
+                is_correct, letter, text = match.group(  # type: ignore[union-attr]
+                    "mark", "letter", "answer"
+                )
+                text = text.strip()
+                if not text:
+                    problems.append(("choice", letter, start))
+                choices.append((letter, text, is_correct is not None, start))
+                in_choices = True
+                continue
 
             # Check for feedback
-            if (
-                in_choices
-                and line.strip()
-                and line.strip().lower().startswith("feedback:")
-            ):
-                feedback_text = line.strip()[9:].strip()
+            if kind is _FEEDBACK and in_choices:
+                feedback_text = buffer[start:end].strip()[9:].strip()
                 feedback_lines = [feedback_text] if feedback_text else []
-
-                # Collect remaining feedback lines
-                line_idx += 1
-                while line_idx < len(lines):
-                    next_line = lines[line_idx]
-                    if next_line.strip():
-                        feedback_lines.append(next_line.strip())
-                    else:
-                        break
-                    line_idx += 1
-
-                feedback = " ".join(feedback_lines)
                 in_feedback = True
                 continue
 
             # Question text
-            if not in_choices and line.strip():
-                text_lines.append(line)
+            if not in_choices and kind is not _BLANK and kind is not _FRONT_MATTER:
+                text_lines.append(buffer[start:end])
 
-            line_idx += 1
+        if feedback_lines is not None:
+            feedback = " ".join(feedback_lines)
 
         # Join question text
         if text_lines:
             question_text = "\n".join(text_lines).strip()
 
-        # Validate
-        if not question_type:
-            raise ParseError(
-                "Question type not specified. "
-                "Use [Type: multiple_choice] or [Type: true_false]"
-            )
+        if question_id:
+            explicit_id_offset = id_offset
+        else:
+            explicit_id_offset = None
+            if self.content_ids and question_type is not None:
+                question_id = content_id(
+                    question_type,
+                    question_text,
+                    (choice[:3] for choice in choices),
+                    points,
+                )
 
-        if not question_text:
-            raise ParseError("Question text is empty")
+        return QuestionFields(
+            question_id,
+            question_type,
+            points,
+            question_text,
+            choices,
+            feedback,
+            problems,
+            explicit_id_offset,
+            points_offset,
+        )
 
-        if not choices:
-            raise ParseError("No answer choices found")
+    def _question_from_fields(
+        self, fields: QuestionFields, trusted: bool = False
+    ) -> Question:
+        """Build a Question model from the fields of a block.
+
+        Args:
+            fields: Fields read from the block
+            trusted: Whether the fields passed ``question_problems``, in which
+                case the model validators are skipped
+
+        Raises:
+            ValueError: If the model rejects the fields
+        """
+        if trusted:
+            # Apply the normalisation the validators would; the rest of their
+            # rules are the ones question_problems already enforced
+            return construct_trusted(
+                Question,
+                {
+                    "id": fields.question_id or str(uuid.uuid4()),
+                    "type": fields.question_type,
+                    "text": fields.text,
+                    "choices": [
+                        construct_trusted(
+                            AnswerChoice,
+                            {"letter": letter, "text": text, "is_correct": is_correct},
+                        )
+                        for letter, text, is_correct, _ in fields.choices
+                    ],
+                    "points": fields.points,
+                    # Feedback lines are stripped as they are read
+                    "feedback": fields.feedback or None,
+                },
+            )
 
-        # Create and return Question
         # Note: If question_id is empty, Question model will auto-generate one
         return Question(
-            id=question_id,  # Empty string will trigger auto-generation in model
-            type=question_type,
-            text=question_text,
-            choices=choices,
-            points=points,
-            feedback=feedback,
+            id=fields.question_id,  # Empty string will trigger auto-generation
+            type=fields.question_type,  # type: ignore[arg-type]
+            text=fields.text,
+            choices=[
+                AnswerChoice(letter=letter, text=text, is_correct=is_correct)
+                for letter, text, is_correct, _ in fields.choices
+            ],
+            points=fields.points,
+            feedback=fields.feedback,
         )
+
+
+def _is_blank(token: Token) -> bool:
+    """Check whether a token separates paragraphs like an empty line.
+
+    Fenced blocks are removed from the text and leave an empty line behind.
+    """
+    return token[0] is _BLANK or token[0] is _FRONT_MATTER
+
+
+def _translate_newlines(text: str) -> str:
+    """Apply the universal newlines translation of text mode files."""
+    if "\r" not in text:
+        return text
+    return text.replace("\r\n", "\n").replace("\r", "\n")
+
+
+def _split_points(content: str, part_size: int) -> List[int]:
+    """Choose offsets to split a file at for parallel parsing.
+
+    Every split point is the start of a header line outside any fenced block,
+    so each part tokenizes exactly as it would within the whole file.
+
+    Args:
+        content: Whole file text
+        part_size: Minimum distance between split points
+
+    Returns:
+        Increasing offsets, excluding 0
+    """
+    spans = fenced_spans(content)
+    span_starts = [start for start, _ in spans]
+    points: List[int] = []
+    pos = part_size
+
+    while True:
+        match = HEADER_LINE_PATTERN.search(content, pos)
+        if match is None:
+            return points
+        point = match.start()
+        i = bisect_right(span_starts, point) - 1
+        if i >= 0 and point < spans[i][1]:
+            pos = spans[i][1]
+            continue
+        points.append(point)
+        pos = point + part_size
+
+
+@lru_cache(maxsize=None)
+def _worker_parser(content_ids: bool) -> MarkdownParser:
+    """Return the parser reused by a worker process across parts."""
+    return MarkdownParser(content_ids)
+
+
+def _parse_part(part: Tuple[str, int, int, int, bool, bool, bool]) -> BlockResults:
+    """Parse ``file[start:end]`` in a worker process.
+
+    Args:
+        part: File path, byte offsets of the part, its offset in the file text,
+            the ``check`` and ``build`` flags of ``MarkdownParser._parse_blocks``
+            and the parser's ``content_ids`` option
+
+    Returns:
+        BlockResults with block indices counted from the start of the part
+    """
+    file_path, start, end, offset, check, build, content_ids = part
+    with open(file_path, "rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as view:
+            line_end = view.find(b"\n", end)
+            following_end = len(view) if line_end == -1 else line_end + 1
+            chunk = _translate_newlines(str(view[start:end], "utf-8"))
+            following = _translate_newlines(str(view[end:following_end], "utf-8"))
+
+    return _worker_parser(content_ids)._parse_blocks(
+        chunk + following, len(chunk), not following, check, build, offset
+    )
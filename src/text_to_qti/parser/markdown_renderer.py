@@ -0,0 +1,147 @@
+"""Markdown to HTML rendering of question text and feedback."""
+
+from collections import OrderedDict
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Iterable,
+    Optional,
+    Sequence,
+    Union,
+)
+
+from text_to_qti.parser.question_bank import QuestionBank, QuestionView, QuizSource
+from text_to_qti.parser.question_models import Question, Quiz, construct_trusted
+
+if TYPE_CHECKING:
+    import markdown
+
+# Python-Markdown extensions the converter is built with
+EXTENSIONS = ("extra", "sane_lists")
+
+# Rendered texts kept by default
+DEFAULT_CACHE_SIZE = 4096
+
+
+class MarkdownRenderer:
+    """Render question text and feedback from Markdown to HTML.
+
+    A single converter, built on first use, renders every text and is reset
+    in between, since building one costs far more than rendering a short
+    text; importing Python-Markdown is deferred until then too. Rendered
+    HTML is memoized by source text, keeping the ``cache_size`` most recently
+    used, because stems and feedback such as "Correct!" repeat across
+    questions and rebuilds.
+    """
+
+    def __init__(self, cache_size: int = DEFAULT_CACHE_SIZE) -> None:
+        """Initialize renderer.
+
+        Args:
+            cache_size: Number of rendered texts to keep
+        """
+        self.cache_size = cache_size
+        self._converter: Optional["markdown.Markdown"] = None
+        self._cache: "OrderedDict[str, str]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def converter(self) -> "markdown.Markdown":
+        """The Markdown converter, built on first use."""
+        if self._converter is None:
+            # Deferred, as the import alone takes longer than most conversions
+            import markdown
+
+            self._converter = markdown.Markdown(extensions=list(EXTENSIONS))
+        return self._converter
+
+    def render(self, text: str) -> str:
+        """Render a text to HTML.
+
+        Args:
+            text: Markdown source
+
+        Returns:
+            The HTML fragment
+        """
+        html = self._cache.get(text)
+        if html is not None:
+            self._cache.move_to_end(text)
+            self.hits += 1
+            return html
+
+        self.misses += 1
+        converter = self.converter
+        rendered: str = converter.convert(text)
+        converter.reset()
+        self._cache[text] = rendered
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return rendered
+
+    def render_many(self, texts: Iterable[str]) -> Dict[str, str]:
+        """Render texts, each unique one once.
+
+        Args:
+            texts: Markdown sources, possibly repeated
+
+        Returns:
+            HTML of each unique text, by source, in order of first appearance
+        """
+        rendered: Dict[str, str] = {}
+        for text in texts:
+            if text not in rendered:
+                rendered[text] = self.render(text)
+        return rendered
+
+    def render_quiz(self, quiz: QuizSource) -> QuizSource:
+        """Render the text and feedback of every question of a quiz.
+
+        Answer choices are plain text in QTI, so they are left as they are.
+
+        Args:
+            quiz: Quiz or QuestionBank with Markdown text
+
+        Returns:
+            A quiz of the same kind with HTML text and feedback
+        """
+        source: Sequence[Union[Question, QuestionView]] = quiz.questions
+        rendered = self.render_many(_texts(source))
+
+        questions = (_with_html(question, rendered) for question in source)
+        if isinstance(quiz, QuestionBank):
+            return QuestionBank(quiz.metadata, questions)
+        # The questions were validated as part of the original quiz
+        return construct_trusted(
+            Quiz, {"metadata": quiz.metadata, "questions": list(questions)}
+        )
+
+    def __getstate__(self) -> Dict[str, Any]:
+        """Return the state sent to worker processes, without the converter."""
+        state = self.__dict__.copy()
+        state["_converter"] = None
+        return state
+
+
+def _with_html(
+    question: Union[Question, QuestionView], rendered: Dict[str, str]
+) -> Question:
+    """Return a copy of a question with its rendered text and feedback."""
+    feedback = question.feedback
+    values = {
+        "text": rendered[question.text],
+        "feedback": None if feedback is None else rendered[feedback],
+    }
+    if isinstance(question, QuestionView):
+        question = question.to_question()
+    return question.model_copy(update=values)
+
+
+def _texts(questions: Sequence[Union[Question, QuestionView]]) -> Iterable[str]:
+    """Yield the text and feedback, if any, of each question."""
+    for question in questions:
+        yield question.text
+        if question.feedback is not None:
+            yield question.feedback
@@ -0,0 +1,171 @@
+"""On-disk cache of parsed quizzes, keyed by file content."""
+
+import gc
+import hashlib
+import marshal
+import sys
+from pathlib import Path
+from typing import Any, Optional, Union
+
+from text_to_qti import __version__
+from text_to_qti.parser.question_models import (
+    AnswerChoice,
+    Question,
+    QuestionType,
+    Quiz,
+    QuizMetadata,
+    construct_trusted,
+)
+from text_to_qti.utils.disk_store import DiskStore
+
+# Bumped whenever the entry layout changes
+CACHE_FORMAT = 1
+
+# Default size limit of a cache directory
+DEFAULT_MAX_BYTES = 256 * 2**20
+
+_ENTRY_SUFFIX = ".quiz"
+_TYPES = {question_type.value: question_type for question_type in QuestionType}
+
+
+class ParseCache:
+    """Directory of parsed quizzes shared by parsers and processes.
+
+    Entries are keyed by a hash of the file content, the parser version and
+    the parser options that affect the result, and hold the quiz as marshal
+    data of plain tuples, which loads without running any validation. Entries
+    are kept in a DiskStore, so several processes can share a directory, and
+    once it grows past ``max_bytes`` the least recently used entries are
+    removed.
+    """
+
+    def __init__(
+        self, directory: Union[str, Path], max_bytes: int = DEFAULT_MAX_BYTES
+    ) -> None:
+        """Initialize cache, creating the directory if needed.
+
+        Args:
+            directory: Directory holding the entries
+            max_bytes: Total entry size to evict down to
+        """
+        self._store = DiskStore(directory, _ENTRY_SUFFIX)
+        self.directory = self._store.directory
+        self.max_bytes = max_bytes
+
+    def key(self, content: bytes, *options: Any) -> str:
+        """Return the key of a file's entry.
+
+        Args:
+            content: Raw file content
+            *options: Parser options that change the parsed quiz
+
+        Returns:
+            Hex digest identifying the entry
+        """
+        digest = hashlib.blake2b(digest_size=20)
+        header = (CACHE_FORMAT, __version__, sys.implementation.cache_tag, options)
+        digest.update(repr(header).encode("utf-8"))
+        digest.update(content)
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[Quiz]:
+        """Load a cached quiz.
+
+        Args:
+            key: Entry key
+
+        Returns:
+            The cached Quiz, or None on a miss
+        """
+        data = self._store.read(key)
+        if data is None:
+            return None
+
+        # Loading creates many objects but no cycles, so collections triggered
+        # along the way would only rescan them
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            return _load(marshal.loads(data))
+        except (EOFError, ValueError, TypeError, KeyError):
+            # A damaged entry is dropped and parsed again
+            self._store.remove(key)
+            return None
+        finally:
+            if gc_enabled:
+                gc.enable()
+
+    def put(self, key: str, quiz: Quiz) -> None:
+        """Store a quiz, then evict old entries if the cache is too big.
+
+        Failures to write are ignored, as the cache is only an optimisation.
+
+        Args:
+            key: Entry key
+            quiz: Validated quiz to store
+        """
+        if self._store.write(key, marshal.dumps(_dump(quiz))):
+            self._store.evict(self.max_bytes)
+
+    def clear(self) -> None:
+        """Remove every entry."""
+        self._store.clear()
+
+
+def _dump(quiz: Quiz) -> tuple:
+    """Convert a quiz to the plain tuples stored in an entry."""
+    metadata = quiz.metadata
+    return (
+        (
+            metadata.title,
+            metadata.description,
+            metadata.points_per_question,
+            metadata.shuffle_answers,
+        ),
+        [
+            (
+                q.id,
+                q.type.value,
+                q.text,
+                q.points,
+                q.feedback,
+                [(c.letter, c.text, c.is_correct) for c in q.choices],
+            )
+            for q in quiz.questions
+        ],
+    )
+
+
+def _load(data: tuple) -> Quiz:
+    """Rebuild a quiz from the plain tuples of an entry, without validation."""
+    (title, description, points_per_question, shuffle_answers), rows = data
+    metadata = construct_trusted(
+        QuizMetadata,
+        {
+            "title": title,
+            "description": description,
+            "points_per_question": points_per_question,
+            "shuffle_answers": shuffle_answers,
+        },
+    )
+    questions = [
+        construct_trusted(
+            Question,
+            {
+                "id": question_id,
+                "type": _TYPES[question_type],
+                "text": text,
+                "choices": [
+                    construct_trusted(
+                        AnswerChoice,
+                        {"letter": letter, "text": answer, "is_correct": correct},
+                    )
+                    for letter, answer, correct in choices
+                ],
+                "points": points,
+                "feedback": feedback,
+            },
+        )
+        for question_id, question_type, text, points, feedback, choices in rows
+    ]
+    return construct_trusted(Quiz, {"metadata": metadata, "questions": questions})
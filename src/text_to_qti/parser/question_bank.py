@@ -0,0 +1,260 @@
+"""Columnar in-memory store for large question banks."""
+
+from array import array
+from typing import (
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Union,
+    overload,
+)
+
+from text_to_qti.parser.question_models import (
+    AnswerChoice,
+    Question,
+    QuestionType,
+    Quiz,
+    QuizMetadata,
+    construct_trusted,
+)
+
+# Question types by their code in the type column
+_TYPES = tuple(QuestionType)
+_TYPE_CODES = {question_type: code for code, question_type in enumerate(_TYPES)}
+
+
+class ChoiceRow(NamedTuple):
+    """Answer choice read from a QuestionBank."""
+
+    letter: str
+    text: str
+    is_correct: bool
+
+
+class QuestionView:
+    """Read-only view of one question of a QuestionBank.
+
+    Has the same attributes as Question, read from the bank's columns on
+    access, so it can be used wherever a Question is only read.
+    """
+
+    __slots__ = ("_bank", "_index")
+
+    def __init__(self, bank: "QuestionBank", index: int) -> None:
+        """Initialize view.
+
+        Args:
+            bank: Bank holding the question
+            index: Position of the question in the bank
+        """
+        self._bank = bank
+        self._index = index
+
+    @property
+    def id(self) -> str:
+        """Unique question ID."""
+        return self._bank._ids[self._index]
+
+    @property
+    def type(self) -> QuestionType:
+        """Question type."""
+        return _TYPES[self._bank._types[self._index]]
+
+    @property
+    def text(self) -> str:
+        """Question text."""
+        return self._bank._texts[self._index]
+
+    @property
+    def points(self) -> int:
+        """Points for this question."""
+        return self._bank._points[self._index]
+
+    @property
+    def feedback(self) -> Optional[str]:
+        """Feedback shown after answering."""
+        return self._bank._feedback[self._index]
+
+    @property
+    def choices(self) -> List[ChoiceRow]:
+        """Answer choices, lettered a, b, c, ... in order."""
+        bank = self._bank
+        start = bank._choice_starts[self._index]
+        stop = bank._choice_starts[self._index + 1]
+        return [
+            ChoiceRow(chr(ord("a") + i), bank._choice_texts[j], bool(bank._correct[j]))
+            for i, j in enumerate(range(start, stop))
+        ]
+
+    def to_question(self) -> Question:
+        """Copy the question out of the bank as a Question model."""
+        return construct_trusted(
+            Question,
+            {
+                "id": self.id,
+                "type": self.type,
+                "text": self.text,
+                "choices": [
+                    construct_trusted(AnswerChoice, choice._asdict())
+                    for choice in self.choices
+                ],
+                "points": self.points,
+                "feedback": self.feedback,
+            },
+        )
+
+    def __repr__(self) -> str:
+        """Return a debugging representation."""
+        return f"QuestionView(id={self.id!r}, type={self.type.value!r})"
+
+
+class QuestionBank(Sequence[QuestionView]):
+    """Quiz held in columns instead of one model object per question.
+
+    Scalar fields are stored in typed arrays, answer choices in flat columns
+    indexed by an offset table, and answer and feedback texts are pooled so
+    repeated strings such as "True"/"False" are stored once. Questions are
+    read back as QuestionView rows. A bank has ``metadata``, ``questions``
+    and ``get_total_points()`` like Quiz, so the QTI generators accept it
+    directly.
+
+    Questions are validated models when added, so every row is valid on its
+    own; unlike Quiz, the bank does not check that question IDs are unique
+    until it is converted with ``to_quiz()``.
+    """
+
+    __slots__ = (
+        "metadata",
+        "_ids",
+        "_types",
+        "_texts",
+        "_points",
+        "_feedback",
+        "_choice_starts",
+        "_choice_texts",
+        "_correct",
+        "_pool",
+    )
+
+    def __init__(
+        self, metadata: QuizMetadata, questions: Iterable[Question] = ()
+    ) -> None:
+        """Initialize bank.
+
+        Args:
+            metadata: Quiz metadata
+            questions: Questions to add, e.g. from
+                ``MarkdownParser.iter_questions()``
+        """
+        self.metadata = metadata
+        self._ids: List[str] = []
+        self._types = bytearray()
+        self._texts: List[str] = []
+        # 64-bit on every platform, unlike "l", which is 32-bit on Windows
+        self._points = array("q")
+        self._feedback: List[Optional[str]] = []
+        # Choices of question i are _choice_starts[i]:_choice_starts[i + 1]
+        self._choice_starts = array("q", [0])
+        self._choice_texts: List[str] = []
+        self._correct = bytearray()
+        self._pool: Dict[str, str] = {}
+        self.extend(questions)
+
+    @classmethod
+    def from_quiz(cls, quiz: Quiz) -> "QuestionBank":
+        """Create a bank holding the questions of a quiz.
+
+        Args:
+            quiz: Quiz to copy
+
+        Returns:
+            QuestionBank with the quiz's metadata and questions
+        """
+        return cls(quiz.metadata, quiz.questions)
+
+    def to_quiz(self) -> Quiz:
+        """Copy the bank into a Quiz model.
+
+        Returns:
+            Quiz with the bank's metadata and questions
+
+        Raises:
+            pydantic.ValidationError: If the bank is empty or has duplicate IDs
+        """
+        return Quiz(
+            metadata=self.metadata,
+            questions=[view.to_question() for view in self],
+        )
+
+    def append(self, question: Question) -> None:
+        """Add a question to the end of the bank.
+
+        Args:
+            question: Validated question to add
+        """
+        pool = self._pool
+        self._ids.append(question.id)
+        self._types.append(_TYPE_CODES[question.type])
+        self._texts.append(question.text)
+        self._points.append(question.points)
+        feedback = question.feedback
+        self._feedback.append(
+            None if feedback is None else pool.setdefault(feedback, feedback)
+        )
+        for choice in question.choices:
+            self._choice_texts.append(pool.setdefault(choice.text, choice.text))
+            self._correct.append(choice.is_correct)
+        self._choice_starts.append(len(self._choice_texts))
+
+    def extend(self, questions: Iterable[Question]) -> None:
+        """Add questions to the end of the bank.
+
+        Args:
+            questions: Validated questions to add
+        """
+        for question in questions:
+            self.append(question)
+
+    @property
+    def questions(self) -> "QuestionBank":
+        """The questions of the bank, for code written against Quiz."""
+        return self
+
+    def get_total_points(self) -> int:
+        """Calculate total possible points for the quiz."""
+        return sum(self._points)
+
+    def __len__(self) -> int:
+        """Return the number of questions."""
+        return len(self._ids)
+
+    @overload
+    def __getitem__(self, index: int) -> QuestionView: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[QuestionView]: ...
+
+    def __getitem__(
+        self, index: Union[int, slice]
+    ) -> Union[QuestionView, List[QuestionView]]:
+        """Return a view of one question, or a list of views for a slice."""
+        if isinstance(index, slice):
+            return [QuestionView(self, i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("question index out of range")
+        return QuestionView(self, index)
+
+    def __iter__(self) -> Iterator[QuestionView]:
+        """Iterate over views of the questions in order."""
+        for index in range(len(self)):
+            yield QuestionView(self, index)
+
+
+# Anything the QTI generators accept as a quiz
+QuizSource = Union[Quiz, QuestionBank]
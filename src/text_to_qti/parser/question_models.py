@@ -1,11 +1,14 @@
 """Pydantic models for quiz questions and metadata."""
 
+import hashlib
 import uuid
 from enum import Enum
-from typing import List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Type, TypeVar
 
 from pydantic import BaseModel, Field, field_validator
 
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
 
 class QuestionType(str, Enum):
     """Supported question types."""
@@ -164,13 +167,73 @@ class Quiz(BaseModel):
         if not v:
             raise ValueError("Quiz must have at least one question")
 
-        # Check for duplicate question IDs
-        ids = [q.id for q in v]
-        if len(ids) != len(set(ids)):
-            raise ValueError("Duplicate question IDs found")
+        # Check for duplicate question IDs, including content ID collisions
+        seen = set()
+        duplicates = []
+        for q in v:
+            if q.id in seen:
+                duplicates.append(q.id)
+            seen.add(q.id)
+        if duplicates:
+            raise ValueError(f"Duplicate question IDs found: {', '.join(duplicates)}")
 
         return v
 
     def get_total_points(self) -> int:
         """Calculate total possible points for the quiz."""
         return sum(q.points for q in self.questions)
+
+
+def construct_trusted(model: Type[ModelT], values: Dict[str, Any]) -> ModelT:
+    """Create a model instance from already-validated values.
+
+    Skips every validator, like ``model.model_construct``, but also skips its
+    per-field default handling, which costs about as much as validating. Use
+    it only for values that already satisfy the model's rules, such as blocks
+    that passed the parser's checks.
+
+    Args:
+        model: Model class to instantiate
+        values: Value of every field of the model, already normalised
+
+    Returns:
+        Model instance holding ``values``
+    """
+    instance = model.__new__(model)
+    object.__setattr__(instance, "__dict__", values)
+    object.__setattr__(instance, "__pydantic_fields_set__", set(values))
+    object.__setattr__(instance, "__pydantic_extra__", None)
+    object.__setattr__(instance, "__pydantic_private__", None)
+    return instance
+
+
+def content_id(
+    question_type: QuestionType,
+    text: str,
+    choices: Iterable[Tuple[str, str, bool]],
+    points: int,
+) -> str:
+    """Derive a question ID from the question's content.
+
+    The same normalised content always yields the same ID, so rebuilding an
+    unchanged file produces identical output. The ID is a BLAKE2b digest of
+    the content, formatted like the UUIDs generated for questions without an
+    ID. Feedback is not part of the content.
+
+    Args:
+        question_type: Question type
+        text: Stripped question text
+        choices: (letter, stripped text, is_correct) of each answer choice
+        points: Points for the question
+
+    Returns:
+        UUID-formatted hex digest
+    """
+    parts = [question_type.value, str(points), text]
+    for letter, choice_text, is_correct in choices:
+        parts.append(("*" if is_correct else "") + letter)
+        parts.append(choice_text)
+    digest = hashlib.blake2b(
+        "\0".join(parts).encode("utf-8"), digest_size=16
+    ).hexdigest()
+    return f"{digest[:8]}-{digest[8:12]}-{digest[12:16]}-{digest[16:20]}-{digest[20:]}"
@@ -0,0 +1,222 @@
+"""Single-pass, offset-based tokenizer for markdown quiz files."""
+
+import re
+from enum import Enum
+from typing import Iterator, List, NamedTuple, Optional, Tuple
+
+
+class TokenType(str, Enum):
+    """Kinds of tokens emitted by the tokenizer."""
+
+    FRONT_MATTER = "front_matter"
+    HEADER = "header"
+    STRAY_HEADER = "stray_header"
+    METADATA = "metadata"
+    CHOICE = "choice"
+    FEEDBACK = "feedback"
+    TEXT = "text"
+    BLANK = "blank"
+
+
+class Token(NamedTuple):
+    """A single token referring back into the tokenized buffer.
+
+    ``start`` and ``end`` delimit the source line (without its newline). For
+    FRONT_MATTER tokens they delimit the YAML body between the ``---`` fences.
+    ``match`` is the ``LINE_PATTERN`` match for the line; HEADER tokens carry
+    the ``number`` group, METADATA ``key``/``value`` and CHOICE
+    ``mark``/``letter``/``answer``.
+    """
+
+    type: TokenType
+    start: int
+    end: int
+    match: Optional["re.Match[str]"] = None
+
+
+FENCE = "---"
+
+# One alternative per line kind, tried in order at the start of each line.
+# ``[^\S\n]`` is whitespace that cannot run past the end of the line.
+LINE_PATTERN = re.compile(
+    r"""(?=(?s:.))(?:
+        (?P<fence>---[^\S\n]*)(?=\n)
+      | (?P<header>\#\#[^\S\n]+Question[^\S\n]+(?P<number>\d+)[^\S\n]*)$
+      | (?P<stray_header>\#\#[^\S\n]+Question.*)
+      | (?P<metadata>\[(?P<key>\w+):[^\S\n]*(?P<value>[^\]\n]+)\][^\S\n]*)$
+      | (?P<choice>(?P<mark>\*)?(?P<letter>[a-z])\)[^\S\n]+(?=.*\S)(?P<answer>.+))
+      | (?P<blank_choice>\*?[a-z]\)[^\S\n]+.+)
+      | (?P<feedback>[^\S\n]*(?i:feedback:).*)
+      | (?P<blank>[^\S\n]*)$
+      | (?P<text>.+)
+    )\n?""",
+    re.MULTILINE | re.VERBOSE,
+)
+CHOICE_PATTERN = re.compile(r"(?P<mark>\*)?(?P<letter>[a-z])\)\s+(?P<answer>.+)")
+FENCE_LINE_PATTERN = re.compile(r"^---", re.MULTILINE)
+# Every line this matches tokenizes as a HEADER or a STRAY_HEADER
+HEADER_LINE_PATTERN = re.compile(r"^\#\#[^\S\n]+Question", re.MULTILINE)
+NON_SPACE_PATTERN = re.compile(r"\S")
+SPACE_RUN_PATTERN = re.compile(r"\s*")
+
+_GROUP_TYPES = {
+    "header": TokenType.HEADER,
+    "stray_header": TokenType.STRAY_HEADER,
+    "metadata": TokenType.METADATA,
+    "choice": TokenType.CHOICE,
+    "feedback": TokenType.FEEDBACK,
+    "blank": TokenType.BLANK,
+    "text": TokenType.TEXT,
+    # Fences are only plain text when they cannot open a fenced block
+    "fence": TokenType.TEXT,
+}
+
+
+def _is_fence(buffer: str, start: int, end: int) -> bool:
+    """Check whether ``buffer[start:end]`` is a ``---`` fence line."""
+    return (
+        buffer.startswith(FENCE, start, end)
+        and NON_SPACE_PATTERN.search(buffer, start + len(FENCE), end) is None
+    )
+
+
+def _find_closing_fence(buffer: str, pos: int, end: int) -> Optional[int]:
+    """Return the start offset of the first fence line preceded by a newline
+    at or after ``pos``."""
+    while True:
+        idx = buffer.find("\n" + FENCE, pos, end)
+        if idx == -1:
+            return None
+        fence_start = idx + 1
+        line_end = buffer.find("\n", fence_start, end)
+        if _is_fence(buffer, fence_start, end if line_end == -1 else line_end):
+            return fence_start
+        pos = fence_start
+
+
+def _front_matter_span(buffer: str, pos: int, end: int) -> Optional[Tuple[int, int]]:
+    """Locate the YAML body of a fenced block opened by the fence at ``pos``.
+
+    Mirrors ``^---\\s*\\n(.*?)\\n---\\s*$``: whitespace after the opening
+    fence is consumed up to its last newline before the body starts.
+
+    Returns:
+        ``(body_start, closing_fence_start)`` or None if the fence is unclosed
+    """
+    space_end = SPACE_RUN_PATTERN.match(buffer, pos + len(FENCE), end).end()  # type: ignore
+    body_start = buffer.rfind("\n", pos, space_end) + 1
+    closing = _find_closing_fence(buffer, body_start, end)
+    if closing is None:
+        # Backtracking lets an empty body end at the newline before a fence
+        closing = _find_closing_fence(buffer, buffer.find("\n", pos, end) + 1, end)
+        if closing is None:
+            return None
+        body_start = min(body_start, closing - 1)
+    return body_start, closing
+
+
+def fenced_spans(buffer: str) -> List[Tuple[int, int]]:
+    """Locate the ``---`` fenced blocks that ``tokenize`` collapses.
+
+    Only fence lines are inspected, so this is much cheaper than a full scan.
+
+    Args:
+        buffer: Source text
+
+    Returns:
+        ``(fence_start, resume)`` pairs in source order, where ``resume`` is
+        the offset of the line after the closing fence
+    """
+    spans: List[Tuple[int, int]] = []
+    end = len(buffer)
+    pos = 0
+
+    while True:
+        match = FENCE_LINE_PATTERN.search(buffer, pos)
+        if match is None:
+            return spans
+        start = match.start()
+        line_end = buffer.find("\n", start)
+        if line_end == -1:
+            return spans
+        pos = line_end + 1
+        if not _is_fence(buffer, start, line_end):
+            continue
+
+        span = _front_matter_span(buffer, start, end)
+        if span is None:
+            # No later fence can be closed either
+            return spans
+        closing_end = buffer.find("\n", span[1])
+        pos = end if closing_end == -1 else closing_end + 1
+        spans.append((start, pos))
+
+
+def tokenize(buffer: str, start: int = 0, end: Optional[int] = None) -> Iterator[Token]:
+    """Tokenize ``buffer[start:end]`` in a single left-to-right scan.
+
+    Every line yields exactly one token, except for ``---`` fenced blocks which
+    collapse into one FRONT_MATTER token covering the YAML body.
+
+    Args:
+        buffer: Source text
+        start: Offset to start scanning from (must be at a line start)
+        end: Offset to stop scanning at, at a line start (default: end of
+            buffer); anything after it is treated as the rest of the document
+
+    Yields:
+        Tokens in source order
+    """
+    if end is None:
+        end = len(buffer)
+
+    match_line = LINE_PATTERN.match
+    iter_lines = LINE_PATTERN.finditer
+    group_types = _GROUP_TYPES
+    new_token = tuple.__new__
+    pos: Optional[int] = start
+    # Once a fence has no closing partner, no later fence can have one either
+    fences_exhausted = False
+    # The document is stripped, so the first line with content loses its indent
+    leading = start == 0
+
+    while pos is not None:
+        lines = iter_lines(buffer, pos, end)
+        pos = None
+        for match in lines:
+            kind: str = match.lastgroup  # type: ignore[assignment]
+
+            if kind == "fence" and not fences_exhausted:
+                span = _front_matter_span(buffer, match.start(), end)
+                if span is not None:
+                    body_start, closing = span
+                    yield Token(TokenType.FRONT_MATTER, body_start, closing - 1)
+                    # Resume scanning after the closing fence
+                    closing_end = buffer.find("\n", closing, end)
+                    if closing_end != -1:
+                        pos = closing_end + 1
+                    break
+                fences_exhausted = True
+
+            if leading and kind != "blank":
+                leading = False
+                first = NON_SPACE_PATTERN.search(buffer, match.start(), end)
+                if first is not None and first.start() != match.start():
+                    match = match_line(buffer, first.start(), end)  # type: ignore
+                    kind = match.lastgroup  # type: ignore[assignment]
+
+            line_start, line_end = match.span(kind)
+
+            if kind == "blank_choice":
+                # A choice with blank text only survives if the document does
+                # not end right after it (the original parser stripped it).
+                # Text past ``end`` still counts as following content.
+                if NON_SPACE_PATTERN.search(buffer, line_end) is None:
+                    kind = "text"
+                else:
+                    kind = "choice"
+                    match = CHOICE_PATTERN.match(  # type: ignore[assignment]
+                        buffer, line_start, line_end
+                    )
+
+            yield new_token(Token, (group_types[kind], line_start, line_end, match))
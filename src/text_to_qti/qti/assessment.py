@@ -1,20 +1,123 @@
 """Assessment XML generator."""
 
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from functools import lru_cache
+from typing import (
+    IO,
+    Any,
+    Deque,
+    Dict,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
 from lxml import etree
 
-from text_to_qti.parser.question_models import QuestionType, Quiz
-from text_to_qti.qti.utils import QTI_NAMESPACE, add_child
+from text_to_qti.parser.question_bank import ChoiceRow, QuizSource
+from text_to_qti.parser.question_models import QuestionType
+from text_to_qti.qti.item_cache import ItemCache
+from text_to_qti.qti.templates import render_item_bytes, write_assessment
+from text_to_qti.qti.utils import (
+    QTI_NAMESPACE,
+    SCHEMA_LOCATION,
+    XML_DECLARATION,
+    XSI_NAMESPACE,
+    add_child,
+)
 from text_to_qti.utils.errors import GenerationError
 
+# Item renderers AssessmentGenerator.write can use
+RENDERERS = ("lxml", "template")
+
+# Parallel generation renders quizzes of at least this many questions in
+# chunks of PARALLEL_CHUNK_SIZE, and keeps a few chunks per worker in flight
+PARALLEL_MIN_QUESTIONS = 1000
+PARALLEL_CHUNK_SIZE = 250
+PARALLEL_CHUNKS_PER_WORKER = 2
+
+_TYPES = {question_type.value: question_type for question_type in QuestionType}
+
+
+# Items of a chunk found in the cache (None for the others), their cache
+# keys, the positions of the others and the future rendering those
+_PendingChunk = Tuple[List[Optional[bytes]], List[str], List[int], Optional[Future]]
+
+
+class _ItemRow(NamedTuple):
+    """Question fields sent to a worker process, read like a Question."""
+
+    id: str
+    type: QuestionType
+    text: str
+    points: int
+    feedback: Optional[str]
+    choices: List[ChoiceRow]
+
 
 class AssessmentGenerator:
     """Generate QTI assessment XML structure with embedded items (Canvas compatible)."""
 
-    def generate(self, quiz: Quiz) -> etree._Element:
+    def __init__(
+        self,
+        reuse_items: bool = False,
+        renderer: str = "lxml",
+        item_cache: Optional[ItemCache] = None,
+        workers: int = 1,
+        chunk_size: int = PARALLEL_CHUNK_SIZE,
+        compact: bool = False,
+    ) -> None:
+        """Initialize generator.
+
+        Args:
+            reuse_items: Whether to keep the item elements of each generated
+                assessment and move them into the next one for questions that
+                are the same objects, as when a quiz is re-parsed with
+                ``MarkdownParser.reparse_content``. Reused questions must
+                not have been modified, and the previous assessment loses
+                those items.
+            renderer: How ``write`` renders the document: "lxml" builds an
+                element tree per item, "template" fills precompiled string
+                templates, which is several times faster and writes the same
+                bytes. ``generate`` always builds a tree.
+            item_cache: Optional cache of serialized items that ``write``
+                splices into the section instead of rendering items again
+            workers: Number of processes ``write`` renders items with. With
+                more than one, quizzes of at least PARALLEL_MIN_QUESTIONS
+                questions are rendered in chunks across a process pool and
+                written in order; smaller quizzes are rendered serially.
+            chunk_size: Number of questions sent to a worker at a time
+            compact: Whether ``write`` leaves out the whitespace between
+                elements instead of pretty printing the document
+
+        Raises:
+            GenerationError: If the renderer is unknown
+        """
+        if renderer not in RENDERERS:
+            raise GenerationError(f"Unknown renderer: {renderer}")
+        self.reuse_items = reuse_items
+        self.renderer = renderer
+        self.item_cache = item_cache
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self.compact = compact
+        # Item elements of the last assessment by question object identity,
+        # with the question to keep the identity valid
+        self._items: Dict[int, Tuple[Any, etree._Element]] = {}
+        self.reused = 0
+
+    def generate(
+        self, quiz: QuizSource, assessment_id: str = "ASSESSMENT_001"
+    ) -> etree._Element:
         """Generate assessment XML with all items embedded.
 
         Args:
-            quiz: Quiz object
+            quiz: Quiz or QuestionBank
+            assessment_id: Assessment identifier
 
         Returns:
             Assessment XML element
@@ -29,13 +132,13 @@ class AssessmentGenerator:
                 nsmap={None: QTI_NAMESPACE},
             )
             questestinterop.set(
-                "{http://www.w3.org/2001/XMLSchema-instance}schemaLocation",
-                "http://www.imsglobal.org/xsd/ims_qtiasiv1p2 http://www.imsglobal.org/xsd/ims_qtiasiv1p2p1.xsd",
+                f"{{{XSI_NAMESPACE}}}schemaLocation",
+                SCHEMA_LOCATION,
             )
 
             # Create assessment element as child of questestinterop
             assessment = etree.SubElement(questestinterop, "assessment")
-            assessment.set("ident", "ASSESSMENT_001")
+            assessment.set("ident", assessment_id)
             assessment.set("title", quiz.metadata.title)
 
             # Add metadata
@@ -49,7 +152,160 @@ class AssessmentGenerator:
         except Exception as e:
             raise GenerationError(f"Failed to generate assessment: {e}") from e
 
-    def _add_metadata(self, assessment: etree._Element, quiz: Quiz) -> None:
+    def write(
+        self,
+        quiz: QuizSource,
+        output: IO[bytes],
+        assessment_id: str = "ASSESSMENT_001",
+    ) -> None:
+        """Stream the assessment XML document to a binary file.
+
+        Writes the same bytes as ``generate`` followed by
+        ``element_to_bytes(..., pretty_print=not compact)``, but
+        each item is built, written and freed in turn, so memory use does not
+        grow with the number of questions. Items found in the item cache are
+        copied in as bytes without being rendered, and large quizzes are
+        rendered in parallel when ``workers`` is more than one.
+
+        Args:
+            quiz: Quiz or QuestionBank
+            output: Writable binary file, such as a ZIP entry
+            assessment_id: Assessment identifier
+
+        Raises:
+            GenerationError: If generation fails
+        """
+        if (
+            self.renderer == "template"
+            or self.item_cache is not None
+            or self.compact
+            or self._parallel(quiz)
+        ):
+            try:
+                write_assessment(
+                    quiz,
+                    output,
+                    self._iter_items(quiz),
+                    not self.compact,
+                    assessment_id,
+                )
+            except Exception as e:
+                raise GenerationError(f"Failed to generate assessment: {e}") from e
+            return
+
+        try:
+            output.write(XML_DECLARATION)
+            with etree.xmlfile(output, encoding="utf-8") as xf:
+                with xf.element(
+                    "questestinterop",
+                    {f"{{{XSI_NAMESPACE}}}schemaLocation": SCHEMA_LOCATION},
+                    nsmap={None: QTI_NAMESPACE, "xsi": XSI_NAMESPACE},
+                ):
+                    # Whitespace matches the pretty-printed tree
+                    xf.write("\n  ")
+                    with xf.element(
+                        "assessment",
+                        {"ident": assessment_id, "title": quiz.metadata.title},
+                    ):
+                        xf.write("\n    ")
+                        holder = etree.Element("assessment")
+                        self._add_metadata(holder, quiz)
+                        xf.write(_indented(holder[0], 2))
+                        xf.write("\n    ")
+                        if len(quiz.questions):
+                            with xf.element("section", ident="root_section"):
+                                for question in quiz.questions:
+                                    xf.write("\n      ")
+                                    xf.write(_indented(self._create_item(question), 3))
+                                xf.write("\n    ")
+                        else:
+                            xf.write(etree.Element("section", ident="root_section"))
+                        xf.write("\n  ")
+                    xf.write("\n")
+            output.write(b"\n")
+        except Exception as e:
+            raise GenerationError(f"Failed to generate assessment: {e}") from e
+
+    def _parallel(self, quiz: QuizSource) -> bool:
+        """Return whether ``write`` renders the items of a quiz in parallel."""
+        return self.workers > 1 and len(quiz.questions) >= PARALLEL_MIN_QUESTIONS
+
+    def _iter_items(self, quiz: QuizSource) -> Iterator[bytes]:
+        """Yield the items of a quiz in order as written in the document."""
+        if self._parallel(quiz):
+            yield from self._render_parallel(quiz.questions)
+            return
+        for question in quiz.questions:
+            yield self._item_bytes(question)
+
+    def _item_bytes(self, question) -> bytes:
+        """Return an item as written in the document, from the cache if set."""
+        cache = self.item_cache
+        if cache is None:
+            return self._render_item(question)
+
+        key = cache.key(question, self.compact)
+        fragment = cache.get(key)
+        if fragment is None:
+            fragment = self._render_item(question)
+            cache.put(key, fragment)
+        return fragment
+
+    def _render_item(self, question) -> bytes:
+        """Render an item as written in the document."""
+        if self.renderer == "template":
+            return render_item_bytes(question, not self.compact)
+        if self.compact:
+            compact: bytes = etree.tostring(
+                self._create_item(question), encoding="utf-8"
+            )
+            return compact
+        item = _indented(self._create_item(question), 3)
+        data: bytes = etree.tostring(item, encoding="utf-8")
+        return b"\n      " + data
+
+    def _render_parallel(self, questions: Sequence[Any]) -> Iterator[bytes]:
+        """Render items in chunks across a process pool, yielding them in order.
+
+        Cached items are looked up here, and only the other questions of each
+        chunk are sent to a worker, as plain tuples. Only a few chunks per
+        worker are in flight at a time, so memory use does not grow with the
+        number of questions.
+
+        Args:
+            questions: Questions of the quiz
+
+        Yields:
+            Items as written in the document, in question order
+        """
+        chunk_size = max(1, self.chunk_size)
+        chunk_count = -(-len(questions) // chunk_size)
+        workers = min(self.workers, chunk_count)
+        cache = self.item_cache
+        pending: Deque[_PendingChunk] = deque()
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for start in range(0, len(questions), chunk_size):
+                chunk = questions[start : start + chunk_size]
+                fragments: List[Optional[bytes]] = [None] * len(chunk)
+                keys: List[str] = []
+                if cache is not None:
+                    keys = [cache.key(question, self.compact) for question in chunk]
+                    fragments = [cache.get(key) for key in keys]
+                misses = [i for i, fragment in enumerate(fragments) if fragment is None]
+                rows = [_item_row(chunk[i]) for i in misses]
+                future = (
+                    pool.submit(_render_chunk, (self.renderer, self.compact, rows))
+                    if rows
+                    else None
+                )
+                pending.append((fragments, keys, misses, future))
+                if len(pending) >= workers * PARALLEL_CHUNKS_PER_WORKER:
+                    yield from _collect_chunk(pending.popleft(), cache)
+            while pending:
+                yield from _collect_chunk(pending.popleft(), cache)
+
+    def _add_metadata(self, assessment: etree._Element, quiz: QuizSource) -> None:
         """Add assessment metadata."""
         qti_metadata = add_child(assessment, "qtimetadata")
 
@@ -64,17 +320,36 @@ class AssessmentGenerator:
             add_child(field, "fieldlabel", "shuffle_answers")
             add_child(field, "fieldentry", "true")
 
-    def _add_section(self, assessment: etree._Element, quiz: Quiz) -> None:
+    def _add_section(self, assessment: etree._Element, quiz: QuizSource) -> None:
         """Add section with embedded items (Canvas compatible format)."""
         section = add_child(assessment, "section")
         section.set("ident", "root_section")
 
+        if not self.reuse_items:
+            for question in quiz.questions:
+                self._add_item(section, question)
+            return
+
+        previous = self._items
+        items: Dict[int, Tuple[Any, etree._Element]] = {}
+        self.reused = 0
         for question in quiz.questions:
-            self._add_item(section, question)
+            entry = previous.pop(id(question), None)
+            if entry is not None and entry[0] is question:
+                section.append(entry[1])
+                self.reused += 1
+            else:
+                self._add_item(section, question)
+            items[id(question)] = (question, section[-1])
+        self._items = items
 
     def _add_item(self, section: etree._Element, question) -> None:
         """Add a complete item with all metadata and presentation."""
-        item = add_child(section, "item")
+        section.append(self._create_item(question))
+
+    def _create_item(self, question) -> etree._Element:
+        """Create a complete item with all metadata and presentation."""
+        item = etree.Element("item")
         item.set("ident", question.id)
         item.set("title", "Question")
 
@@ -90,6 +365,8 @@ class AssessmentGenerator:
         # Add feedback
         self._add_feedback(item, question)
 
+        return item
+
     def _add_item_metadata(self, item: etree._Element, question) -> None:
         """Add item metadata section."""
         itemmetadata = add_child(item, "itemmetadata")
@@ -214,3 +491,68 @@ class AssessmentGenerator:
         material = add_child(flow, "material")
         general_text = question.feedback or "Incorrect. Please review the material."
         add_child(material, "mattext", general_text, texttype="text/html")
+
+
+def _indented(element: etree._Element, level: int) -> etree._Element:
+    """Indent an element as pretty printing would at a given depth."""
+    etree.indent(element, level=level)
+    return element
+
+
+def _item_row(question) -> Tuple[Any, ...]:
+    """Return the fields of a question as plain tuples for a worker."""
+    return (
+        question.id,
+        question.type.value,
+        question.text,
+        question.points,
+        question.feedback,
+        [(c.letter, c.text, c.is_correct) for c in question.choices],
+    )
+
+
+def _collect_chunk(
+    entry: _PendingChunk,
+    cache: Optional[ItemCache],
+) -> List[bytes]:
+    """Wait for a chunk's worker and merge its items with the cached ones."""
+    fragments, keys, misses, future = entry
+    if future is not None:
+        for i, fragment in zip(misses, future.result()):
+            fragments[i] = fragment
+            if cache is not None:
+                cache.put(keys[i], fragment)
+    return [fragment for fragment in fragments if fragment is not None]
+
+
+@lru_cache(maxsize=None)
+def _worker_generator(renderer: str, compact: bool) -> AssessmentGenerator:
+    """Return the generator reused by a worker process across chunks."""
+    return AssessmentGenerator(renderer=renderer, compact=compact)
+
+
+def _render_chunk(job: Tuple[str, bool, List[Tuple[Any, ...]]]) -> List[bytes]:
+    """Render items of a chunk in a worker process.
+
+    Args:
+        job: Renderer name, ``compact`` option and the question rows from
+            ``_item_row``
+
+    Returns:
+        Items as written in the document, in row order
+    """
+    renderer, compact, rows = job
+    generator = _worker_generator(renderer, compact)
+    return [
+        generator._render_item(
+            _ItemRow(
+                question_id,
+                _TYPES[question_type],
+                text,
+                points,
+                feedback,
+                [ChoiceRow(*choice) for choice in choices],
+            )
+        )
+        for question_id, question_type, text, points, feedback, choices in rows
+    ]
@@ -1,21 +1,28 @@
 """Canvas-specific assessment metadata XML generator."""
 
+from functools import lru_cache
+from typing import Dict
+
 from lxml import etree
 
-from text_to_qti.parser.question_models import Quiz
+from text_to_qti.parser.question_bank import QuizSource
+from text_to_qti.qti.templates import DocumentTemplate, field
 from text_to_qti.utils.errors import GenerationError
 
+# Per-quiz values of the document; everything else is constant
+_FIELDS = ("title", "description", "shuffle_answers", "points_possible")
+
 
 class CanvasMetadataGenerator:
     """Generate Canvas-specific assessment_meta.xml file."""
 
     def generate(
-        self, quiz: Quiz, assessment_id: str = "ASSESSMENT_001"
+        self, quiz: QuizSource, assessment_id: str = "ASSESSMENT_001"
     ) -> etree._Element:
         """Generate Canvas assessment metadata XML.
 
         Args:
-            quiz: Quiz object
+            quiz: Quiz or QuestionBank
             assessment_id: Assessment identifier
 
         Returns:
@@ -25,41 +32,88 @@ class CanvasMetadataGenerator:
             GenerationError: If generation fails
         """
         try:
-            quiz_elem = etree.Element(
-                "quiz",
-                identifier=assessment_id,
-                xmlns="http://canvas.instructure.com/xsd/cccv1p0",
-            )
-            quiz_elem.set(
-                "{http://www.w3.org/2001/XMLSchema-instance}schemaLocation",
-                "http://canvas.instructure.com/xsd/cccv1p0 https://canvas.instructure.com/xsd/cccv1p0.xsd",
-            )
+            return self._build(self._values(quiz), assessment_id)
+        except Exception as e:
+            raise GenerationError(f"Failed to generate Canvas metadata: {e}") from e
 
-            # Basic quiz metadata
-            self._add_basic_metadata(quiz_elem, quiz)
+    def render(
+        self,
+        quiz: QuizSource,
+        assessment_id: str = "ASSESSMENT_001",
+        pretty_print: bool = True,
+    ) -> str:
+        """Render Canvas assessment metadata as an XML document.
 
-            # Assignment metadata
-            self._add_assignment_metadata(quiz_elem, assessment_id)
+        Returns what ``element_to_string(generate(...), pretty_print,
+        with_declaration=True)`` returns, from a template compiled once per
+        process, so only the per-quiz values are escaped and filled in on each
+        call.
 
-            return quiz_elem
+        Args:
+            quiz: Quiz or QuestionBank
+            assessment_id: Assessment identifier
+            pretty_print: Whether to pretty print the document
+
+        Returns:
+            Canvas metadata XML document
 
+        Raises:
+            GenerationError: If generation fails
+        """
+        try:
+            return _template(pretty_print).render(
+                assessment_id=assessment_id, **self._values(quiz)
+            )
         except Exception as e:
             raise GenerationError(f"Failed to generate Canvas metadata: {e}") from e
 
-    def _add_basic_metadata(self, quiz_elem: etree._Element, quiz: Quiz) -> None:
+    def _values(self, quiz: QuizSource) -> Dict[str, str]:
+        """Return the per-quiz values of the document."""
+        return {
+            "title": quiz.metadata.title,
+            "description": quiz.metadata.description or "",
+            "shuffle_answers": "true" if quiz.metadata.shuffle_answers else "false",
+            "points_possible": str(float(quiz.get_total_points())),
+        }
+
+    def _build(self, values: Dict[str, str], assessment_id: str) -> etree._Element:
+        """Build the metadata element from the per-quiz values."""
+        quiz_elem = etree.Element(
+            "quiz",
+            identifier=assessment_id,
+            xmlns="http://canvas.instructure.com/xsd/cccv1p0",
+        )
+        quiz_elem.set(
+            "{http://www.w3.org/2001/XMLSchema-instance}schemaLocation",
+            "http://canvas.instructure.com/xsd/cccv1p0 https://canvas.instructure.com/xsd/cccv1p0.xsd",
+        )
+
+        # Basic quiz metadata
+        self._add_basic_metadata(quiz_elem, values)
+
+        # Assignment metadata
+        self._add_assignment_metadata(quiz_elem, assessment_id)
+
+        return quiz_elem
+
+    def _add_basic_metadata(
+        self, quiz_elem: etree._Element, values: Dict[str, str]
+    ) -> None:
         """Add basic quiz metadata."""
         # Title
         title = etree.SubElement(quiz_elem, "title")
-        title.text = quiz.metadata.title
+        title.text = values["title"]
 
         # Description
         description = etree.SubElement(quiz_elem, "description")
-        description.text = quiz.metadata.description or ""
+        description.text = values["description"]
 
         # Quiz settings
-        self._add_quiz_settings(quiz_elem, quiz)
+        self._add_quiz_settings(quiz_elem, values)
 
-    def _add_quiz_settings(self, quiz_elem: etree._Element, quiz: Quiz) -> None:
+    def _add_quiz_settings(
+        self, quiz_elem: etree._Element, values: Dict[str, str]
+    ) -> None:
         """Add quiz settings."""
         # Due date (optional)
         due_at = etree.SubElement(quiz_elem, "due_at")
@@ -67,7 +121,7 @@ class CanvasMetadataGenerator:
 
         # Shuffle answers
         shuffle = etree.SubElement(quiz_elem, "shuffle_answers")
-        shuffle.text = "true" if quiz.metadata.shuffle_answers else "false"
+        shuffle.text = values["shuffle_answers"]
 
         # Scoring policy
         scoring = etree.SubElement(quiz_elem, "scoring_policy")
@@ -83,7 +137,7 @@ class CanvasMetadataGenerator:
 
         # Points possible
         points = etree.SubElement(quiz_elem, "points_possible")
-        points.text = str(float(quiz.get_total_points()))
+        points.text = values["points_possible"]
 
         # Lockdown browser settings
         etree.SubElement(quiz_elem, "require_lockdown_browser").text = "false"
@@ -194,3 +248,12 @@ class CanvasMetadataGenerator:
 
         # Assignment overrides (empty)
         etree.SubElement(quiz_elem, "assignment_overrides")
+
+
+@lru_cache(maxsize=None)
+def _template(pretty_print: bool) -> DocumentTemplate:
+    """Return a document template, compiled on first use."""
+    skeleton = CanvasMetadataGenerator()._build(
+        {name: field(name) for name in _FIELDS}, field("assessment_id")
+    )
+    return DocumentTemplate(skeleton, pretty_print)
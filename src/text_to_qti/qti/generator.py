@@ -1,13 +1,20 @@
 """Main QTI generation orchestrator."""
 
+import io
+from functools import partial
 from pathlib import Path
-from typing import Optional
+from typing import IO, Callable, List, Optional, Union, overload
 
-from text_to_qti.packager.zip_creator import ZIPCreator
-from text_to_qti.parser.question_models import Quiz
+from lxml import etree
+
+from text_to_qti.packager.zip_creator import DEFAULT_COMPRESS_LEVEL, ZIPCreator
+from text_to_qti.parser.markdown_renderer import MarkdownRenderer
+from text_to_qti.parser.question_bank import QuizSource
 from text_to_qti.qti.assessment import AssessmentGenerator
 from text_to_qti.qti.canvas_metadata import CanvasMetadataGenerator
+from text_to_qti.qti.item_cache import ItemCache
 from text_to_qti.qti.manifest import ManifestGenerator
+from text_to_qti.qti.media import MediaFile, MediaResolver
 from text_to_qti.utils.errors import GenerationError
 
 
@@ -16,29 +23,101 @@ class QTIGenerator:
 
     ASSESSMENT_ID = "ASSESSMENT_001"
 
-    def __init__(self, quiz: Quiz, version: str = "1.2") -> None:
+    def __init__(
+        self,
+        quiz: QuizSource,
+        version: str = "1.2",
+        reuse_items: bool = False,
+        streaming: bool = False,
+        renderer: str = "lxml",
+        item_cache: Optional[ItemCache] = None,
+        workers: int = 1,
+        compact: bool = False,
+        compress_level: int = DEFAULT_COMPRESS_LEVEL,
+        store: bool = False,
+        compress_threads: int = 1,
+        reproducible: bool = False,
+        update: bool = False,
+        media: Optional[MediaResolver] = None,
+        markdown: Optional[MarkdownRenderer] = None,
+    ) -> None:
         """Initialize generator.
 
         Args:
-            quiz: Quiz object to generate QTI for
+            quiz: Quiz or QuestionBank to generate QTI for
             version: QTI version (1.2 or 2.1)
+            reuse_items: Whether item XML is reused across generate calls for
+                unchanged question objects (see AssessmentGenerator)
+            streaming: Whether the assessment is streamed into the package one
+                item at a time instead of built as a tree first; the package
+                is identical, but memory use stays flat for large quizzes
+            renderer: "lxml" or "template"; the template renderer writes the
+                same assessment bytes several times faster, and always
+                streams them
+            item_cache: Optional cache of serialized items shared across
+                generators; items of questions already in it are copied
+                into the assessment instead of rendered, and the assessment
+                is streamed
+            workers: Number of processes to render the items of large quizzes
+                with (see AssessmentGenerator); the assessment is streamed
+                when more than one
+            compact: Whether the XML documents are written without the
+                whitespace between elements instead of pretty printed,
+                which makes them smaller and faster to write and compress
+            compress_level: DEFLATE compression level of the package, 0-9
+            store: Whether package entries are stored uncompressed
+            compress_threads: Number of threads to compress the assessment
+                with (see ZIPCreator)
+            reproducible: Whether the package entries get fixed timestamps
+                and attributes, so that the same quiz and options always give
+                the same bytes; questions need stable IDs for this, such as
+                those from ``MarkdownParser(content_ids=True)``
+            update: Whether an existing package at the output path is
+                updated, reusing the compressed entries that did not change
+                (see ZIPCreator)
+            media: Optional resolver of the images referenced in question
+                text and feedback, which are bundled into the package
+            markdown: Optional renderer of question text and feedback from
+                Markdown to HTML; without one they are written as they are
+
+        Raises:
+            GenerationError: If the renderer or compression level is invalid
         """
         self.quiz = quiz
         self.version = version
-
-        self.assessment_gen = AssessmentGenerator()
+        self.streaming = streaming
+        self.compact = compact
+        self.media = media
+        self.markdown = markdown
+
+        self.assessment_gen = AssessmentGenerator(
+            reuse_items, renderer, item_cache, workers, compact=compact
+        )
         self.manifest_gen = ManifestGenerator()
         self.canvas_metadata_gen = CanvasMetadataGenerator()
-        self.zip_creator = ZIPCreator()
+        self.zip_creator = ZIPCreator(
+            compress_level, store, compress_threads, reproducible, update
+        )
 
-    def generate(self, output_path: Optional[str] = None) -> Path:
+    @overload
+    def generate(self, output_path: Union[None, str, Path] = None) -> Path: ...
+
+    @overload
+    def generate(self, output_path: IO[bytes]) -> None: ...
+
+    def generate(
+        self, output_path: Union[None, str, Path, IO[bytes]] = None
+    ) -> Optional[Path]:
         """Generate complete QTI package (Canvas compatible).
 
         Args:
-            output_path: Optional output file path (default: output.zip)
+            output_path: Optional output file path (default: output.zip), or a
+                writable binary file object, such as a socket file or
+                ``sys.stdout.buffer``, to stream the package to as it is
+                produced (see ZIPCreator.create_package)
 
         Returns:
-            Path to created ZIP file
+            Path to created ZIP file, or None if written to a file object
 
         Raises:
             GenerationError: If generation fails
@@ -47,16 +126,36 @@ class QTIGenerator:
             if output_path is None:
                 output_path = "output.zip"
 
+            # 0. Render Markdown and bundle the images the questions reference
+            quiz = self.quiz
+            if self.markdown is not None:
+                quiz = self.markdown.render_quiz(quiz)
+            media: List[MediaFile] = []
+            if self.media is not None:
+                quiz, media = self.media.bundle(quiz)
+
             # 1. Generate assessment XML with embedded items
-            assessment_xml = self.assessment_gen.generate(self.quiz)
+            assessment_xml: Union[etree._Element, Callable[[IO[bytes]], None]]
+            assessment_gen = self.assessment_gen
+            if (
+                self.streaming
+                or assessment_gen.renderer == "template"
+                or assessment_gen.item_cache is not None
+                or assessment_gen.workers > 1
+            ):
+                assessment_xml = partial(self.assessment_gen.write, quiz)
+            else:
+                assessment_xml = self.assessment_gen.generate(quiz)
 
             # 2. Generate Canvas metadata XML
-            canvas_metadata_xml = self.canvas_metadata_gen.generate(
-                self.quiz, self.ASSESSMENT_ID
+            canvas_metadata_xml = self.canvas_metadata_gen.render(
+                quiz, self.ASSESSMENT_ID, not self.compact
             )
 
             # 3. Generate manifest XML
-            manifest_xml = self.manifest_gen.generate(self.quiz, self.ASSESSMENT_ID)
+            manifest_xml = self.manifest_gen.render(
+                quiz, self.ASSESSMENT_ID, not self.compact, media
+            )
 
             # 4. Create ZIP package
             return self.zip_creator.create_package(
@@ -64,9 +163,24 @@ class QTIGenerator:
                 manifest_xml,
                 assessment_xml,
                 canvas_metadata_xml,
+                pretty_print=not self.compact,
+                media=media,
             )
 
         except GenerationError:
             raise
         except Exception as e:
             raise GenerationError(f"Failed to generate QTI package: {e}") from e
+
+    def generate_bytes(self) -> bytes:
+        """Generate complete QTI package in memory.
+
+        Returns:
+            The ZIP file content
+
+        Raises:
+            GenerationError: If generation fails
+        """
+        output = io.BytesIO()
+        self.generate(output)
+        return output.getvalue()
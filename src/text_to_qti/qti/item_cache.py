@@ -0,0 +1,167 @@
+"""Cache of serialized item XML fragments, keyed by question content."""
+
+import hashlib
+import marshal
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Optional, Union
+
+from text_to_qti import __version__
+from text_to_qti.utils.disk_store import DiskStore
+
+# Bumped whenever the item layout written by the renderers changes
+ITEM_FORMAT = 1
+
+# Default size limits of the in-memory and on-disk stores
+DEFAULT_MAX_BYTES = 64 * 2**20
+DEFAULT_MAX_DISK_BYTES = 256 * 2**20
+
+_ENTRY_SUFFIX = ".item"
+
+# Hash state shared by every key, so renderer changes invalidate the entries
+_KEY_BASE = hashlib.blake2b(
+    repr(("text-to-qti item", ITEM_FORMAT, __version__)).encode("utf-8"),
+    digest_size=16,
+)
+
+
+class ItemCache:
+    """Serialized ``<item>`` fragments shared by assessments.
+
+    Fragments are the UTF-8 bytes of an item as it appears in the assessment
+    document, including any line break and indentation before it, so a
+    quiz assembled from cached items is written by concatenating bytes. They
+    are keyed by a hash of everything in the question that the item shows,
+    the generator options that change the output, such as compact mode, and
+    the renderer version. Both renderers write identical items, so one cache
+    serves either.
+
+    The least recently used fragments are evicted once the in-memory store
+    grows past ``max_bytes``. With a ``directory``, new fragments are also
+    written there and looked up on a memory miss, so they outlive eviction
+    and the process; the directory is a DiskStore trimmed to
+    ``max_disk_bytes`` the same way, by file modification time.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        directory: Optional[Union[str, Path]] = None,
+        max_disk_bytes: int = DEFAULT_MAX_DISK_BYTES,
+    ) -> None:
+        """Initialize cache, creating the directory if needed.
+
+        Args:
+            max_bytes: Total fragment size kept in memory
+            directory: Optional directory to also store fragments in
+            max_disk_bytes: Total fragment size to trim the directory to
+        """
+        self.max_bytes = max_bytes
+        self._store: Optional[DiskStore] = None
+        self.directory: Optional[Path] = None
+        if directory is not None:
+            self._store = DiskStore(directory, _ENTRY_SUFFIX)
+            self.directory = self._store.directory
+        self.max_disk_bytes = max_disk_bytes
+
+        self._fragments: "OrderedDict[str, bytes]" = OrderedDict()
+        self._size = 0
+        # Bytes written to the directory since it was last trimmed
+        self._written = 0
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, question, *options: Any) -> str:
+        """Return the key of a question's item.
+
+        Args:
+            question: Question or QuestionView
+            *options: Generator options that change the item, as marshal
+                serializable values
+
+        Returns:
+            Hex digest identifying the fragment
+        """
+        digest = _KEY_BASE.copy()
+        digest.update(
+            marshal.dumps(
+                (
+                    question.id,
+                    question.type.value,
+                    question.text,
+                    question.points,
+                    question.feedback,
+                    [(c.letter, c.text, c.is_correct) for c in question.choices],
+                    options,
+                )
+            )
+        )
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Look up a fragment.
+
+        Args:
+            key: Fragment key
+
+        Returns:
+            The fragment, or None on a miss
+        """
+        fragment = self._fragments.get(key)
+        if fragment is not None:
+            self._fragments.move_to_end(key)
+            self.hits += 1
+            return fragment
+
+        if self._store is not None:
+            fragment = self._store.read(key)
+            if fragment is not None:
+                self._remember(key, fragment)
+                self.hits += 1
+                return fragment
+
+        self.misses += 1
+        return None
+
+    def put(self, key: str, fragment: bytes) -> None:
+        """Store a fragment, evicting old ones if the cache is too big.
+
+        Failures to write to the directory are ignored, as the cache is only
+        an optimisation.
+
+        Args:
+            key: Fragment key
+            fragment: Item bytes as written in the assessment
+        """
+        self._remember(key, fragment)
+        if self._store is None or not self._store.write(key, fragment):
+            return
+
+        # Scanning the directory on every write would dominate, so it is
+        # trimmed once enough has been written to matter
+        self._written += len(fragment)
+        if self._written > self.max_disk_bytes // 8:
+            self._written = 0
+            self._store.evict(self.max_disk_bytes)
+
+    def clear(self) -> None:
+        """Remove every fragment from memory and the directory."""
+        self._fragments.clear()
+        self._size = 0
+        if self._store is not None:
+            self._store.clear()
+
+    def __len__(self) -> int:
+        """Return the number of fragments held in memory."""
+        return len(self._fragments)
+
+    def _remember(self, key: str, fragment: bytes) -> None:
+        """Keep a fragment in memory, evicting the least recently used."""
+        previous = self._fragments.pop(key, None)
+        if previous is not None:
+            self._size -= len(previous)
+        self._fragments[key] = fragment
+        self._size += len(fragment)
+        while self._size > self.max_bytes and self._fragments:
+            _, evicted = self._fragments.popitem(last=False)
+            self._size -= len(evicted)
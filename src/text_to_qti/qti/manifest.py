@@ -1,10 +1,19 @@
 """imsmanifest.xml generator."""
 
+from functools import lru_cache
+from typing import Sequence, Tuple
+
 from lxml import etree
 
-from text_to_qti.parser.question_models import Quiz
+from text_to_qti.parser.question_bank import QuizSource
+from text_to_qti.qti.media import MediaFile
+from text_to_qti.qti.templates import DocumentTemplate, field
+from text_to_qti.qti.utils import element_to_string
 from text_to_qti.utils.errors import GenerationError
 
+# Identifier of the Canvas metadata resource of a single-assessment package
+METADATA_ID = "ASSESSMENT_META_001"
+
 
 class ManifestGenerator:
     """Generate imsmanifest.xml for QTI package."""
@@ -14,13 +23,17 @@ class ManifestGenerator:
     XSI_NS = "http://www.w3.org/2001/XMLSchema-instance"
 
     def generate(
-        self, quiz: Quiz, assessment_id: str = "ASSESSMENT_001"
+        self,
+        quiz: QuizSource,
+        assessment_id: str = "ASSESSMENT_001",
+        media: Sequence[MediaFile] = (),
     ) -> etree._Element:
         """Generate manifest XML (Canvas compatible format).
 
         Args:
-            quiz: Quiz object
+            quiz: Quiz or QuestionBank
             assessment_id: Assessment identifier
+            media: Files bundled with the assessment
 
         Returns:
             Manifest XML element
@@ -29,38 +42,115 @@ class ManifestGenerator:
             GenerationError: If generation fails
         """
         try:
-            # Create root manifest element with Canvas-compatible namespaces
-            nsmap = {
-                None: "http://www.imsglobal.org/xsd/imsccv1p1/imscp_v1p1",
-                "lom": "http://ltsc.ieee.org/xsd/imsccv1p1/LOM/resource",
-                "imsmd": self.MD_NS,
-                "xsi": self.XSI_NS,
-            }
-
-            manifest = etree.Element("manifest", nsmap=nsmap)
-            manifest.set("identifier", "MANIFEST_001")
-            manifest.set(
-                "{%s}schemaLocation" % self.XSI_NS,
-                "http://www.imsglobal.org/xsd/imsccv1p1/imscp_v1p1 http://www.imsglobal.org/xsd/imscp_v1p1.xsd "  # noqa: E501
-                "http://ltsc.ieee.org/xsd/imsccv1p1/LOM/resource http://www.imsglobal.org/profile/cc/ccv1p1/LOM/ccv1p1_lomresource_v1p0.xsd "  # noqa: E501
-                "http://www.imsglobal.org/xsd/imsmd_v1p2 http://www.imsglobal.org/xsd/imsmd_v1p2p2.xsd",  # noqa: E501
+            return self._build(
+                quiz.metadata.title, [(assessment_id, METADATA_ID)], media
             )
+        except Exception as e:
+            raise GenerationError(f"Failed to generate manifest: {e}") from e
 
-            # Add metadata
-            self._add_metadata(manifest, quiz)
+    def generate_many(
+        self,
+        title: str,
+        assessments: Sequence[Tuple[str, str]],
+        media: Sequence[MediaFile] = (),
+    ) -> etree._Element:
+        """Generate the manifest of a package holding several assessments.
 
-            # Add organizations (empty for QTI)
-            etree.SubElement(manifest, "organizations")
+        Args:
+            title: Package title
+            assessments: Identifiers of each assessment and of its Canvas
+                metadata resource, all unique
+            media: Files bundled with the assessments, each once
 
-            # Add resources (Canvas format)
-            self._add_resources(manifest, assessment_id)
+        Returns:
+            Manifest XML element
 
-            return manifest
+        Raises:
+            GenerationError: If generation fails
+        """
+        try:
+            return self._build(title, assessments, media)
+        except Exception as e:
+            raise GenerationError(f"Failed to generate manifest: {e}") from e
+
+    def render(
+        self,
+        quiz: QuizSource,
+        assessment_id: str = "ASSESSMENT_001",
+        pretty_print: bool = True,
+        media: Sequence[MediaFile] = (),
+    ) -> str:
+        """Render the manifest as an XML document.
+
+        Returns what ``element_to_string(generate(...), pretty_print,
+        with_declaration=True)`` returns, from a template compiled once per
+        process unless files are bundled.
+
+        Args:
+            quiz: Quiz or QuestionBank
+            assessment_id: Assessment identifier
+            pretty_print: Whether to pretty print the document
+            media: Files bundled with the assessment
 
+        Returns:
+            Manifest XML document
+
+        Raises:
+            GenerationError: If generation fails
+        """
+        try:
+            if media:
+                return element_to_string(
+                    self.generate(quiz, assessment_id, media),
+                    pretty_print,
+                    with_declaration=True,
+                )
+            return _template(pretty_print).render(
+                title=quiz.metadata.title, assessment_id=assessment_id
+            )
         except Exception as e:
             raise GenerationError(f"Failed to generate manifest: {e}") from e
 
-    def _add_metadata(self, manifest: etree._Element, quiz: Quiz) -> None:
+    def _build(
+        self,
+        title: str,
+        assessments: Sequence[Tuple[str, str]],
+        media: Sequence[MediaFile] = (),
+    ) -> etree._Element:
+        """Build the manifest element from the per-package values."""
+        # Create root manifest element with Canvas-compatible namespaces
+        nsmap = {
+            None: "http://www.imsglobal.org/xsd/imsccv1p1/imscp_v1p1",
+            "lom": "http://ltsc.ieee.org/xsd/imsccv1p1/LOM/resource",
+            "imsmd": self.MD_NS,
+            "xsi": self.XSI_NS,
+        }
+
+        manifest = etree.Element("manifest", nsmap=nsmap)
+        manifest.set("identifier", "MANIFEST_001")
+        manifest.set(
+            "{%s}schemaLocation" % self.XSI_NS,
+            "http://www.imsglobal.org/xsd/imsccv1p1/imscp_v1p1 http://www.imsglobal.org/xsd/imscp_v1p1.xsd "  # noqa: E501
+            "http://ltsc.ieee.org/xsd/imsccv1p1/LOM/resource http://www.imsglobal.org/profile/cc/ccv1p1/LOM/ccv1p1_lomresource_v1p0.xsd "  # noqa: E501
+            "http://www.imsglobal.org/xsd/imsmd_v1p2 http://www.imsglobal.org/xsd/imsmd_v1p2p2.xsd",  # noqa: E501
+        )
+
+        # Add metadata
+        self._add_metadata(manifest, title)
+
+        # Add organizations (empty for QTI)
+        etree.SubElement(manifest, "organizations")
+
+        # Add resources (Canvas format)
+        resources = etree.SubElement(manifest, "resources")
+        for assessment_id, metadata_id in assessments:
+            self._add_resources(resources, assessment_id, metadata_id)
+        for media_file in media:
+            self._add_media_resource(resources, media_file)
+
+        return manifest
+
+    def _add_metadata(self, manifest: etree._Element, title: str) -> None:
         """Add manifest metadata."""
         metadata = etree.SubElement(manifest, "metadata")
 
@@ -74,15 +164,15 @@ class ManifestGenerator:
         lom = etree.SubElement(metadata, "{%s}lom" % self.MD_NS)
         general = etree.SubElement(lom, "{%s}general" % self.MD_NS)
 
-        title = etree.SubElement(general, "{%s}title" % self.MD_NS)
-        langstring = etree.SubElement(title, "{%s}langstring" % self.MD_NS)
+        title_elem = etree.SubElement(general, "{%s}title" % self.MD_NS)
+        langstring = etree.SubElement(title_elem, "{%s}langstring" % self.MD_NS)
         langstring.set("{http://www.w3.org/XML/1998/namespace}lang", "en")
-        langstring.text = quiz.metadata.title
-
-    def _add_resources(self, manifest: etree._Element, assessment_id: str) -> None:
-        """Add resources section (Canvas compatible format)."""
-        resources = etree.SubElement(manifest, "resources")
+        langstring.text = title
 
+    def _add_resources(
+        self, resources: etree._Element, assessment_id: str, metadata_id: str
+    ) -> None:
+        """Add the resources of an assessment (Canvas compatible format)."""
         # Main assessment QTI resource
         assessment_resource = etree.SubElement(resources, "resource")
         assessment_resource.set("identifier", assessment_id)
@@ -93,7 +183,6 @@ class ManifestGenerator:
         file.set("href", f"{assessment_id}/{assessment_id}.xml")
 
         # Canvas assessment metadata resource (dependency)
-        metadata_id = "ASSESSMENT_META_001"
         assessment_resource.set("href", f"{assessment_id}/{assessment_id}.xml")
 
         # Add dependency to metadata resource
@@ -110,3 +199,24 @@ class ManifestGenerator:
 
         file = etree.SubElement(metadata_resource, "file")
         file.set("href", f"{assessment_id}/assessment_meta.xml")
+
+    def _add_media_resource(
+        self, resources: etree._Element, media_file: MediaFile
+    ) -> None:
+        """Add the web content resource of a bundled file."""
+        resource = etree.SubElement(resources, "resource")
+        resource.set("identifier", media_file.identifier)
+        resource.set("type", "webcontent")
+        resource.set("href", media_file.href)
+
+        file = etree.SubElement(resource, "file")
+        file.set("href", media_file.href)
+
+
+@lru_cache(maxsize=None)
+def _template(pretty_print: bool) -> DocumentTemplate:
+    """Return a document template, compiled on first use."""
+    skeleton = ManifestGenerator()._build(
+        field("title"), [(field("assessment_id"), METADATA_ID)]
+    )
+    return DocumentTemplate(skeleton, pretty_print)
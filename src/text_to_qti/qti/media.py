@@ -0,0 +1,238 @@
+"""Images referenced by quizzes, bundled into packages."""
+
+import hashlib
+import re
+import zlib
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple, Union
+from urllib.parse import quote, unquote
+
+from text_to_qti.parser.question_bank import QuestionBank, QuestionView, QuizSource
+from text_to_qti.parser.question_models import Question, Quiz, construct_trusted
+from text_to_qti.utils.errors import GenerationError
+
+# Package directory of bundled files, which Canvas imports into course files
+WEB_RESOURCES = "web_resources"
+
+# Placeholder Canvas replaces with the URL of WEB_RESOURCES on import
+FILE_BASE = "$IMS-CC-FILEBASE$"
+
+# Bytes read at a time when hashing and copying files
+CHUNK_SIZE = 2**20
+
+# Formats that are already compressed, so deflating them only costs time
+STORED_SUFFIXES = frozenset(
+    {".gif", ".jpeg", ".jpg", ".m4a", ".mp3", ".mp4", ".png", ".webm", ".webp"}
+)
+
+# <img src="..."> in HTML, and ![alt](...) in Markdown
+_HTML_IMAGE = re.compile(
+    r"""(?P<prefix><img\b[^>]*?\bsrc\s*=\s*(?P<quote>["']))(?P<src>.*?)(?P=quote)""",
+    re.IGNORECASE | re.DOTALL,
+)
+_MARKDOWN_IMAGE = re.compile(r"(?P<prefix>!\[[^\]]*\]\(\s*)(?P<src><[^>\n]*>|[^)\s]+)")
+
+# References that are not files next to the quiz: URLs with a scheme such as
+# http: or data:, and site, protocol or fragment relative ones
+_EXTERNAL = re.compile(r"[a-zA-Z][a-zA-Z0-9+.-]*:|[/#]")
+
+
+class MediaFile(NamedTuple):
+    """File bundled into a package."""
+
+    path: Path
+    href: str
+    size: int
+    crc: int
+    digest: str
+
+    @property
+    def identifier(self) -> str:
+        """Identifier of the file's manifest resource."""
+        return f"MEDIA_{self.digest}"
+
+    @property
+    def reference(self) -> str:
+        """URL of the file in quiz text, resolved by Canvas on import."""
+        return f"{FILE_BASE}/{quote(self.href[len(WEB_RESOURCES) + 1 :])}"
+
+    @property
+    def stored(self) -> bool:
+        """Whether the file is stored uncompressed in packages."""
+        return self.path.suffix.lower() in STORED_SUFFIXES
+
+
+class MediaResolver:
+    """Resolve the images of quizzes to files to bundle with them.
+
+    Images referenced by relative paths in question text and feedback, as
+    ``<img src="...">`` or ``![alt](...)``, are read from the base directory,
+    hashed, and rewritten to point at a copy in the package's web resources.
+    Copies are named after a BLAKE2b digest of their content, so a file
+    referenced from several questions, quizzes or paths is bundled once, and
+    always under the same name. Each file is hashed once per resolver, so a
+    resolver shared across packages reads every image only once.
+
+    References to URLs, and to files already rewritten by a resolver, are
+    left as they are. References that lead outside the base directory, with
+    ``..`` or through symbolic links, are rejected, so a quiz cannot bundle
+    arbitrary files of the machine converting it.
+    """
+
+    def __init__(self, base_dir: Union[str, Path] = ".") -> None:
+        """Initialize resolver.
+
+        Args:
+            base_dir: Directory that relative image paths are resolved
+                against, usually that of the quiz file
+        """
+        self.base_dir = Path(base_dir)
+        self._root = self.base_dir.resolve()
+        self._by_path: Dict[Path, MediaFile] = {}
+        self._by_digest: Dict[str, MediaFile] = {}
+        self._by_reference: Dict[str, MediaFile] = {}
+
+    def bundle(self, quiz: QuizSource) -> Tuple[QuizSource, List[MediaFile]]:
+        """Rewrite the image references of a quiz to bundled files.
+
+        Args:
+            quiz: Quiz or QuestionBank
+
+        Returns:
+            The quiz with rewritten references (the same object if none
+            changed), and the files it references, in order of first use
+
+        Raises:
+            GenerationError: If an image cannot be read
+        """
+        files: Dict[str, MediaFile] = {}
+        changed = False
+        questions: List[Union[Question, QuestionView]] = []
+        source: Sequence[Union[Question, QuestionView]] = quiz.questions
+        for question in source:
+            try:
+                text = self.rewrite(question.text, files)
+                feedback = question.feedback
+                if feedback is not None:
+                    feedback = self.rewrite(feedback, files)
+            except (OSError, GenerationError) as e:
+                raise GenerationError(
+                    f"Failed to bundle media of question {question.id}: {e}"
+                ) from e
+            if text != question.text or feedback != question.feedback:
+                changed = True
+                question = _question(question).model_copy(
+                    update={"text": text, "feedback": feedback}
+                )
+            questions.append(question)
+
+        media = list(files.values())
+        if not changed:
+            return quiz, media
+        if isinstance(quiz, QuestionBank):
+            return QuestionBank(quiz.metadata, map(_question, questions)), media
+        # The questions were validated as part of the original quiz
+        bundled = construct_trusted(
+            Quiz, {"metadata": quiz.metadata, "questions": questions}
+        )
+        return bundled, media
+
+    def rewrite(self, text: str, files: Dict[str, MediaFile]) -> str:
+        """Rewrite the image references of a text to bundled files.
+
+        Args:
+            text: Question text or feedback
+            files: Files referenced so far, by digest; those the text
+                references are added
+
+        Returns:
+            The text with rewritten references
+
+        Raises:
+            GenerationError: If a referenced file does not exist
+            OSError: If a referenced file cannot be read
+        """
+
+        def replace(match: "re.Match[str]") -> str:
+            reference = match.group("src")
+            if reference.startswith("<"):
+                reference = reference[1:-1].strip()
+            media = self.resolve(reference)
+            if media is None:
+                return match.group(0)
+            files.setdefault(media.digest, media)
+            return (
+                match.group("prefix")
+                + media.reference
+                + match.string[match.end("src") : match.end()]
+            )
+
+        if "<" in text:
+            text = _HTML_IMAGE.sub(replace, text)
+        if "![" in text:
+            text = _MARKDOWN_IMAGE.sub(replace, text)
+        return text
+
+    def resolve(self, reference: str) -> Optional[MediaFile]:
+        """Return the file an image reference points to.
+
+        Args:
+            reference: Image URL as written in the quiz
+
+        Returns:
+            The file, or None if the reference is not to a local file
+
+        Raises:
+            GenerationError: If the file does not exist or is outside the
+                base directory
+            OSError: If the file cannot be read
+        """
+        media = self._by_reference.get(reference)
+        if media is not None or not reference or _EXTERNAL.match(reference):
+            return media
+        if reference.startswith(FILE_BASE):
+            return None
+
+        path = self.base_dir / unquote(reference)
+        media = self._by_path.get(path)
+        if media is None:
+            try:
+                # Path.is_relative_to() needs Python 3.9
+                path.resolve().relative_to(self._root)
+            except ValueError:
+                raise GenerationError(
+                    f"Image outside the quiz directory: {reference}"
+                ) from None
+            if not path.is_file():
+                raise GenerationError(f"Image not found: {reference}")
+            media = self._by_path[path] = self._load(path)
+        return media
+
+    def _load(self, path: Path) -> MediaFile:
+        """Hash a file, returning the earlier file if one has the same content."""
+        digest = hashlib.blake2b(digest_size=16)
+        crc = size = 0
+        with open(path, "rb") as f:
+            while True:
+                chunk = f.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                digest.update(chunk)
+                crc = zlib.crc32(chunk, crc)
+                size += len(chunk)
+
+        hexdigest = digest.hexdigest()
+        media = self._by_digest.get(hexdigest)
+        if media is None:
+            href = f"{WEB_RESOURCES}/media/{hexdigest}/{path.name}"
+            media = MediaFile(path, href, size, crc, hexdigest)
+            self._by_digest[hexdigest] = media
+            self._by_reference[media.reference] = media
+        return media
+
+
+def _question(question: Union[Question, QuestionView]) -> Question:
+    """Return a question as a model, copying it out of a bank if needed."""
+    if isinstance(question, QuestionView):
+        return question.to_question()
+    return question
@@ -0,0 +1,285 @@
+"""QTI packages holding several quizzes."""
+
+import io
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from functools import lru_cache, partial
+from pathlib import Path
+from typing import (
+    IO,
+    Deque,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+    overload,
+)
+
+from text_to_qti.packager.zip_creator import (
+    DEFAULT_COMPRESS_LEVEL,
+    AssessmentXML,
+    ZIPCreator,
+)
+from text_to_qti.parser.markdown_renderer import MarkdownRenderer
+from text_to_qti.parser.question_bank import QuizSource
+from text_to_qti.qti.assessment import AssessmentGenerator
+from text_to_qti.qti.canvas_metadata import CanvasMetadataGenerator
+from text_to_qti.qti.item_cache import ItemCache
+from text_to_qti.qti.manifest import ManifestGenerator
+from text_to_qti.qti.media import MediaFile, MediaResolver
+from text_to_qti.utils.errors import GenerationError
+
+# Quizzes rendered ahead of the one being packaged, per worker
+QUIZZES_PER_WORKER = 2
+
+# Item cache directory and size limit passed to worker processes
+_CacheOptions = Optional[Tuple[str, int]]
+
+
+class PackageBuilder:
+    """Build one Canvas import package from several quizzes.
+
+    Each quiz becomes an assessment with its own Canvas metadata, identified
+    as ASSESSMENT_001, ASSESSMENT_002 and so on in the order given, and one
+    manifest lists them all, so a course's quizzes are imported at once. A
+    package of one quiz is the same as the one ``QTIGenerator`` writes.
+    """
+
+    def __init__(
+        self,
+        quizzes: Sequence[QuizSource],
+        title: Optional[str] = None,
+        renderer: str = "lxml",
+        item_cache: Optional[ItemCache] = None,
+        workers: int = 1,
+        compact: bool = False,
+        compress_level: int = DEFAULT_COMPRESS_LEVEL,
+        store: bool = False,
+        compress_threads: int = 1,
+        reproducible: bool = False,
+        update: bool = False,
+        media: Optional[MediaResolver] = None,
+        markdown: Optional[MarkdownRenderer] = None,
+    ) -> None:
+        """Initialize builder.
+
+        Args:
+            quizzes: Quizzes or QuestionBanks, in package order
+            title: Package title in the manifest (default: title of the
+                first quiz)
+            renderer: "lxml" or "template" (see AssessmentGenerator)
+            item_cache: Optional cache of serialized items shared across
+                quizzes; worker processes share only its directory, if any
+            workers: Number of processes to render the assessments with;
+                with more than one, several quizzes are rendered at a time
+                and packaged in order, and a single quiz has its items
+                rendered in parallel instead (see AssessmentGenerator)
+            compact: Whether the XML documents are written without
+                indentation
+            compress_level: DEFLATE compression level of the package, 0-9
+            store: Whether package entries are stored uncompressed
+            compress_threads: Number of threads to compress the assessments
+                with (see ZIPCreator)
+            reproducible: Whether the package entries get fixed timestamps
+                and attributes (see ZIPCreator)
+            update: Whether an existing package at the output path is
+                updated, reusing the compressed entries that did not change
+                (see ZIPCreator)
+            media: Optional resolver of the images referenced in question
+                text and feedback; files used by several quizzes are bundled
+                once
+            markdown: Optional renderer of question text and feedback from
+                Markdown to HTML, shared by the quizzes
+
+        Raises:
+            GenerationError: If there are no quizzes, or an option is invalid
+        """
+        if not quizzes:
+            raise GenerationError("No quizzes to package")
+        self.quizzes = list(quizzes)
+        self.title = title if title is not None else self.quizzes[0].metadata.title
+        self.workers = workers
+        self.compact = compact
+        self.media = media
+        self.markdown = markdown
+
+        self.assessment_gen = AssessmentGenerator(
+            renderer=renderer, item_cache=item_cache, workers=workers, compact=compact
+        )
+        self.manifest_gen = ManifestGenerator()
+        self.canvas_metadata_gen = CanvasMetadataGenerator()
+        self.zip_creator = ZIPCreator(
+            compress_level, store, compress_threads, reproducible, update
+        )
+
+    @property
+    def assessment_ids(self) -> List[str]:
+        """Identifiers of the assessments, in quiz order."""
+        return [f"ASSESSMENT_{n:03d}" for n in range(1, len(self.quizzes) + 1)]
+
+    @overload
+    def generate(self, output_path: Union[None, str, Path] = None) -> Path: ...
+
+    @overload
+    def generate(self, output_path: IO[bytes]) -> None: ...
+
+    def generate(
+        self, output_path: Union[None, str, Path, IO[bytes]] = None
+    ) -> Optional[Path]:
+        """Generate the package.
+
+        Args:
+            output_path: Optional output file path (default: output.zip), or a
+                writable binary file object (see QTIGenerator.generate)
+
+        Returns:
+            Path to created ZIP file, or None if written to a file object
+
+        Raises:
+            GenerationError: If generation fails
+        """
+        assessment_ids = self.assessment_ids
+        metadata_ids = [
+            f"ASSESSMENT_META_{n:03d}" for n in range(1, len(self.quizzes) + 1)
+        ]
+        quizzes = self.quizzes
+        if self.markdown is not None:
+            quizzes = [self.markdown.render_quiz(quiz) for quiz in quizzes]
+        media: Dict[str, MediaFile] = {}
+        if self.media is not None:
+            sources, quizzes = quizzes, []
+            for quiz in sources:
+                bundled, files = self.media.bundle(quiz)
+                quizzes.append(bundled)
+                for media_file in files:
+                    media.setdefault(media_file.digest, media_file)
+
+        manifest_xml = self.manifest_gen.generate_many(
+            self.title, list(zip(assessment_ids, metadata_ids)), list(media.values())
+        )
+        return self.zip_creator.create_multi_package(
+            output_path if output_path is not None else "output.zip",
+            manifest_xml,
+            self._assessments(quizzes),
+            pretty_print=not self.compact,
+            media=list(media.values()),
+        )
+
+    def generate_bytes(self) -> bytes:
+        """Generate the package in memory.
+
+        Returns:
+            The ZIP file content
+
+        Raises:
+            GenerationError: If generation fails
+        """
+        output = io.BytesIO()
+        self.generate(output)
+        return output.getvalue()
+
+    def _assessments(
+        self, quizzes: List[QuizSource]
+    ) -> Iterator[Tuple[str, AssessmentXML, str]]:
+        """Yield the identifier, assessment and Canvas metadata of each quiz."""
+        if self.workers > 1 and len(quizzes) > 1:
+            documents: Iterator[Tuple[str, QuizSource, AssessmentXML]] = (
+                self._render_parallel(quizzes)
+            )
+        else:
+            documents = (
+                (
+                    assessment_id,
+                    quiz,
+                    partial(
+                        self.assessment_gen.write, quiz, assessment_id=assessment_id
+                    ),
+                )
+                for assessment_id, quiz in zip(self.assessment_ids, quizzes)
+            )
+        for assessment_id, quiz, assessment_xml in documents:
+            canvas_metadata_xml = self.canvas_metadata_gen.render(
+                quiz, assessment_id, not self.compact
+            )
+            yield assessment_id, assessment_xml, canvas_metadata_xml
+
+    def _render_parallel(
+        self, quizzes: List[QuizSource]
+    ) -> Iterator[Tuple[str, QuizSource, AssessmentXML]]:
+        """Render assessments across a process pool, yielding them in order.
+
+        Only a few quizzes per worker are rendered ahead of the one being
+        packaged, so memory use does not grow with the number of quizzes.
+
+        Yields:
+            Identifier, quiz and a function writing its rendered document
+        """
+        generator = self.assessment_gen
+        cache = generator.item_cache
+        cache_options: _CacheOptions = None
+        if cache is not None and cache.directory is not None:
+            cache_options = (str(cache.directory), cache.max_disk_bytes)
+
+        workers = min(self.workers, len(quizzes))
+        pending: Deque[Tuple[str, QuizSource, "Future[bytes]"]] = deque()
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for assessment_id, quiz in zip(self.assessment_ids, quizzes):
+                job = (
+                    quiz,
+                    assessment_id,
+                    generator.renderer,
+                    generator.compact,
+                    cache_options,
+                )
+                pending.append((assessment_id, quiz, pool.submit(_render, job)))
+                if len(pending) >= workers * QUIZZES_PER_WORKER:
+                    yield _collect(*pending.popleft())
+            while pending:
+                yield _collect(*pending.popleft())
+
+
+def _collect(
+    assessment_id: str, quiz: QuizSource, future: "Future[bytes]"
+) -> Tuple[str, QuizSource, AssessmentXML]:
+    """Wait for an assessment rendered by a worker."""
+    return assessment_id, quiz, partial(_copy, future.result())
+
+
+def _copy(data: bytes, output: IO[bytes]) -> None:
+    """Write a rendered document to a ZIP entry."""
+    output.write(data)
+
+
+@lru_cache(maxsize=None)
+def _worker_generator(
+    renderer: str, compact: bool, cache_options: _CacheOptions
+) -> AssessmentGenerator:
+    """Return the generator reused by a worker process across quizzes."""
+    item_cache = None
+    if cache_options is not None:
+        directory, max_disk_bytes = cache_options
+        item_cache = ItemCache(directory=directory, max_disk_bytes=max_disk_bytes)
+    return AssessmentGenerator(
+        renderer=renderer, item_cache=item_cache, compact=compact
+    )
+
+
+def _render(job: Tuple[QuizSource, str, str, bool, _CacheOptions]) -> bytes:
+    """Render the assessment document of a quiz in a worker process.
+
+    Args:
+        job: Quiz, assessment identifier, renderer name, ``compact`` option
+            and item cache options
+
+    Returns:
+        The assessment XML document
+    """
+    quiz, assessment_id, renderer, compact, cache_options = job
+    output = io.BytesIO()
+    _worker_generator(renderer, compact, cache_options).write(
+        quiz, output, assessment_id
+    )
+    return output.getvalue()
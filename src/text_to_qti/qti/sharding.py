@@ -0,0 +1,380 @@
+"""Splitting large quizzes into several import packages."""
+
+import json
+import re
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+from text_to_qti.packager.zip_creator import DEFAULT_COMPRESS_LEVEL
+from text_to_qti.parser.markdown_renderer import MarkdownRenderer
+from text_to_qti.parser.question_bank import QuestionBank, QuizSource
+from text_to_qti.parser.question_models import Quiz, construct_trusted
+from text_to_qti.qti.generator import QTIGenerator
+from text_to_qti.qti.item_cache import ItemCache
+from text_to_qti.qti.media import MediaResolver
+from text_to_qti.qti.templates import assessment_overhead, render_item_bytes
+from text_to_qti.utils.errors import GenerationError
+
+# Suffix replacing that of the output path in the summary written next to it
+SUMMARY_SUFFIX = ".shards.json"
+
+# Item cache directory and size limit passed to worker processes
+_CacheOptions = Optional[Tuple[str, int]]
+
+
+class Shard(NamedTuple):
+    """One package of a sharded quiz."""
+
+    number: int
+    path: Path
+    title: str
+    question_ids: List[str]
+
+
+class ShardSummary:
+    """Packages a quiz was split into, and the shard of each question."""
+
+    def __init__(self, shards: List[Shard], removed: Sequence[Path] = ()) -> None:
+        """Initialize summary.
+
+        Args:
+            shards: Shards in order
+            removed: Shard packages left over from an earlier run that were
+                removed
+        """
+        self.shards = shards
+        self.removed = list(removed)
+
+    @property
+    def question_shards(self) -> Dict[str, int]:
+        """Number of the shard holding each question, by question ID."""
+        return {
+            question_id: shard.number
+            for shard in self.shards
+            for question_id in shard.question_ids
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the summary as JSON serializable data.
+
+        Returns:
+            Dict with the number, path, title and question count of every
+            shard under "shards", and ``question_shards`` under "questions"
+        """
+        return {
+            "shards": [
+                {
+                    "number": shard.number,
+                    "path": str(shard.path),
+                    "title": shard.title,
+                    "questions": len(shard.question_ids),
+                }
+                for shard in self.shards
+            ],
+            "questions": self.question_shards,
+        }
+
+    def write(self, path: Union[str, Path]) -> None:
+        """Write the summary as JSON.
+
+        Args:
+            path: Summary file path
+        """
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, indent=2)
+            f.write("\n")
+
+
+def summary_path(output_path: Union[str, Path]) -> Path:
+    """Return the path of the summary of shards derived from an output path.
+
+    Args:
+        output_path: Output path the shard paths are derived from
+
+    Returns:
+        The output path with SUMMARY_SUFFIX, as in ``bank.shards.json``
+    """
+    return Path(output_path).with_suffix(SUMMARY_SUFFIX)
+
+
+class ShardedGenerator:
+    """Generate a large quiz as several packages, each under size limits.
+
+    Questions are kept in order and packed greedily into shards of at most
+    ``max_items`` questions and ``max_bytes`` bytes of assessment XML, which
+    Canvas imports faster and more reliably than one huge assessment. Each
+    shard is a complete package of the quiz's metadata, titled
+    "Title (n/N)", written next to the output path with the shard number
+    appended, as in ``bank-1.zip``. A quiz that fits in one shard is written
+    as usual, to the output path with its own title.
+
+    A summary of the shards is written next to them (see ``summary_path``).
+    Shards that the previous summary lists but this run did not write, left
+    over from a run that produced more shards, are removed; other files are
+    never touched, whatever their names.
+    """
+
+    def __init__(
+        self,
+        quiz: QuizSource,
+        max_items: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        version: str = "1.2",
+        streaming: bool = False,
+        workers: int = 1,
+        renderer: str = "lxml",
+        item_cache: Optional[ItemCache] = None,
+        compact: bool = False,
+        compress_level: int = DEFAULT_COMPRESS_LEVEL,
+        store: bool = False,
+        compress_threads: int = 1,
+        reproducible: bool = False,
+        update: bool = False,
+        media: Optional[MediaResolver] = None,
+        markdown: Optional[MarkdownRenderer] = None,
+    ) -> None:
+        """Initialize generator.
+
+        Args:
+            quiz: Quiz or QuestionBank to shard
+            max_items: Maximum number of questions per shard
+            max_bytes: Maximum size of the assessment XML of a shard; a
+                question too large for any shard gets one of its own
+            version: QTI version (1.2 or 2.1)
+            streaming: Whether each shard's assessment is streamed into its
+                package one question at a time (see QTIGenerator)
+            workers: Number of processes to generate shards with
+            renderer: "lxml" or "template" (see AssessmentGenerator)
+            item_cache: Optional cache of serialized items; worker processes
+                share only its directory, if any
+            compact: Whether the XML documents are written without
+                indentation
+            compress_level: DEFLATE compression level of the packages, 0-9
+            store: Whether package entries are stored uncompressed
+            compress_threads: Number of threads to compress each assessment
+                with (see ZIPCreator)
+            reproducible: Whether the package entries get fixed timestamps
+                and attributes (see ZIPCreator)
+            update: Whether existing shard packages are updated, reusing
+                the compressed entries that did not change (see ZIPCreator)
+            media: Optional resolver of the images referenced in question
+                text and feedback; each shard bundles the files its own
+                questions reference
+            markdown: Optional renderer of question text and feedback from
+                Markdown to HTML, applied before the quiz is split
+
+        Raises:
+            GenerationError: If a limit is less than 1
+        """
+        for name, limit in (("max_items", max_items), ("max_bytes", max_bytes)):
+            if limit is not None and limit < 1:
+                raise GenerationError(f"{name} must be at least 1: {limit}")
+        self.quiz = quiz
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self.workers = workers
+        self.item_cache = item_cache
+        self.markdown = markdown
+        self.options: Dict[str, Any] = {
+            "version": version,
+            "streaming": streaming,
+            "renderer": renderer,
+            "compact": compact,
+            "compress_level": compress_level,
+            "store": store,
+            "compress_threads": compress_threads,
+            "reproducible": reproducible,
+            "update": update,
+            "media": media,
+        }
+
+    def plan(self) -> List[Tuple[int, int]]:
+        """Split the questions into shards.
+
+        Returns:
+            Start and stop index of the questions of each shard
+
+        Raises:
+            GenerationError: If a question cannot be rendered to measure it,
+                or an image cannot be read
+        """
+        return self._plan(self._prepared())
+
+    def _prepared(self) -> QuizSource:
+        """Return the quiz rendered and with images bundled, if enabled."""
+        quiz = self.quiz
+        if self.markdown is not None:
+            quiz = self.markdown.render_quiz(quiz)
+        media: Optional[MediaResolver] = self.options["media"]
+        if media is not None:
+            quiz = media.bundle(quiz)[0]
+        return quiz
+
+    def _plan(self, quiz: QuizSource) -> List[Tuple[int, int]]:
+        """Split the questions of a quiz into shards (see ``plan``)."""
+        count = len(quiz.questions)
+        max_items = self.max_items or max(count, 1)
+        if self.max_bytes is None:
+            return [
+                (start, min(start + max_items, count))
+                for start in range(0, count, max_items)
+            ] or [(0, 0)]
+
+        pretty_print = not self.options["compact"]
+        metadata = quiz.metadata
+        # Measured with the longest title a shard can get
+        overhead = assessment_overhead(
+            f"{metadata.title} ({count}/{count})",
+            metadata.shuffle_answers,
+            pretty_print,
+        )
+        ranges = []
+        start = 0
+        size = overhead
+        for index in range(count):
+            question = quiz.questions[index]
+            try:
+                item_size = len(render_item_bytes(question, pretty_print))
+            except ValueError as e:
+                raise GenerationError(
+                    f"Failed to generate question {question.id}: {e}"
+                ) from e
+            if index > start and (
+                index - start >= max_items or size + item_size > self.max_bytes
+            ):
+                ranges.append((start, index))
+                start = index
+                size = overhead
+            size += item_size
+        ranges.append((start, count))
+        return ranges
+
+    def generate(self, output_path: Union[None, str, Path] = None) -> ShardSummary:
+        """Generate the package of every shard.
+
+        Args:
+            output_path: Optional output file path the shard paths are
+                derived from (default: output.zip)
+
+        Returns:
+            Summary of the shards written, and of stale shards removed
+
+        Raises:
+            GenerationError: If generation fails
+            OSError: If a stale shard cannot be removed, or the summary
+                cannot be written
+        """
+        output = Path(output_path if output_path is not None else "output.zip")
+        previous = _previous_shards(output)
+        # Prepared once; each shard then collects the files it references
+        quiz = self._prepared()
+        ranges = self._plan(quiz)
+        total = len(ranges)
+        title = self.quiz.metadata.title
+        width = len(str(total))
+
+        shards = []
+        jobs = []
+        for number, (start, stop) in enumerate(ranges, 1):
+            if total == 1:
+                shard_path, shard_title = output, title
+            else:
+                shard_path = output.with_name(
+                    f"{output.stem}-{number:0{width}d}{output.suffix}"
+                )
+                shard_title = f"{title} ({number}/{total})"
+            shard_quiz = _slice(quiz, start, stop, shard_title)
+            shards.append(
+                Shard(
+                    number,
+                    shard_path,
+                    shard_title,
+                    [question.id for question in shard_quiz.questions],
+                )
+            )
+            jobs.append((shard_quiz, str(shard_path)))
+
+        if self.workers > 1 and total > 1:
+            cache = self.item_cache
+            cache_options: _CacheOptions = None
+            if cache is not None and cache.directory is not None:
+                cache_options = (str(cache.directory), cache.max_disk_bytes)
+            with ProcessPoolExecutor(max_workers=min(self.workers, total)) as pool:
+                # Consumed so that worker errors are raised here
+                list(
+                    pool.map(
+                        _generate_shard,
+                        [
+                            (shard_quiz, path, self.options, cache_options)
+                            for shard_quiz, path in jobs
+                        ],
+                    )
+                )
+        else:
+            for shard_quiz, path in jobs:
+                QTIGenerator(
+                    shard_quiz, item_cache=self.item_cache, **self.options
+                ).generate(path)
+
+        current = {shard.path.name for shard in shards}
+        removed = []
+        for stale in previous:
+            if stale.name not in current and stale.is_file():
+                stale.unlink()
+                removed.append(stale)
+        summary = ShardSummary(shards, removed)
+        summary.write(summary_path(output))
+        return summary
+
+
+def _slice(quiz: QuizSource, start: int, stop: int, title: str) -> QuizSource:
+    """Return the questions of a quiz from start to stop as a quiz."""
+    metadata = quiz.metadata
+    if title != metadata.title:
+        metadata = metadata.model_copy(update={"title": title})
+    if isinstance(quiz, QuestionBank):
+        return QuestionBank(metadata, (view.to_question() for view in quiz[start:stop]))
+    # The questions were validated as part of the whole quiz
+    return construct_trusted(
+        Quiz, {"metadata": metadata, "questions": quiz.questions[start:stop]}
+    )
+
+
+def _previous_shards(output: Path) -> List[Path]:
+    """Return the shard packages the previous summary of an output path lists.
+
+    Only entries named as shards of the output path, in its directory, are
+    returned, so a damaged or edited summary cannot point elsewhere.
+
+    Args:
+        output: Output path the shard paths are derived from
+
+    Returns:
+        Paths of the previous shards; none if there is no readable summary
+    """
+    try:
+        with open(summary_path(output), encoding="utf-8") as f:
+            entries = json.load(f)["shards"]
+        names = [Path(entry["path"]).name for entry in entries]
+    except (OSError, ValueError, KeyError, TypeError):
+        return []
+    pattern = re.compile(
+        rf"{re.escape(output.stem)}(?:-\d+)?{re.escape(output.suffix)}", re.ASCII
+    )
+    return [output.with_name(name) for name in names if pattern.fullmatch(name)]
+
+
+def _generate_shard(job: Tuple[QuizSource, str, Dict[str, Any], _CacheOptions]) -> None:
+    """Generate the package of a shard in a worker process.
+
+    Args:
+        job: Shard quiz, output path, QTIGenerator options and item cache
+            options
+    """
+    quiz, path, options, cache_options = job
+    item_cache = None
+    if cache_options is not None:
+        directory, max_disk_bytes = cache_options
+        item_cache = ItemCache(directory=directory, max_disk_bytes=max_disk_bytes)
+    QTIGenerator(quiz, item_cache=item_cache, **options).generate(path)
@@ -0,0 +1,396 @@
+"""QTI documents rendered from precompiled string templates."""
+
+import re
+from typing import IO, Iterable, List, NamedTuple, Optional, Tuple
+
+from lxml import etree
+
+from text_to_qti.parser.question_bank import QuizSource
+from text_to_qti.parser.question_models import QuestionType
+from text_to_qti.qti.utils import (
+    QTI_NAMESPACE,
+    SCHEMA_LOCATION,
+    XML_DECLARATION,
+    XSI_NAMESPACE,
+    element_to_string,
+    escape_attribute,
+    escape_text,
+)
+from text_to_qti.utils.errors import GenerationError
+
+_QUESTION_TYPE_ENTRIES = {
+    QuestionType.MULTIPLE_CHOICE: "multiple_choice_question",
+    QuestionType.TRUE_FALSE: "true_false_question",
+}
+
+# The templates below hold the pretty-printed layout lxml writes, with items
+# at depth 3 of the document; only the %s fields vary between questions.
+# Text elements are filled in whole by _element, as lxml writes elements
+# with empty text as self-closing tags.
+
+_ASSESSMENT_HEAD = (
+    f'<questestinterop xmlns="{QTI_NAMESPACE}" xmlns:xsi="{XSI_NAMESPACE}" '
+    f'xsi:schemaLocation="{SCHEMA_LOCATION}">\n'
+    '  <assessment ident="%s" title="%s">\n'
+    "    <qtimetadata>\n"
+    "      <qtimetadatafield>\n"
+    "        <fieldlabel>cc_maxattempts</fieldlabel>\n"
+    "        <fieldentry>1</fieldentry>\n"
+    "      </qtimetadatafield>%s\n"
+    "    </qtimetadata>\n"
+)
+
+_SHUFFLE_FIELD = (
+    "\n      <qtimetadatafield>\n"
+    "        <fieldlabel>shuffle_answers</fieldlabel>\n"
+    "        <fieldentry>true</fieldentry>\n"
+    "      </qtimetadatafield>"
+)
+
+_SECTION_HEAD = '    <section ident="root_section">'
+_SECTION_EMPTY = '    <section ident="root_section"/>'
+_SECTION_TAIL = "\n    </section>"
+_ASSESSMENT_TAIL = "\n  </assessment>\n</questestinterop>\n"
+
+_ITEM_HEAD = (
+    '\n      <item ident="%s" title="Question">\n'
+    "        <itemmetadata>\n"
+    "          <qtimetadata>\n"
+    "            <qtimetadatafield>\n"
+    "              <fieldlabel>question_type</fieldlabel>\n"
+    "              <fieldentry>%s</fieldentry>\n"
+    "            </qtimetadatafield>\n"
+    "            <qtimetadatafield>\n"
+    "              <fieldlabel>points_possible</fieldlabel>\n"
+    "              <fieldentry>%s</fieldentry>\n"
+    "            </qtimetadatafield>\n"
+    "            <qtimetadatafield>\n"
+    "              <fieldlabel>original_answer_ids</fieldlabel>\n"
+    "              <fieldentry/>\n"
+    "            </qtimetadatafield>\n"
+    "            <qtimetadatafield>\n"
+    "              <fieldlabel>assessment_question_identifierref</fieldlabel>\n"
+    "              %s\n"
+    "            </qtimetadatafield>\n"
+    "          </qtimetadata>\n"
+    "        </itemmetadata>\n"
+    "        <presentation>\n"
+    "          <material>\n"
+    "            %s\n"
+    "          </material>\n"
+    '          <response_lid rcardinality="Single" ident="response1">\n'
+    "            <render_choice>"
+)
+
+_CHOICE = (
+    '\n              <response_label ident="CHOICE_%s">\n'
+    "                <material>\n"
+    "                  %s\n"
+    "                </material>\n"
+    "              </response_label>"
+)
+
+_ITEM_TAIL = (
+    "\n            </render_choice>\n"
+    "          </response_lid>\n"
+    "        </presentation>\n"
+    "        <resprocessing>\n"
+    "          <outcomes>\n"
+    '            <decvar maxvalue="100" minvalue="0" varname="SCORE" '
+    'vartype="Decimal"/>\n'
+    "          </outcomes>\n"
+    '          <respcondition continue="No">\n'
+    "            <conditionvar>\n"
+    '              <varequal respident="response1">CHOICE_%s</varequal>\n'
+    "            </conditionvar>\n"
+    '            <setvar action="Set" varname="SCORE">100</setvar>\n'
+    '            <displayfeedback feedbacktype="Response" linkrefid="correct_fb"/>\n'
+    "          </respcondition>\n"
+    '          <respcondition continue="Yes">\n'
+    "            <conditionvar>\n"
+    "              <other/>\n"
+    "            </conditionvar>\n"
+    '            <displayfeedback feedbacktype="Response" linkrefid="general_fb"/>\n'
+    "          </respcondition>\n"
+    "        </resprocessing>\n"
+    '        <itemfeedback ident="correct_fb">\n'
+    "          <flow_mat>\n"
+    "            <material>\n"
+    "              %s\n"
+    "            </material>\n"
+    "          </flow_mat>\n"
+    "        </itemfeedback>\n"
+    '        <itemfeedback ident="general_fb">\n'
+    "          <flow_mat>\n"
+    "            <material>\n"
+    "              %s\n"
+    "            </material>\n"
+    "          </flow_mat>\n"
+    "        </itemfeedback>\n"
+    "      </item>"
+)
+
+
+class _Layout(NamedTuple):
+    """Templates of the assessment document in one output style."""
+
+    assessment_head: str
+    shuffle_field: str
+    section_head: str
+    section_empty: str
+    section_tail: str
+    item_head: str
+    choice: str
+    item_tail: str
+
+
+def _compact(template: str) -> str:
+    """Remove the line breaks and indentation between elements."""
+    return re.sub("\n *", "", template)
+
+
+_PRETTY = _Layout(
+    _ASSESSMENT_HEAD,
+    _SHUFFLE_FIELD,
+    _SECTION_HEAD,
+    _SECTION_EMPTY + _ASSESSMENT_TAIL,
+    _SECTION_TAIL + _ASSESSMENT_TAIL,
+    _ITEM_HEAD,
+    _CHOICE,
+    _ITEM_TAIL,
+)
+_COMPACT = _Layout(*(_compact(template.lstrip(" ")) for template in _PRETTY))
+
+# Questions rendered per write to the output
+_BATCH_SIZE = 64
+
+# Delimits the fields of a document skeleton; a private use character, which
+# lxml writes unescaped and quiz values cannot be confused with
+_FIELD_MARK = "\ue000"
+
+
+def field(name: str) -> str:
+    """Return the placeholder of a field, to build a document skeleton with.
+
+    Args:
+        name: Field name
+
+    Returns:
+        Placeholder to use as element text or attribute value
+    """
+    return f"{_FIELD_MARK}{name}{_FIELD_MARK}"
+
+
+class DocumentTemplate:
+    """Serialized XML document with fields filled in on each render.
+
+    The template is compiled from a skeleton element built with ``field()``
+    placeholders in place of the varying values, so it holds exactly the
+    bytes lxml writes for the constant parts. Rendering escapes each value
+    for its context, element text or attribute, as lxml would.
+    """
+
+    def __init__(self, skeleton: etree._Element, pretty_print: bool = True) -> None:
+        """Compile template.
+
+        Args:
+            skeleton: Document element built with ``field()`` placeholders
+            pretty_print: Whether the document is pretty printed
+        """
+        document = element_to_string(
+            skeleton, pretty_print=pretty_print, with_declaration=True
+        )
+        parts = document.split(_FIELD_MARK)
+        self._literals = parts[0::2]
+        # Field names, and whether each is inside a start tag; the constant
+        # parts have < and > escaped except in markup, so the last of them
+        # before a field tells its context
+        self._fields: List[Tuple[str, bool]] = []
+        in_tag = False
+        for literal, name in zip(parts[0::2], parts[1::2]):
+            tag_start, tag_end = literal.rfind("<"), literal.rfind(">")
+            if tag_start != tag_end:
+                in_tag = tag_start > tag_end
+            self._fields.append((name, in_tag))
+
+    def render(self, **values: str) -> str:
+        """Render the document.
+
+        Args:
+            **values: Value of every field
+
+        Returns:
+            XML document with declaration, as ``element_to_string`` writes the
+            skeleton built with these values
+
+        Raises:
+            KeyError: If a field has no value
+            ValueError: If a value has characters not allowed in XML
+        """
+        literals = self._literals
+        parts = [literals[0]]
+        for literal, (name, in_tag) in zip(literals[1:], self._fields):
+            value = values[name]
+            parts.append(escape_attribute(value) if in_tag else escape_text(value))
+            parts.append(literal)
+        return "".join(parts)
+
+
+def render_item(question, pretty_print: bool = True) -> str:
+    """Render the item of a question as it appears in the assessment.
+
+    Args:
+        question: Question or QuestionView
+        pretty_print: Whether to pretty print the item
+
+    Returns:
+        Item XML, when pretty printed indented for depth 3 and preceded by
+        its line break
+
+    Raises:
+        GenerationError: If the question has no correct answer
+        ValueError: If a value has characters not allowed in XML
+    """
+    layout = _PRETTY if pretty_print else _COMPACT
+    # Values are escaped in document order, so that errors match lxml's
+    parts = [
+        layout.item_head
+        % (
+            escape_attribute(question.id),
+            _QUESTION_TYPE_ENTRIES.get(question.type, "multiple_choice_question"),
+            float(question.points),
+            _element("fieldentry", question.id),
+            _element("mattext", question.text, "text/html"),
+        )
+    ]
+    correct_letter = None
+    for choice in question.choices:
+        letter = choice.letter.upper()
+        parts.append(
+            layout.choice
+            % (
+                escape_attribute(letter),
+                _element("mattext", choice.text, "text/plain"),
+            )
+        )
+        if correct_letter is None and choice.is_correct:
+            correct_letter = escape_text(letter)
+    if correct_letter is None:
+        raise GenerationError(f"Question {question.id} has no correct answer")
+
+    feedback = question.feedback
+    parts.append(
+        layout.item_tail
+        % (
+            correct_letter,
+            _element("mattext", feedback or "Correct!", "text/html"),
+            _element(
+                "mattext",
+                feedback or "Incorrect. Please review the material.",
+                "text/html",
+            ),
+        )
+    )
+    return "".join(parts)
+
+
+def render_item_bytes(question, pretty_print: bool = True) -> bytes:
+    """Render the item of a question as UTF-8 bytes.
+
+    Args:
+        question: Question or QuestionView
+        pretty_print: Whether to pretty print the item
+
+    Returns:
+        Item XML as written in the assessment (see ``render_item``)
+    """
+    return render_item(question, pretty_print).encode("utf-8")
+
+
+def write_assessment(
+    quiz: QuizSource,
+    output: IO[bytes],
+    items: Optional[Iterable[bytes]] = None,
+    pretty_print: bool = True,
+    assessment_id: str = "ASSESSMENT_001",
+) -> None:
+    """Write the assessment XML document of a quiz to a binary file.
+
+    Writes the same bytes as ``AssessmentGenerator.write``.
+
+    Args:
+        quiz: Quiz or QuestionBank
+        output: Writable binary file, such as a ZIP entry
+        items: Items of the questions in order, as UTF-8 bytes in the
+            output style; rendered from the templates by default
+        pretty_print: Whether to pretty print the document; otherwise it
+            has no whitespace between elements
+        assessment_id: Assessment identifier
+
+    Raises:
+        GenerationError: If a question has no correct answer
+        ValueError: If a value has characters not allowed in XML
+    """
+    layout = _PRETTY if pretty_print else _COMPACT
+    metadata = quiz.metadata
+    head = layout.assessment_head % (
+        escape_attribute(assessment_id),
+        escape_attribute(metadata.title),
+        layout.shuffle_field if metadata.shuffle_answers else "",
+    )
+    output.write(XML_DECLARATION + head.encode("utf-8"))
+
+    questions = quiz.questions
+    if not len(questions):
+        output.write(layout.section_empty.encode("utf-8"))
+        return
+
+    if items is None:
+        items = (render_item_bytes(question, pretty_print) for question in questions)
+    batch = [layout.section_head.encode("utf-8")]
+    for item in items:
+        batch.append(item)
+        if len(batch) >= _BATCH_SIZE:
+            output.write(b"".join(batch))
+            batch.clear()
+    batch.append(layout.section_tail.encode("utf-8"))
+    output.write(b"".join(batch))
+
+
+def assessment_overhead(
+    title: str,
+    shuffle_answers: bool,
+    pretty_print: bool = True,
+    assessment_id: str = "ASSESSMENT_001",
+) -> int:
+    """Return the size of an assessment document besides its items.
+
+    An assessment with items is exactly this many bytes plus the sizes of
+    its items, as returned by ``render_item_bytes``.
+
+    Args:
+        title: Assessment title
+        shuffle_answers: Whether answers are shuffled
+        pretty_print: Whether the document is pretty printed
+        assessment_id: Assessment identifier
+
+    Returns:
+        Size in bytes of the UTF-8 document without items
+    """
+    layout = _PRETTY if pretty_print else _COMPACT
+    head = layout.assessment_head % (
+        escape_attribute(assessment_id),
+        escape_attribute(title),
+        layout.shuffle_field if shuffle_answers else "",
+    )
+    return len(XML_DECLARATION) + len(
+        (head + layout.section_head + layout.section_tail).encode("utf-8")
+    )
+
+
+def _element(tag: str, text: str, texttype: str = "") -> str:
+    """Render a text element on one line, as lxml writes it."""
+    start = f'{tag} texttype="{texttype}"' if texttype else tag
+    if not text:
+        return f"<{start}/>"
+    return f"<{start}>{escape_text(text)}</{tag}>"
@@ -1,5 +1,6 @@
 """XML utilities for QTI generation."""
 
+import re
 from typing import Dict, Optional
 
 from lxml import etree
@@ -9,6 +10,23 @@ QTI_NAMESPACE = "http://www.imsglobal.org/xsd/ims_qtiasiv1p2"
 IMS_MD_NAMESPACE = "http://www.imsglobal.org/xsd/imsmd_v1p2"
 XSI_NAMESPACE = "http://www.w3.org/2001/XMLSchema-instance"
 
+# Schema location of QTI 1.2 assessments
+SCHEMA_LOCATION = (
+    "http://www.imsglobal.org/xsd/ims_qtiasiv1p2 "
+    "http://www.imsglobal.org/xsd/ims_qtiasiv1p2p1.xsd"
+)
+
+# Declaration written before every XML document in a package
+XML_DECLARATION = b'<?xml version="1.0" encoding="UTF-8"?>\n'
+
+# Characters lxml refuses in text and attribute values
+_INVALID_CHARS = "\x00-\x08\x0b\x0c\x0e-\x1f\ud800-\udfff\ufffe\uffff"
+_INVALID_XML = re.compile(f"[{_INVALID_CHARS}]")
+
+# Characters serialized as references, plus the invalid ones to reject
+_TEXT_SPECIAL = re.compile(f"[&<>\r{_INVALID_CHARS}]")
+_ATTRIBUTE_SPECIAL = re.compile(f'[&<>"\t\n\r{_INVALID_CHARS}]')
+
 # Namespace map for cleaner code
 NSMAP = {
     None: QTI_NAMESPACE,
@@ -79,10 +97,28 @@ def element_to_string(
         )
     )
     if with_declaration:
-        result = '<?xml version="1.0" encoding="UTF-8"?>\n' + result
+        result = XML_DECLARATION.decode() + result
     return result
 
 
+def element_to_bytes(elem: etree._Element, pretty_print: bool = True) -> bytes:
+    """Serialize an element as a UTF-8 XML document with declaration.
+
+    Encodes straight to bytes, without building the string
+    ``element_to_string`` returns.
+
+    Args:
+        elem: Element to convert
+        pretty_print: Whether to pretty print; otherwise the document is
+            written without any whitespace between elements
+
+    Returns:
+        XML document as UTF-8 bytes
+    """
+    data: bytes = etree.tostring(elem, encoding="utf-8", pretty_print=pretty_print)
+    return XML_DECLARATION + data
+
+
 def escape_xml(text: str) -> str:
     """Escape XML special characters.
 
@@ -99,3 +135,62 @@ def escape_xml(text: str) -> str:
         .replace('"', "&quot;")
         .replace("'", "&apos;")
     )
+
+
+def escape_text(text: str) -> str:
+    """Escape element text exactly as lxml serializes it.
+
+    Args:
+        text: Text to escape
+
+    Returns:
+        Escaped text
+
+    Raises:
+        ValueError: If the text has characters not allowed in XML, as lxml
+            raises when they are set on an element
+    """
+    if _TEXT_SPECIAL.search(text) is None:
+        return text
+    _check_xml_compatible(text)
+    return (
+        text.replace("&", "&amp;")
+        .replace("<", "&lt;")
+        .replace(">", "&gt;")
+        .replace("\r", "&#13;")
+    )
+
+
+def escape_attribute(value: str) -> str:
+    """Escape a double-quoted attribute value exactly as lxml serializes it.
+
+    Args:
+        value: Attribute value to escape
+
+    Returns:
+        Escaped value
+
+    Raises:
+        ValueError: If the value has characters not allowed in XML
+    """
+    if _ATTRIBUTE_SPECIAL.search(value) is None:
+        return value
+    _check_xml_compatible(value)
+    return (
+        value.replace("&", "&amp;")
+        .replace("<", "&lt;")
+        .replace(">", "&gt;")
+        .replace('"', "&quot;")
+        .replace("\t", "&#9;")
+        .replace("\n", "&#10;")
+        .replace("\r", "&#13;")
+    )
+
+
+def _check_xml_compatible(text: str) -> None:
+    """Raise lxml's error for characters not allowed in XML."""
+    if _INVALID_XML.search(text) is not None:
+        raise ValueError(
+            "All strings must be XML compatible: Unicode or ASCII, "
+            "no NULL bytes or control characters"
+        )
@@ -0,0 +1,125 @@
+"""Directory of files keyed by hash, shared by the on-disk caches."""
+
+import os
+import tempfile
+from pathlib import Path
+from typing import Optional, Union
+
+
+class DiskStore:
+    """Files in a directory, written atomically and evicted by last use.
+
+    Writes go to a temporary file that is atomically renamed into place, so
+    several processes can share a directory; a reader sees either a whole
+    file or none. Reads touch the file's modification time, which eviction
+    uses to remove the least recently used files first. Only files with the
+    store's suffix are read, counted or removed, so stores of different
+    caches may share a directory.
+    """
+
+    def __init__(self, directory: Union[str, Path], suffix: str) -> None:
+        """Initialize store, creating the directory if needed.
+
+        Args:
+            directory: Directory holding the files
+            suffix: File name suffix of the entries, such as ".quiz"
+        """
+        self.directory = Path(directory)
+        self.suffix = suffix
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def path(self, key: str) -> Path:
+        """Return the path of an entry."""
+        return self.directory / f"{key}{self.suffix}"
+
+    def read(self, key: str) -> Optional[bytes]:
+        """Read an entry, recording the use for eviction.
+
+        Args:
+            key: Entry key
+
+        Returns:
+            The entry's bytes, or None if it cannot be read
+        """
+        path = self.path(key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except OSError:
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            # A read-only directory, or an entry another process has just
+            # evicted; the data read is still good
+            pass
+        return data
+
+    def write(self, key: str, data: bytes) -> bool:
+        """Write an entry atomically, replacing any previous one.
+
+        Args:
+            key: Entry key
+            data: Entry bytes
+
+        Returns:
+            Whether the entry was written; failures are not raised, as the
+            caches using the store are only an optimisation
+        """
+        try:
+            fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(data)
+                os.replace(temp_path, self.path(key))
+            except BaseException:
+                _unlink(Path(temp_path))
+                raise
+        except OSError:
+            return False
+        return True
+
+    def remove(self, key: str) -> None:
+        """Remove an entry, if it exists."""
+        _unlink(self.path(key))
+
+    def clear(self) -> None:
+        """Remove every entry."""
+        for path in self.directory.glob(f"*{self.suffix}"):
+            _unlink(path)
+
+    def evict(self, max_bytes: int) -> None:
+        """Remove least recently used entries beyond a total size.
+
+        Args:
+            max_bytes: Total entry size to evict down to
+        """
+        entries = []
+        total = 0
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if not entry.name.endswith(self.suffix):
+                    continue
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+                total += stat.st_size
+
+        if total <= max_bytes:
+            return
+        entries.sort()
+        for _, size, path in entries:
+            _unlink(Path(path))
+            total -= size
+            if total <= max_bytes:
+                break
+
+
+def _unlink(path: Path) -> None:
+    """Delete a file another process may already have deleted."""
+    try:
+        path.unlink()
+    except OSError:
+        pass
@@ -6,19 +6,13 @@ from typing import Optional
 class TextToQTIError(Exception):
     """Base exception for all text-to-qti errors."""
 
-    pass
-
-
-class ParseError(TextToQTIError):
-    """Error during parsing of text file."""
-
     def __init__(
         self,
         message: str,
         line_number: Optional[int] = None,
         column: Optional[int] = None,
     ) -> None:
-        """Initialize ParseError with optional line and column information.
+        """Initialize the error with optional line and column information.
 
         Args:
             message: Error message
@@ -38,6 +32,12 @@ class ParseError(TextToQTIError):
         super().__init__(formatted_message)
 
 
+class ParseError(TextToQTIError):
+    """Error during parsing of text file."""
+
+    pass
+
+
 class ValidationError(TextToQTIError):
     """Error during validation of quiz content."""
 
@@ -0,0 +1,139 @@
+"""Tests for the command line interface."""
+
+import re
+import subprocess
+import sys
+import zipfile
+from pathlib import Path
+from typing import Dict
+
+import pytest
+from click.testing import CliRunner
+
+from text_to_qti.cli import cli
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+# Dependencies only the commands need, which importing the CLI must not load
+DEFERRED = ("rich", "lxml", "pydantic", "markdown", "yaml")
+
+# Cumulative import time of the CLI, in microseconds. It takes about 60 ms
+# with imports deferred and nearly 300 ms without, so this leaves headroom
+# for slow machines while still catching an eager import of the parser.
+STARTUP_BUDGET_US = 150_000
+
+_IMPORT_TIME = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def _import_times() -> Dict[str, int]:
+    """Import the CLI in a fresh interpreter, returning cumulative times."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import text_to_qti.cli"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for match in _IMPORT_TIME.finditer(result.stderr):
+        times[match.group(4)] = int(match.group(2))
+    return times
+
+
+class TestStartup:
+    """Tests for the start-up time of the CLI."""
+
+    def test_deferred_imports(self):
+        """Test that importing the CLI loads none of the heavy dependencies."""
+        loaded = {name.split(".")[0] for name in _import_times()}
+        assert not loaded.intersection(DEFERRED)
+        assert not [name for name in loaded if name.startswith("text_to_qti.qti")]
+
+    def test_budget(self):
+        """Test that importing the CLI stays within the start-up budget."""
+        # The fastest of a few runs, so a busy machine does not fail the test
+        cumulative = min(_import_times()["text_to_qti.cli"] for _ in range(3))
+        assert cumulative < STARTUP_BUDGET_US
+
+
+class TestPlainOutput:
+    """Tests for --plain."""
+
+    @pytest.mark.parametrize("args", [["--plain"], []])
+    def test_convert(self, tmp_path: Path, args: list, monkeypatch):
+        """Test that plain output has no markup and no progress."""
+        monkeypatch.setattr("text_to_qti.cli.console.plain", False)
+        output_path = tmp_path / "quiz.zip"
+        env = {} if args else {"TEXT_TO_QTI_PLAIN": "1"}
+        result = CliRunner().invoke(
+            cli,
+            [*args, "convert", str(FIXTURES / "simple_mc.txt"), "-o", str(output_path)],
+            env=env,
+        )
+
+        assert result.exit_code == 0, result.output
+        assert result.output.splitlines() == [
+            f"✓ QTI package created: {output_path}",
+            "Total questions: 1",
+            "Total points: 1",
+        ]
+        assert zipfile.is_zipfile(output_path)
+
+    def test_validate_error(self, tmp_path: Path, monkeypatch):
+        """Test that plain errors are printed without markup."""
+        monkeypatch.setattr("text_to_qti.cli.console.plain", False)
+        quiz = tmp_path / "quiz.txt"
+        quiz.write_text("## Question 1\n[Type: nonsense]\nText\n")
+        result = CliRunner().invoke(cli, ["--plain", "validate", str(quiz)])
+
+        assert result.exit_code == 1
+        assert result.output.startswith("✗ Validation Error: ")
+
+
+class TestConvert:
+    """Tests for the convert command."""
+
+    def test_sharded(self, tmp_path: Path, monkeypatch):
+        """Test sharding with the QTI version and streaming, run twice."""
+        monkeypatch.setattr("text_to_qti.cli.console.plain", False)
+        quiz = tmp_path / "quiz.txt"
+        quiz.write_text(
+            "---\ntitle: Bank\n---\n"
+            + "".join(
+                f"## Question {n}\n[Type: true_false]\n"
+                f"Statement {n}\n*a) True\nb) False\n\n"
+                for n in range(1, 6)
+            )
+        )
+        output_path = tmp_path / "out" / "bank.zip"
+        args = ["--plain", "convert", str(quiz), "-o", str(output_path)]
+        options = ["--qti-version", "2.1", "--stream"]
+
+        result = CliRunner().invoke(cli, [*args, "--shard-items", "2", *options])
+        assert result.exit_code == 0, result.output
+        assert len(list(output_path.parent.glob("bank-*.zip"))) == 3
+
+        result = CliRunner().invoke(cli, [*args, "--shard-items", "3", *options])
+        assert result.exit_code == 0, result.output
+        assert f"Removed stale shard: {output_path.parent / 'bank-3.zip'}" in (
+            result.output.splitlines()
+        )
+        assert sorted(p.name for p in output_path.parent.iterdir()) == [
+            "bank-1.zip",
+            "bank-2.zip",
+            "bank.shards.json",
+        ]
+
+    @pytest.mark.parametrize("shard", [[], ["--shard-items", "1"]])
+    def test_unrelated_files_kept(self, tmp_path: Path, monkeypatch, shard: list):
+        """Test that a file named like a shard survives a convert."""
+        monkeypatch.setattr("text_to_qti.cli.console.plain", False)
+        unrelated = tmp_path / "quiz-2024.zip"
+        unrelated.write_bytes(b"not ours")
+        args = ["--plain", "convert", str(FIXTURES / "mixed_questions.txt")]
+
+        for _ in range(2):
+            result = CliRunner().invoke(
+                cli, [*args, "-o", str(tmp_path / "quiz.zip"), *shard]
+            )
+            assert result.exit_code == 0, result.output
+        assert unrelated.read_bytes() == b"not ours"
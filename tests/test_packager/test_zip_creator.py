@@ -0,0 +1,308 @@
+"""Tests for ZIP package creation."""
+
+import io
+import os
+import stat
+import time
+import zipfile
+from pathlib import Path
+
+import pytest
+
+from text_to_qti.packager import deflate
+from text_to_qti.packager.deflate import ParallelDeflateWriter, raw_entries_supported
+from text_to_qti.packager.zip_creator import ZIPCreator
+from text_to_qti.utils.errors import GenerationError
+
+ASSESSMENT = "ASSESSMENT_001/ASSESSMENT_001.xml"
+
+
+def _payload(size: int) -> bytes:
+    """Return compressible XML-like data of about ``size`` bytes."""
+    parts = []
+    length = n = 0
+    while length < size:
+        part = f'<item ident="Q{n}"><mattext>Question {n * 7919}</mattext>'
+        parts.append(part)
+        length += len(part)
+        n += 1
+    return "".join(parts).encode("utf-8")
+
+
+def _create(tmp_path: Path, creator: ZIPCreator, assessment) -> Path:
+    """Create a package with placeholder manifest and metadata documents."""
+    return creator.create_package(
+        str(tmp_path / "quiz.zip"), "<manifest/>", assessment, "<quiz/>"
+    )
+
+
+class TestParallelDeflateWriter:
+    """Tests for ParallelDeflateWriter."""
+
+    @pytest.mark.parametrize("block_size", [1000, 40_000, 10**6])
+    def test_round_trip(self, block_size: int):
+        """Test that blocks compressed in parallel read back as one entry."""
+        data = _payload(300_000)
+        output = io.BytesIO()
+        with zipfile.ZipFile(output, "w", zipfile.ZIP_DEFLATED) as zf:
+            with ParallelDeflateWriter(zf, "a.xml", 6, 3, block_size) as entry:
+                for start in range(0, len(data), 7777):
+                    entry.write(data[start : start + 7777])
+
+        with zipfile.ZipFile(output) as zf:
+            assert zf.testzip() is None
+            assert zf.read("a.xml") == data
+            info = zf.getinfo("a.xml")
+            assert info.compress_type == zipfile.ZIP_DEFLATED
+            assert info.file_size == len(data)
+            assert info.compress_size < len(data) // 4
+
+    def test_empty_entry(self):
+        """Test writing an entry with no data."""
+        output = io.BytesIO()
+        with zipfile.ZipFile(output, "w", zipfile.ZIP_DEFLATED) as zf:
+            with ParallelDeflateWriter(zf, "a.xml", 6, 2):
+                pass
+
+        with zipfile.ZipFile(output) as zf:
+            assert zf.read("a.xml") == b""
+
+    def test_size_close_to_single_stream(self):
+        """Test that priming blocks keeps the output close to one stream."""
+        data = _payload(2_000_000)
+        single = io.BytesIO()
+        with zipfile.ZipFile(single, "w", zipfile.ZIP_DEFLATED) as zf:
+            zf.writestr("a.xml", data)
+        parallel = io.BytesIO()
+        with zipfile.ZipFile(parallel, "w", zipfile.ZIP_DEFLATED) as zf:
+            with ParallelDeflateWriter(zf, "a.xml", 6, 2) as entry:
+                entry.write(data)
+
+        assert len(parallel.getvalue()) < len(single.getvalue()) * 1.05
+
+
+class TestZipfileInternals:
+    """Tests for the zipfile internals that raw entries rely on."""
+
+    def test_raw_entries_supported(self):
+        """Test that this Python's zipfile still supports raw entries.
+
+        If this fails, parallel compression and package updates silently
+        fall back to plain zipfile writes; adapt open_raw_entry() and
+        finish_raw_entry() to the new zipfile internals.
+        """
+        output = io.BytesIO()
+        with zipfile.ZipFile(output, "w") as zf, zf.open("a", "w") as entry:
+            for attribute in deflate._RAW_ENTRY_ATTRIBUTES:
+                assert hasattr(entry, attribute), attribute
+        assert hasattr(zipfile.ZipInfo, "compress_level") or hasattr(
+            zipfile.ZipInfo, "_compresslevel"
+        )
+        assert raw_entries_supported()
+
+    def test_broken_internals_detected(self, monkeypatch):
+        """Test that the probe fails if the CRC is no longer taken from us."""
+        raw_entries_supported.cache_clear()
+        monkeypatch.setattr(deflate, "finish_raw_entry", lambda *args: None)
+        try:
+            assert not raw_entries_supported()
+        finally:
+            raw_entries_supported.cache_clear()
+
+    @pytest.mark.parametrize("threads", [1, 3])
+    def test_fallback(self, tmp_path: Path, monkeypatch, threads: int):
+        """Test that packages are written with plain zipfile when unsupported."""
+        monkeypatch.setattr(deflate, "raw_entries_supported", lambda: False)
+        monkeypatch.setattr(
+            "text_to_qti.packager.zip_creator.raw_entries_supported", lambda: False
+        )
+        data = _payload(300_000)
+        path = _create(tmp_path, ZIPCreator(threads=threads), lambda f: f.write(data))
+        _create(
+            tmp_path,
+            ZIPCreator(threads=threads, update=True),
+            lambda f: f.write(data[::-1]),
+        )
+
+        with zipfile.ZipFile(path) as zf:
+            assert zf.testzip() is None
+            assert zf.read(ASSESSMENT) == data[::-1]
+
+
+class TestZIPCreator:
+    """Tests for ZIPCreator compression options."""
+
+    @pytest.mark.parametrize(
+        "options, compress_type",
+        [
+            ({}, zipfile.ZIP_DEFLATED),
+            ({"compress_level": 1}, zipfile.ZIP_DEFLATED),
+            ({"threads": 4}, zipfile.ZIP_DEFLATED),
+            ({"store": True, "threads": 4}, zipfile.ZIP_STORED),
+        ],
+    )
+    def test_entries(self, tmp_path: Path, options, compress_type: int):
+        """Test that every setting writes the same documents."""
+        data = _payload(500_000)
+        path = _create(tmp_path, ZIPCreator(**options), lambda f: f.write(data))
+
+        with zipfile.ZipFile(path) as zf:
+            assert zf.testzip() is None
+            assert zf.read(ASSESSMENT) == data
+            assert zf.read("imsmanifest.xml") == b"<manifest/>"
+            assert zf.read("ASSESSMENT_001/assessment_meta.xml") == b"<quiz/>"
+            assert {info.compress_type for info in zf.infolist()} == {compress_type}
+
+    def test_compress_level(self, tmp_path: Path):
+        """Test that a higher level gives a smaller package."""
+        data = _payload(500_000)
+        sizes = [
+            _create(tmp_path, ZIPCreator(compress_level=level), lambda f: f.write(data))
+            .stat()
+            .st_size
+            for level in (0, 1, 9)
+        ]
+        assert sizes[0] > sizes[1] > sizes[2]
+
+    def test_invalid_compress_level(self):
+        """Test that an out-of-range level is rejected."""
+        with pytest.raises(GenerationError, match="between 0 and 9"):
+            ZIPCreator(compress_level=10)
+
+    def test_write_error(self, tmp_path: Path):
+        """Test that errors while streaming the assessment are wrapped."""
+
+        def fail(entry):
+            entry.write(_payload(300_000))
+            raise ValueError("bad item")
+
+        with pytest.raises(GenerationError, match="bad item"):
+            _create(tmp_path, ZIPCreator(threads=2), fail)
+
+
+class TestReproducible:
+    """Tests for reproducible packages."""
+
+    @pytest.mark.parametrize("threads", [1, 2])
+    def test_identical_across_time(self, tmp_path: Path, monkeypatch, threads: int):
+        """Test that packages written at different times are identical."""
+        monkeypatch.delenv("SOURCE_DATE_EPOCH", raising=False)
+        data = _payload(300_000)
+        creator = ZIPCreator(threads=threads, reproducible=True)
+        builds = []
+        for now in (1_000_000_000, 1_700_000_000):
+            monkeypatch.setattr(time, "time", lambda: now)
+            path = _create(tmp_path, creator, lambda f: f.write(data))
+            builds.append(path.read_bytes())
+        assert builds[0] == builds[1]
+
+        with zipfile.ZipFile(io.BytesIO(builds[0])) as zf:
+            assert zf.read(ASSESSMENT) == data
+            for info in zf.infolist():
+                assert info.date_time == (1980, 1, 1, 0, 0, 0)
+                assert info.create_system == 3
+                assert info.external_attr >> 16 == 0o100644
+                assert info.compress_type == zipfile.ZIP_DEFLATED
+
+    def test_source_date_epoch(self, tmp_path: Path, monkeypatch):
+        """Test that SOURCE_DATE_EPOCH sets the entry timestamps."""
+        monkeypatch.setenv("SOURCE_DATE_EPOCH", "1700000000")
+        path = _create(
+            tmp_path, ZIPCreator(reproducible=True), lambda f: f.write(b"<a/>")
+        )
+        with zipfile.ZipFile(path) as zf:
+            assert {info.date_time for info in zf.infolist()} == {
+                (2023, 11, 14, 22, 13, 20)
+            }
+
+    def test_invalid_source_date_epoch(self, tmp_path: Path, monkeypatch):
+        """Test that an unreadable SOURCE_DATE_EPOCH is reported."""
+        monkeypatch.setenv("SOURCE_DATE_EPOCH", "yesterday")
+        with pytest.raises(GenerationError, match="SOURCE_DATE_EPOCH"):
+            _create(tmp_path, ZIPCreator(reproducible=True), lambda f: f.write(b"<a/>"))
+
+
+class TestUpdate:
+    """Tests for updating existing packages."""
+
+    def test_unchanged_package(self, tmp_path: Path, monkeypatch):
+        """Test that updating with the same documents gives the same bytes."""
+        monkeypatch.delenv("SOURCE_DATE_EPOCH", raising=False)
+        data = _payload(300_000)
+        path = _create(tmp_path, ZIPCreator(reproducible=True), lambda f: f.write(data))
+        built = path.read_bytes()
+
+        _create(
+            tmp_path,
+            ZIPCreator(reproducible=True, update=True),
+            lambda f: f.write(data),
+        )
+        assert path.read_bytes() == built
+
+    @pytest.mark.parametrize("threads", [1, 2])
+    def test_reuses_unchanged_entries(self, tmp_path: Path, threads: int):
+        """Test that unchanged entries are copied still compressed."""
+        data = _payload(300_000)
+        path = _create(tmp_path, ZIPCreator(compress_level=9), lambda f: f.write(data))
+        with zipfile.ZipFile(path) as zf:
+            previous = zf.getinfo(ASSESSMENT).compress_size
+
+        # At level 1 the assessment would be larger if compressed again
+        ZIPCreator(compress_level=1, threads=threads, update=True).create_package(
+            path, "<manifest/>", lambda f: f.write(data), "<quiz changed='1'/>"
+        )
+        with zipfile.ZipFile(path) as zf:
+            assert zf.testzip() is None
+            assert zf.getinfo(ASSESSMENT).compress_size == previous
+            assert zf.read(ASSESSMENT) == data
+            assert zf.read("ASSESSMENT_001/assessment_meta.xml") == (
+                b"<quiz changed='1'/>"
+            )
+
+    def test_changed_entries(self, tmp_path: Path):
+        """Test that changed or differently compressed entries are rewritten."""
+        path = _create(tmp_path, ZIPCreator(), lambda f: f.write(_payload(1000)))
+        changed = _payload(2000)
+
+        _create(tmp_path, ZIPCreator(update=True), lambda f: f.write(changed))
+        with zipfile.ZipFile(path) as zf:
+            assert zf.read(ASSESSMENT) == changed
+
+        _create(
+            tmp_path, ZIPCreator(store=True, update=True), lambda f: f.write(changed)
+        )
+        with zipfile.ZipFile(path) as zf:
+            assert zf.read(ASSESSMENT) == changed
+            assert {info.compress_type for info in zf.infolist()} == {
+                zipfile.ZIP_STORED
+            }
+
+    @pytest.mark.skipif(os.name != "posix", reason="POSIX permissions")
+    @pytest.mark.parametrize("mode", [0o644, 0o664, 0o600])
+    def test_keeps_permissions(self, tmp_path: Path, mode: int):
+        """Test that updating a package keeps its permissions."""
+        path = _create(tmp_path, ZIPCreator(), lambda f: f.write(b"<a/>"))
+        os.chmod(path, mode)
+
+        _create(tmp_path, ZIPCreator(update=True), lambda f: f.write(b"<b/>"))
+        assert stat.S_IMODE(path.stat().st_mode) == mode
+
+    def test_not_a_package(self, tmp_path: Path):
+        """Test that a file that is not a ZIP file is replaced."""
+        (tmp_path / "quiz.zip").write_bytes(b"not a zip file")
+        path = _create(tmp_path, ZIPCreator(update=True), lambda f: f.write(b"<a/>"))
+        with zipfile.ZipFile(path) as zf:
+            assert zf.read(ASSESSMENT) == b"<a/>"
+
+    def test_failed_update(self, tmp_path: Path):
+        """Test that a failed update leaves the previous package in place."""
+        path = _create(tmp_path, ZIPCreator(), lambda f: f.write(b"<a/>"))
+        built = path.read_bytes()
+
+        def fail(entry):
+            raise ValueError("bad item")
+
+        with pytest.raises(GenerationError, match="bad item"):
+            _create(tmp_path, ZIPCreator(update=True), fail)
+        assert path.read_bytes() == built
+        assert list(tmp_path.iterdir()) == [path]
@@ -1,13 +1,17 @@
 """Tests for markdown parser."""
 
+import io
 from pathlib import Path
 
 import pytest
 
+from text_to_qti.parser import markdown_parser
 from text_to_qti.parser.markdown_parser import MarkdownParser
-from text_to_qti.parser.question_models import QuestionType
+from text_to_qti.parser.question_models import QuestionType, Quiz
 from text_to_qti.utils.errors import ParseError
 
+from .regex_parser import RegexMarkdownParser
+
 
 class TestMarkdownParser:
     """Tests for MarkdownParser class."""
@@ -154,3 +158,418 @@ d) Wrong 3
         correct_choices = [c for c in question.choices if c.is_correct]
         assert len(correct_choices) == 1
         assert correct_choices[0].letter == "c"
+
+
+class TestIterQuestions:
+    """Tests for MarkdownParser.iter_questions()."""
+
+    def test_matches_parse_file(self, mixed_questions_file: Path):
+        """Test that streaming yields the same questions as parse_file."""
+        parser = MarkdownParser()
+        quiz = parser.parse_file(str(mixed_questions_file))
+        streamed = list(parser.iter_questions(str(mixed_questions_file)))
+
+        assert [q.model_dump(exclude={"id"}) for q in streamed] == [
+            q.model_dump(exclude={"id"}) for q in quiz.questions
+        ]
+        assert parser.metadata == quiz.metadata
+
+    def test_reads_file_handle(self):
+        """Test streaming from an open file handle."""
+        parser = MarkdownParser()
+        handle = io.StringIO(
+            "---\ntitle: Streamed\n---\n\n## Question 1\n[Type: true_false]\n"
+            "[ID: q1]\n\nStatement.\n\n*a) True\nb) False\n"
+        )
+        questions = parser.iter_questions(handle)
+
+        first = next(questions)
+        assert first.id == "q1"
+        assert parser.metadata.title == "Streamed"
+        assert list(questions) == []
+
+    def test_yields_before_error(self):
+        """Test that questions are yielded before a later block fails."""
+        parser = MarkdownParser()
+        content = """## Question 1
+[Type: true_false]
+
+Statement.
+
+*a) True
+b) False
+
+## Question 2
+[Type: essay]
+
+Essay?
+"""
+        questions = parser.iter_questions(io.StringIO(content))
+        assert next(questions).type == QuestionType.TRUE_FALSE
+        with pytest.raises(ParseError, match="Question 2: Invalid question type"):
+            next(questions)
+
+    def test_duplicate_ids(self):
+        """Test that reused question IDs are rejected."""
+        parser = MarkdownParser()
+        block = "## Question {n}\n[Type: true_false]\n[ID: same]\nQ?\n*a) T\nb) F\n"
+        content = block.format(n=1) + block.format(n=2)
+        with pytest.raises(ParseError, match="Duplicate question ID: same"):
+            list(parser.iter_questions(io.StringIO(content)))
+
+    def test_no_questions(self):
+        """Test error when the stream contains no questions."""
+        parser = MarkdownParser()
+        with pytest.raises(ParseError, match="No questions found"):
+            list(parser.iter_questions(io.StringIO("---\ntitle: Empty\n---\n")))
+
+    def test_file_not_found(self):
+        """Test error handling for missing file."""
+        parser = MarkdownParser()
+        with pytest.raises(ParseError, match="File not found"):
+            list(parser.iter_questions("nonexistent.txt"))
+
+
+def _question_block(n: int, question_type: str = "true_false") -> str:
+    return (
+        f"## Question {n}\n[Type: {question_type}]\n[ID: q{n}]\n\n"
+        f"Statement {n}.\n\n*a) True\nb) False\n\n"
+    )
+
+
+class TestParallelParse:
+    """Tests for parse_file() with several workers."""
+
+    @pytest.fixture(autouse=True)
+    def small_parts(self, monkeypatch: pytest.MonkeyPatch):
+        """Split even small test files into several parts."""
+        monkeypatch.setattr(markdown_parser, "PARALLEL_MIN_PART_SIZE", 200)
+
+    def test_matches_serial_parse(self, tmp_path: Path):
+        """Test that parts are reassembled in file order."""
+        path = tmp_path / "bank.txt"
+        path.write_text(
+            "---\ntitle: Bank\n---\n\n"
+            + "".join(_question_block(n) for n in range(1, 41)),
+            encoding="utf-8",
+        )
+        parser = MarkdownParser()
+
+        assert parser.parse_file(str(path), workers=3) == parser.parse_file(str(path))
+
+    def test_error_reports_file_question_number(self, tmp_path: Path):
+        """Test that errors in later parts carry their position in the file."""
+        blocks = [_question_block(n) for n in range(1, 41)]
+        blocks[32] = _question_block(33, "essay")
+        path = tmp_path / "bank.txt"
+        path.write_text("".join(blocks), encoding="utf-8")
+
+        with pytest.raises(ParseError, match="Question 33: Invalid question type"):
+            MarkdownParser().parse_file(str(path), workers=3)
+
+    def test_headers_in_fenced_block_are_not_split(self, tmp_path: Path):
+        """Test that split points skip headers inside fenced blocks."""
+        content = (
+            "---\ntitle: Bank\n---\n"
+            + "".join(_question_block(n) for n in range(1, 6))
+            + "---\n"
+            + "".join(_question_block(n) for n in range(6, 11))
+            + "---\n"
+            + _question_block(11)
+        )
+        fence = content.index("---", content.index("## Question"))
+        points = markdown_parser._split_points(content, 1)
+
+        assert points
+        assert not [p for p in points if fence < p < content.index("---", fence + 3)]
+
+        path = tmp_path / "bank.txt"
+        path.write_bytes(content.replace("\n", "\r\n").encode("utf-8"))
+        parser = MarkdownParser()
+        assert parser.parse_file(str(path), workers=2) == parser.parse_file(str(path))
+
+    def test_file_not_found(self):
+        """Test error handling for missing file."""
+        with pytest.raises(ParseError, match="File not found"):
+            MarkdownParser().parse_file("nonexistent.txt", workers=2)
+
+
+EQUIVALENCE_CASES = [
+    "---\ntitle: Quiz\n---\n\n## Question 1\n[Type: true_false]\n[ID: q1]\n\n"
+    "Statement.\n\n*a) True\nb) False\n",
+    # Blank lines are dropped from multi-line question text
+    "## Question 1\n[Type: multiple_choice]\n[Points: 3]\n\nLine one\n\nLine two\n"
+    "a) A\n*b) B\nFeedback: first\ncontinued\n\nignored trailing text\n",
+    # Stray headers end the previous block and swallow their own content
+    "## Question 1\n[Type: true_false]\nQ?\n*a) T\nb) F\n## Question 2 (bonus)\n"
+    "junk\n## Question 3\n[Type: true_false]\nQ3?\na) T\n*b) F\n",
+    # Indented first header of a stripped document, CRLF endings
+    "\n\n  ## Question 1\r\n[Type: true_false]\r\nQ?\r\n*a) T\r\nb) F\r\n",
+    # Choices after feedback are ignored
+    "## Question 1\n[Type: true_false]\nQ?\n*a) T\nb) F\nFeedback: x\n\nc) C\n",
+    # Trailing empty header does not open a question
+    "## Question 1\n[Type: true_false]\nQ?\n*a) T\nb) F\n\n## Question 2\n\n",
+    "## Question 1\n[Type: essay]\nQ?\n*a) T\n",
+    "## Question 1\n[Type: multiple_choice]\nQ?\n*a) A\n*b) B\n",
+    "---\ntitle: [\n---\n## Question 1\n[Type: essay]\nQ?\n*a) T\n",
+    "intro text only\n",
+]
+
+
+def _normalized(parser: MarkdownParser, content: str):
+    """Parse content into comparable data (random IDs blanked)."""
+    try:
+        data = parser.parse_content(content).model_dump()
+    except Exception as e:
+        return type(e), str(e)
+    for question in data["questions"]:
+        if question["id"].count("-") == 4:
+            question["id"] = None
+    return data
+
+
+class TestTokenizerEquivalence:
+    """The tokenizer-based parser must match the regex reference parser."""
+
+    @pytest.mark.parametrize(
+        "name", ["simple_mc.txt", "simple_tf.txt", "mixed_questions.txt"]
+    )
+    def test_fixture_files(self, fixtures_dir: Path, name: str):
+        """Test that fixture files parse identically."""
+        content = (fixtures_dir / name).read_text(encoding="utf-8")
+        assert _normalized(MarkdownParser(), content) == _normalized(
+            RegexMarkdownParser(), content
+        )
+
+    @pytest.mark.parametrize("content", EQUIVALENCE_CASES)
+    def test_edge_cases(self, content: str):
+        """Test that edge cases parse (or fail) identically."""
+        assert _normalized(MarkdownParser(), content) == _normalized(
+            RegexMarkdownParser(), content
+        )
+
+
+class TestCheck:
+    """Tests for the single-pass check_file()/check_content()."""
+
+    def test_builds_same_quiz_as_parse_file(self, mixed_questions_file: Path):
+        """Test that a valid file yields the parsed quiz and no diagnostics."""
+        parser = MarkdownParser()
+        result = parser.check_file(str(mixed_questions_file))
+
+        assert result.ok
+        quiz = parser.parse_file(str(mixed_questions_file))
+        assert [q.model_dump(exclude={"id"}) for q in result.quiz.questions] == [
+            q.model_dump(exclude={"id"}) for q in quiz.questions
+        ]
+        assert result.quiz.metadata == quiz.metadata
+
+    def test_trusted_models_validate(self, mixed_questions_file: Path):
+        """Test that models built without validation pass validation."""
+        parser = MarkdownParser()
+        for quiz in (
+            parser.check_file(str(mixed_questions_file)).quiz,
+            parser.parse_file(str(mixed_questions_file)),
+        ):
+            assert Quiz.model_validate(quiz.model_dump()) == quiz
+
+    def test_validate_only(self, simple_tf_file: Path):
+        """Test that no quiz is built when only validating."""
+        result = MarkdownParser().check_file(str(simple_tf_file), build=False)
+        assert result.ok
+        assert result.quiz is None
+
+    def test_reports_every_problem_with_position(self):
+        """Test that all problems are reported at their source position."""
+        content = """## Question 1
+[Type: multiple_choice]
+
+Q1?
+
+a) A
+*b) B
+
+## Question 7
+[Type: multiple_choice]
+[Points: many]
+
+Q2?
+
+a) A
+c) C
+"""
+        result = MarkdownParser().check_content(content)
+
+        assert result.quiz is None
+        assert [(d.line_number, d.column, d.message) for d in result.diagnostics] == [
+            (11, 10, "Question 7: Points value 'many' is not an integer"),
+            (
+                15,
+                1,
+                "Question 7: No correct answer specified. "
+                "Mark correct answer with * (e.g., *c) Correct answer)",
+            ),
+            (
+                16,
+                1,
+                "Question 7: Answer letters must be sequential (a, b, c, ...). "
+                "Found: a, c",
+            ),
+        ]
+        assert str(result.diagnostics[0]).startswith("Line 11, Column 10: Question 7")
+
+    def test_file_level_problems_come_first(self):
+        """Test that front matter problems precede question problems."""
+        content = "## Question 1\n[Points: x]\nQ?\n---\ntitle: [\n---\n"
+        diagnostics = MarkdownParser().check_content(content).diagnostics
+
+        assert "Invalid YAML" in diagnostics[0].message
+        assert diagnostics[0].line_number == 5
+        assert [(d.line_number, d.message) for d in diagnostics[1:]] == [
+            (
+                1,
+                "Question 1: No question type specified. "
+                "Use [Type: multiple_choice] or [Type: true_false]",
+            ),
+            (
+                1,
+                "Question 1: No answer choices found. "
+                "Answer choices must be in format: a) Text or *a) Correct answer",
+            ),
+            (2, "Question 1: Points value 'x' is not an integer"),
+        ]
+
+    def test_duplicate_ids(self):
+        """Test that reused question IDs are reported."""
+        block = "## Question {n}\n[Type: true_false]\n[ID: same]\nQ?\n*a) T\nb) F\n"
+        content = block.format(n=1) + block.format(n=2)
+        diagnostics = MarkdownParser().check_content(content).diagnostics
+
+        assert [str(d) for d in diagnostics] == [
+            "Line 9, Column 6: Question 2: Duplicate question ID 'same'"
+        ]
+
+    def test_no_questions(self):
+        """Test error when the content contains no questions."""
+        diagnostics = MarkdownParser().check_content("intro\n").diagnostics
+        assert "No questions found" in str(diagnostics[0])
+
+    @pytest.mark.parametrize("content", EQUIVALENCE_CASES)
+    def test_agrees_with_parse_content(self, content: str):
+        """Test that content checks clean exactly when it parses."""
+        parser = MarkdownParser()
+        result = parser.check_content(content)
+        try:
+            parser.parse_content(content)
+        except Exception:
+            assert not result.ok
+        else:
+            assert result.ok
+
+    @pytest.mark.parametrize("newline", ["\n", "\r\n"])
+    def test_parallel(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch, newline: str
+    ):
+        """Test that checking in parts reports the same positions."""
+        monkeypatch.setattr(markdown_parser, "PARALLEL_MIN_PART_SIZE", 200)
+        blocks = [_question_block(n) for n in range(1, 41)]
+        blocks[4] = _question_block(5, "essay")
+        blocks[32] = _question_block(33, "essay")
+        path = tmp_path / "bank.txt"
+        path.write_bytes("".join(blocks).replace("\n", newline).encode("utf-8"))
+
+        parser = MarkdownParser()
+        diagnostics = parser.check_file(str(path), workers=3).diagnostics
+
+        assert [str(d) for d in diagnostics] == [
+            str(d) for d in parser.check_file(str(path)).diagnostics
+        ]
+        assert [(d.line_number, d.column) for d in diagnostics] == [(38, 8), (290, 8)]
+
+
+class TestContentIds:
+    """Tests for IDs derived from question content."""
+
+    BLOCK = "## Question {n}\n[Type: true_false]\n\n{text}\n\n*a) True\nb) False\n\n"
+
+    def _content(self, *texts: str) -> str:
+        return "".join(
+            self.BLOCK.format(n=n, text=text) for n, text in enumerate(texts, 1)
+        )
+
+    def test_stable_across_parses(self):
+        """Test that unchanged questions keep their IDs."""
+        parser = MarkdownParser(content_ids=True)
+        first = parser.parse_content(self._content("A.", "B."))
+        second = parser.parse_content(self._content("A.", "Changed."))
+
+        assert first.questions[0].id == second.questions[0].id
+        assert first.questions[1].id != second.questions[1].id
+
+    def test_explicit_id_wins(self):
+        """Test that an explicit ID is kept."""
+        content = "## Question 1\n[Type: true_false]\n[ID: mine]\nQ?\n*a) T\nb) F\n"
+        quiz = MarkdownParser(content_ids=True).parse_content(content)
+        assert quiz.questions[0].id == "mine"
+
+    def test_same_on_every_path(self, tmp_path: Path, monkeypatch):
+        """Test that parsing, checking, streaming and workers agree."""
+        monkeypatch.setattr(markdown_parser, "PARALLEL_MIN_PART_SIZE", 200)
+        content = self._content(*(f"Statement {n}." for n in range(30)))
+        path = tmp_path / "bank.txt"
+        path.write_text(content, encoding="utf-8")
+        parser = MarkdownParser(content_ids=True)
+
+        ids = [q.id for q in parser.parse_content(content).questions]
+        assert [q.id for q in parser.check_content(content).quiz.questions] == ids
+        assert [q.id for q in parser.iter_questions(str(path))] == ids
+        assert [q.id for q in parser.parse_file(str(path), workers=3).questions] == ids
+
+    def test_collision(self):
+        """Test that questions with the same content are rejected."""
+        parser = MarkdownParser(content_ids=True)
+        content = self._content("Same.", "Same.")
+
+        with pytest.raises(ValueError, match="Duplicate question IDs found"):
+            parser.parse_content(content)
+        (diagnostic,) = parser.check_content(content).diagnostics
+        assert "Question 2: Same content as an earlier question" in str(diagnostic)
+        assert (diagnostic.line_number, diagnostic.column) == (9, 1)
+
+
+class TestReparse:
+    """Tests for the incremental reparse_content()."""
+
+    def test_reparses_only_changed_blocks(self):
+        """Test that unchanged blocks keep their Question objects."""
+        parser = MarkdownParser()
+        blocks = [_question_block(n) for n in range(1, 6)]
+        first = parser.reparse_content("".join(blocks))
+        assert parser.reparsed == 5
+
+        blocks[2] = blocks[2].replace("Statement 3.", "Statement three.")
+        second = parser.reparse_content("".join(blocks))
+
+        assert parser.reparsed == 1
+        assert second == parser.parse_content("".join(blocks))
+        kept = [a is b for a, b in zip(first.questions, second.questions)]
+        assert kept == [True, True, False, True, True]
+
+    def test_repeated_blocks_get_own_questions(self):
+        """Test that identical blocks are not shared between positions."""
+        block = "## Question 1\n[Type: true_false]\nQ?\n*a) T\nb) F\n\n"
+        quiz = MarkdownParser().reparse_content(block * 2)
+
+        first, second = quiz.questions
+        assert first is not second
+        assert first.id != second.id
+
+    def test_errors_report_file_question_number(self):
+        """Test that errors carry their position in the whole file."""
+        parser = MarkdownParser()
+        blocks = [_question_block(n) for n in range(1, 6)]
+        parser.reparse_content("".join(blocks))
+        blocks[3] = _question_block(4, "essay")
+
+        with pytest.raises(ParseError, match="Question 4: Invalid question type"):
+            parser.reparse_content("".join(blocks))
@@ -0,0 +1,118 @@
+"""Tests for Markdown rendering of question text and feedback."""
+
+import pickle
+import subprocess
+import sys
+
+import pytest
+
+from text_to_qti.parser.markdown_parser import MarkdownParser
+from text_to_qti.parser.markdown_renderer import MarkdownRenderer
+from text_to_qti.parser.question_bank import QuestionBank
+from text_to_qti.qti.generator import QTIGenerator
+
+QUIZ = """---
+title: Formatting
+---
+
+## Question 1
+[Type: multiple_choice]
+
+Which is **bold**?
+
+a) *Not* this
+*b) This
+
+Feedback: See the `strong` tag.
+
+## Question 2
+[Type: true_false]
+
+Which is **bold**?
+
+*a) True
+b) False
+
+Feedback: See the `strong` tag.
+"""
+
+
+class TestMarkdownRenderer:
+    """Tests for MarkdownRenderer."""
+
+    def test_render(self):
+        """Test rendering with the parser's extensions."""
+        renderer = MarkdownRenderer()
+        assert renderer.render("Is **this** `code`?") == (
+            "<p>Is <strong>this</strong> <code>code</code>?</p>"
+        )
+        assert renderer.render("| a |\n|---|\n| 1 |").startswith("<table>")
+
+    def test_converter_reset(self):
+        """Test that state such as footnotes does not leak between texts."""
+        renderer = MarkdownRenderer()
+        assert "footnote" in renderer.render("Text[^1]\n\n[^1]: Note")
+        assert renderer.render("Plain") == "<p>Plain</p>"
+
+    def test_cache(self):
+        """Test that rendered texts are memoized, least recently used first out."""
+        renderer = MarkdownRenderer(cache_size=2)
+        for text in ("a", "b", "a", "c", "a", "b"):
+            renderer.render(text)
+        # "b" was evicted by "c", as "a" had been used since
+        assert (renderer.hits, renderer.misses) == (2, 4)
+
+    def test_render_many(self):
+        """Test that each unique text is rendered once."""
+        renderer = MarkdownRenderer()
+        rendered = renderer.render_many(["*x*", "y", "*x*", "y"])
+        assert rendered == {"*x*": "<p><em>x</em></p>", "y": "<p>y</p>"}
+        assert (renderer.hits, renderer.misses) == (0, 2)
+
+    @pytest.mark.parametrize("bank", [False, True])
+    def test_render_quiz(self, bank: bool):
+        """Test that text and feedback are rendered, and choices are not."""
+        quiz = MarkdownParser().parse_content(QUIZ)
+        source = QuestionBank.from_quiz(quiz) if bank else quiz
+        renderer = MarkdownRenderer()
+
+        rendered = renderer.render_quiz(source)
+        assert isinstance(rendered, QuestionBank) == bank
+        for question in rendered.questions:
+            assert question.text == "<p>Which is <strong>bold</strong>?</p>"
+            assert question.feedback == "<p>See the <code>strong</code> tag.</p>"
+        assert rendered.questions[0].choices[0].text == "*Not* this"
+        assert (renderer.hits, renderer.misses) == (0, 2)
+        assert quiz.questions[0].text == "Which is **bold**?"
+
+    def test_lazy_converter(self):
+        """Test that Python-Markdown is only imported once a text is rendered."""
+        code = (
+            "import sys\n"
+            "from text_to_qti.parser.markdown_parser import MarkdownParser\n"
+            "parser = MarkdownParser()\n"
+            "assert 'markdown' not in sys.modules\n"
+            "parser.renderer.render('x')\n"
+            "assert 'markdown' in sys.modules\n"
+        )
+        subprocess.run([sys.executable, "-c", code], check=True)
+
+    def test_pickle(self):
+        """Test that renderers sent to worker processes rebuild the converter."""
+        renderer = MarkdownRenderer()
+        renderer.render("*x*")
+        copy = pickle.loads(pickle.dumps(renderer))
+        assert copy._converter is None
+        assert copy.render("**y**") == "<p><strong>y</strong></p>"
+
+    @pytest.mark.parametrize("renderer", ["lxml", "template"])
+    def test_package(self, renderer: str):
+        """Test that packages carry the rendered HTML."""
+        quiz = MarkdownParser().parse_content(QUIZ)
+        data = QTIGenerator(
+            quiz, renderer=renderer, markdown=MarkdownRenderer(), reproducible=True
+        ).generate_bytes()
+        expected = QTIGenerator(
+            MarkdownRenderer().render_quiz(quiz), reproducible=True
+        ).generate_bytes()
+        assert data == expected
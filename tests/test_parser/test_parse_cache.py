@@ -0,0 +1,114 @@
+"""Tests for the on-disk parse cache."""
+
+import os
+from pathlib import Path
+
+import pytest
+
+from text_to_qti.parser.markdown_parser import MarkdownParser
+from text_to_qti.parser.parse_cache import ParseCache
+from text_to_qti.utils.errors import ParseError
+
+
+@pytest.fixture
+def cache(tmp_path: Path) -> ParseCache:
+    """Return an empty cache."""
+    return ParseCache(tmp_path / "cache")
+
+
+def _entries(cache: ParseCache):
+    return sorted(cache.directory.glob("*.quiz"))
+
+
+class TestParseCache:
+    """Tests for ParseCache and its use by MarkdownParser."""
+
+    def test_hit_returns_same_quiz(self, cache, mixed_questions_file: Path):
+        """Test that a cached parse equals the original parse."""
+        parser = MarkdownParser(cache=cache)
+        first = parser.parse_file(str(mixed_questions_file))
+        assert len(_entries(cache)) == 1
+
+        second = parser.parse_file(str(mixed_questions_file))
+        assert second == first
+        assert second is not first
+
+    def test_hit_skips_parsing(self, cache, simple_mc_file: Path, monkeypatch):
+        """Test that a hit does not parse the file again."""
+        parser = MarkdownParser(cache=cache)
+        parser.parse_file(str(simple_mc_file))
+
+        def fail(*args, **kwargs):
+            raise AssertionError("parsed again")
+
+        monkeypatch.setattr(parser, "parse_content", fail)
+        monkeypatch.setattr(parser, "check_content", fail)
+        assert parser.parse_file(str(simple_mc_file)).questions
+        assert parser.check_file(str(simple_mc_file)).ok
+
+    def test_key_depends_on_content_and_options(self, cache, tmp_path: Path):
+        """Test that edited files and other options miss."""
+        path = tmp_path / "quiz.txt"
+        path.write_text("## Question 1\n[Type: true_false]\nQ?\n*a) T\nb) F\n")
+        MarkdownParser(cache=cache).parse_file(str(path))
+        MarkdownParser(cache=cache, content_ids=True).parse_file(str(path))
+        path.write_text("## Question 1\n[Type: true_false]\nQ2?\n*a) T\nb) F\n")
+        quiz = MarkdownParser(cache=cache).parse_file(str(path))
+
+        assert quiz.questions[0].text == "Q2?"
+        assert len(_entries(cache)) == 3
+
+    def test_errors_are_not_cached(self, cache, tmp_path: Path):
+        """Test that failing files are parsed (and fail) every time."""
+        path = tmp_path / "quiz.txt"
+        path.write_text("## Question 1\n[Type: essay]\nQ?\n*a) T\n")
+        parser = MarkdownParser(cache=cache)
+
+        for _ in range(2):
+            with pytest.raises(ParseError):
+                parser.parse_file(str(path))
+            assert not parser.check_file(str(path)).ok
+        assert not _entries(cache)
+
+    def test_damaged_entry_is_a_miss(self, cache, simple_tf_file: Path):
+        """Test that an unreadable entry is dropped and reparsed."""
+        parser = MarkdownParser(cache=cache)
+        quiz = parser.parse_file(str(simple_tf_file))
+        (entry,) = _entries(cache)
+        entry.write_bytes(b"\x00garbage")
+
+        assert parser.parse_file(str(simple_tf_file)).metadata == quiz.metadata
+        (entry,) = _entries(cache)
+        assert entry.read_bytes() != b"\x00garbage"
+
+    def test_hit_when_touch_fails(self, cache, simple_mc_file: Path, monkeypatch):
+        """Test that a hit is kept when the entry's mtime cannot be updated."""
+        parser = MarkdownParser(cache=cache)
+        quiz = parser.parse_file(str(simple_mc_file))
+
+        def fail(*args, **kwargs):
+            raise PermissionError("read-only")
+
+        monkeypatch.setattr(os, "utime", fail)
+        monkeypatch.setattr(parser, "parse_content", fail)
+        assert parser.parse_file(str(simple_mc_file)) == quiz
+
+    def test_evicts_least_recently_used(self, cache, fixtures_dir: Path):
+        """Test that the least recently used entries go past the size limit."""
+        parser = MarkdownParser(cache=cache)
+        paths = [
+            fixtures_dir / f"{name}.txt"
+            for name in ("simple_mc", "simple_tf", "mixed_questions")
+        ]
+        keys = [cache.key(path.read_bytes(), False) for path in paths]
+        quizzes = [parser.parse_file(str(path)) for path in paths]
+        entries = [cache.directory / f"{key}.quiz" for key in keys]
+        for entry in entries:
+            os.utime(entry, (1000, 1000))
+        # A hit makes the first entry the most recently used
+        parser.parse_file(str(paths[0]))
+
+        cache.max_bytes = entries[0].stat().st_size + entries[2].stat().st_size
+        cache.put(keys[2], quizzes[2])
+
+        assert _entries(cache) == sorted([entries[0], entries[2]])
@@ -0,0 +1,97 @@
+"""Tests for the columnar QuestionBank."""
+
+from pathlib import Path
+
+import pytest
+from lxml import etree
+from pydantic import ValidationError
+
+from text_to_qti.parser.markdown_parser import MarkdownParser
+from text_to_qti.parser.question_bank import QuestionBank
+from text_to_qti.parser.question_models import QuizMetadata
+from text_to_qti.qti.assessment import AssessmentGenerator
+
+
+@pytest.fixture
+def quiz(mixed_questions_file: Path):
+    """Return the parsed mixed questions fixture."""
+    return MarkdownParser().parse_file(str(mixed_questions_file))
+
+
+class TestQuestionBank:
+    """Tests for QuestionBank."""
+
+    def test_round_trip(self, quiz):
+        """Test that a quiz survives conversion to a bank and back."""
+        bank = QuestionBank.from_quiz(quiz)
+
+        assert len(bank) == len(quiz.questions)
+        assert bank.to_quiz() == quiz
+
+    def test_views_match_questions(self, quiz):
+        """Test that rows read back the question fields."""
+        bank = QuestionBank.from_quiz(quiz)
+
+        for view, question in zip(bank, quiz.questions):
+            assert view.id == question.id
+            assert view.type is question.type
+            assert view.text == question.text
+            assert view.points == question.points
+            assert view.feedback == question.feedback
+            assert [tuple(c) for c in view.choices] == [
+                (c.letter, c.text, c.is_correct) for c in question.choices
+            ]
+        assert bank.get_total_points() == quiz.get_total_points()
+
+    def test_large_points(self, quiz):
+        """Test that points beyond 32 bits are kept on every platform."""
+        question = quiz.questions[0].model_copy(update={"points": 2**40})
+        bank = QuestionBank(quiz.metadata, [question])
+
+        assert bank[0].points == 2**40
+        assert bank.get_total_points() == 2**40
+
+    def test_indexing(self, quiz):
+        """Test integer, negative and slice indexing."""
+        bank = QuestionBank.from_quiz(quiz)
+
+        assert bank[-1].id == quiz.questions[-1].id
+        assert [view.id for view in bank[1:]] == [q.id for q in quiz.questions[1:]]
+        with pytest.raises(IndexError):
+            bank[len(bank)]
+
+    def test_pools_repeated_strings(self, simple_tf_file: Path):
+        """Test that repeated answer texts are stored once."""
+        parser = MarkdownParser()
+        first = parser.parse_file(str(simple_tf_file))
+        second = parser.parse_file(str(simple_tf_file))
+        assert first.questions[0].choices[0].text is not (
+            second.questions[0].choices[0].text
+        )
+
+        bank = QuestionBank(first.metadata, first.questions + second.questions)
+        offset = len(first.questions)
+        for a, b in zip(bank[0].choices, bank[offset].choices):
+            assert a.text is b.text
+
+    def test_to_quiz_checks_ids(self, quiz):
+        """Test that duplicate IDs are rejected when converting back."""
+        bank = QuestionBank(quiz.metadata, quiz.questions * 2)
+        with pytest.raises(ValidationError):
+            bank.to_quiz()
+
+    def test_from_iter_questions(self, mixed_questions_file: Path, quiz):
+        """Test building a bank from streamed questions."""
+        parser = MarkdownParser()
+        bank = QuestionBank(
+            QuizMetadata(title="Bank"), parser.iter_questions(str(mixed_questions_file))
+        )
+        assert [view.text for view in bank] == [q.text for q in quiz.questions]
+
+    def test_generates_same_assessment(self, quiz):
+        """Test that the assessment generator accepts a bank directly."""
+        generator = AssessmentGenerator()
+        expected = etree.tostring(generator.generate(quiz))
+        assert etree.tostring(generator.generate(QuestionBank.from_quiz(quiz))) == (
+            expected
+        )
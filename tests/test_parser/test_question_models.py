@@ -9,6 +9,8 @@ from text_to_qti.parser.question_models import (
     QuestionType,
     Quiz,
     QuizMetadata,
+    construct_trusted,
+    content_id,
 )
 
 
@@ -248,5 +250,74 @@ class TestQuiz:
                 AnswerChoice(letter="b", text="False", is_correct=False),
             ],
         )
-        with pytest.raises(ValidationError):
+        with pytest.raises(ValidationError, match="Duplicate question IDs found: q1"):
             Quiz(metadata=metadata, questions=[q1, q2])
+
+
+class TestConstructTrusted:
+    """Tests for construct_trusted()."""
+
+    def test_matches_validated_model(self):
+        """Test that trusted construction equals validated construction."""
+        values = {
+            "id": "q1",
+            "type": QuestionType.TRUE_FALSE,
+            "text": "Is the sky blue?",
+            "choices": [
+                construct_trusted(
+                    AnswerChoice, {"letter": "a", "text": "True", "is_correct": True}
+                ),
+                construct_trusted(
+                    AnswerChoice, {"letter": "b", "text": "False", "is_correct": False}
+                ),
+            ],
+            "points": 2,
+            "feedback": None,
+        }
+        question = construct_trusted(Question, dict(values))
+
+        assert question == Question(**values)
+        assert question.model_fields_set == set(values)
+        assert Question.model_validate(question.model_dump()) == question
+
+    def test_skips_validators(self):
+        """Test that values are stored without being validated."""
+        choice = construct_trusted(
+            AnswerChoice, {"letter": "A", "text": "  x ", "is_correct": True}
+        )
+        assert choice.letter == "A"
+        assert choice.text == "  x "
+
+
+class TestContentId:
+    """Tests for content_id()."""
+
+    CHOICES = [("a", "True", True), ("b", "False", False)]
+
+    def test_deterministic(self):
+        """Test that the same content gives the same UUID-formatted ID."""
+        first = content_id(QuestionType.TRUE_FALSE, "Q?", self.CHOICES, 1)
+        second = content_id(QuestionType.TRUE_FALSE, "Q?", list(self.CHOICES), 1)
+
+        assert first == second
+        assert [len(group) for group in first.split("-")] == [8, 4, 4, 4, 12]
+
+    @pytest.mark.parametrize(
+        "args",
+        [
+            (QuestionType.MULTIPLE_CHOICE, "Q?", CHOICES, 1),
+            (QuestionType.TRUE_FALSE, "Q2?", CHOICES, 1),
+            (QuestionType.TRUE_FALSE, "Q?", CHOICES, 2),
+            (
+                QuestionType.TRUE_FALSE,
+                "Q?",
+                [("a", "True", False), ("b", "False", True)],
+                1,
+            ),
+        ],
+    )
+    def test_depends_on_content(self, args):
+        """Test that type, text, points and choices all change the ID."""
+        assert content_id(*args) != content_id(
+            QuestionType.TRUE_FALSE, "Q?", self.CHOICES, 1
+        )
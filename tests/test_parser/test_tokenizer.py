@@ -0,0 +1,94 @@
+"""Tests for the quiz tokenizer."""
+
+from text_to_qti.parser.tokenizer import TokenType, fenced_spans, tokenize
+
+
+def _types(content: str):
+    return [token.type for token in tokenize(content)]
+
+
+class TestTokenizer:
+    """Tests for tokenize()."""
+
+    def test_token_types(self):
+        """Test that each line kind is recognised."""
+        content = """## Question 1
+[Type: multiple_choice]
+
+What is 2+2?
+a) 3
+*b) 4
+Feedback: Basic arithmetic.
+"""
+        assert _types(content) == [
+            TokenType.HEADER,
+            TokenType.METADATA,
+            TokenType.BLANK,
+            TokenType.TEXT,
+            TokenType.CHOICE,
+            TokenType.CHOICE,
+            TokenType.FEEDBACK,
+        ]
+
+    def test_offsets_point_into_buffer(self):
+        """Test that token offsets slice the original line."""
+        content = "## Question 12\n*c) Paris\n"
+        header, choice = tokenize(content)
+
+        assert content[header.start : header.end] == "## Question 12"
+        assert header.match.group("number") == "12"
+        assert content[choice.start : choice.end] == "*c) Paris"
+        assert choice.match.group("mark", "letter", "answer") == ("*", "c", "Paris")
+
+    def test_front_matter(self):
+        """Test that the fenced YAML block collapses into one token."""
+        content = "---\ntitle: Quiz\n---\n\n## Question 1\n"
+        tokens = list(tokenize(content))
+
+        assert tokens[0].type == TokenType.FRONT_MATTER
+        assert content[tokens[0].start : tokens[0].end] == "title: Quiz"
+        assert [token.type for token in tokens[1:]] == [
+            TokenType.BLANK,
+            TokenType.HEADER,
+        ]
+
+    def test_unclosed_fence_is_text(self):
+        """Test that a fence without a closing partner is plain text."""
+        assert _types("---\ntitle: Quiz\n") == [TokenType.TEXT, TokenType.TEXT]
+
+    def test_stray_header(self):
+        """Test that malformed question headers are flagged."""
+        assert _types("## Question 1 (bonus)\n## Questions\n") == [
+            TokenType.STRAY_HEADER,
+            TokenType.STRAY_HEADER,
+        ]
+
+    def test_indented_lines(self):
+        """Test that only feedback may be indented."""
+        content = "intro\n  a) Indented\n  [Type: true_false]\n  feedback: ok\n"
+        assert _types(content) == [
+            TokenType.TEXT,
+            TokenType.TEXT,
+            TokenType.TEXT,
+            TokenType.FEEDBACK,
+        ]
+
+    def test_crlf_line_endings(self):
+        """Test that carriage returns do not change classification."""
+        content = "## Question 1\r\n[Points: 2]\r\n*a) True\r\n"
+        assert _types(content) == [
+            TokenType.HEADER,
+            TokenType.METADATA,
+            TokenType.CHOICE,
+        ]
+
+    def test_fenced_spans(self):
+        """Test that fenced blocks are located without a full scan."""
+        content = "---\ntitle: Quiz\n---\n## Question 1\n---\n## Question 2\n---\nQ?\n"
+        second = content.index("---\n## Question 2")
+
+        assert fenced_spans(content) == [
+            (0, content.index("## Question 1")),
+            (second, content.index("Q?")),
+        ]
+        assert fenced_spans("---\ntitle: Quiz\n") == []
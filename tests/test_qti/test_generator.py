@@ -1,11 +1,23 @@
 """Tests for QTI generator."""
 
+import io
 import tempfile
 import zipfile
 from pathlib import Path
 
+import pytest
+from lxml import etree
+
 from text_to_qti.parser.markdown_parser import MarkdownParser
+from text_to_qti.parser.question_bank import QuestionBank
+from text_to_qti.qti import assessment
+from text_to_qti.qti.assessment import AssessmentGenerator
+from text_to_qti.qti.canvas_metadata import CanvasMetadataGenerator
 from text_to_qti.qti.generator import QTIGenerator
+from text_to_qti.qti.item_cache import ItemCache
+from text_to_qti.qti.manifest import ManifestGenerator
+from text_to_qti.qti.utils import element_to_bytes, element_to_string
+from text_to_qti.utils.errors import GenerationError
 
 
 class TestQTIGenerator:
@@ -174,3 +186,272 @@ class TestQTIGenerator:
                 assert "<fieldentry>2.0</fieldentry>" in assessment_content
         finally:
             Path(output_path).unlink(missing_ok=True)
+
+    def test_reuse_items(self, mixed_questions_file: Path):
+        """Test that items of unchanged questions are reused across builds."""
+        parser = MarkdownParser()
+        content = mixed_questions_file.read_text(encoding="utf-8")
+        quiz = parser.reparse_content(content)
+        generator = AssessmentGenerator(reuse_items=True)
+        generator.generate(quiz)
+
+        edited = parser.reparse_content(content.replace("Tokyo", "Kyoto"))
+        assessment = generator.generate(edited)
+
+        assert generator.reused == len(edited.questions) - 1
+        assert etree.tostring(assessment) == etree.tostring(
+            AssessmentGenerator().generate(edited)
+        )
+
+    def test_streaming_package_matches_tree(
+        self, mixed_questions_file: Path, tmp_path: Path
+    ):
+        """Test that streaming the assessment writes the same package."""
+        quiz = MarkdownParser().parse_file(str(mixed_questions_file))
+        tree_path = QTIGenerator(quiz).generate(str(tmp_path / "tree.zip"))
+        stream_path = QTIGenerator(quiz, streaming=True).generate(
+            str(tmp_path / "stream.zip")
+        )
+
+        with zipfile.ZipFile(tree_path) as tree, zipfile.ZipFile(stream_path) as stream:
+            assert stream.namelist() == tree.namelist()
+            for name in tree.namelist():
+                assert stream.read(name) == tree.read(name)
+
+    def test_write_matches_generate(self, mixed_questions_file: Path):
+        """Test that the streamed document equals the serialized tree."""
+        quiz = MarkdownParser().parse_file(str(mixed_questions_file))
+        generator = AssessmentGenerator()
+        output = io.BytesIO()
+        generator.write(quiz, output)
+
+        expected = element_to_string(generator.generate(quiz), with_declaration=True)
+        assert output.getvalue() == expected.encode("utf-8")
+
+    def test_template_renderer_matches_lxml(self):
+        """Test that the template renderer writes the same bytes as lxml."""
+        quiz = MarkdownParser().parse_content(
+            "---\n"
+            'title: Tom & Jerry\'s "<quiz>"\n'
+            "shuffle_answers: true\n"
+            "---\n"
+            "## Question 1\n"
+            "[Type: multiple_choice]\n"
+            "[Points: 3]\n"
+            '[ID: a"b&c]\n'
+            "Is 1 < 2 && 3 > 2?\n"
+            "a) No <b>\n"
+            "*b) Yes – café\n"
+            "\n"
+            'Feedback: See "A & B" ]]>\n'
+            "\n"
+            "## Question 2\n"
+            "[Type: true_false]\n"
+            "Plain\tstatement\n"
+            "*a) True\n"
+            "b) False\n"
+        )
+        outputs = []
+        for renderer in ("lxml", "template"):
+            output = io.BytesIO()
+            AssessmentGenerator(renderer=renderer).write(quiz, output)
+            outputs.append(output.getvalue())
+
+        assert outputs[1] == outputs[0]
+
+    def test_template_renderer_package(
+        self, mixed_questions_file: Path, tmp_path: Path
+    ):
+        """Test that QTIGenerator packages the template rendering unchanged."""
+        quiz = MarkdownParser().parse_file(str(mixed_questions_file))
+        tree_path = QTIGenerator(quiz).generate(str(tmp_path / "tree.zip"))
+        template_path = QTIGenerator(quiz, renderer="template").generate(
+            str(tmp_path / "template.zip")
+        )
+
+        with zipfile.ZipFile(tree_path) as tree, zipfile.ZipFile(
+            template_path
+        ) as template:
+            for name in tree.namelist():
+                assert template.read(name) == tree.read(name)
+
+    def test_template_renderer_rejects_control_characters(self):
+        """Test that invalid XML characters fail as they do with lxml."""
+        quiz = MarkdownParser().parse_content(
+            "## Question 1\n[Type: true_false]\nBell\x07\n*a) True\nb) False\n"
+        )
+
+        with pytest.raises(GenerationError, match="XML compatible"):
+            AssessmentGenerator(renderer="template").write(quiz, io.BytesIO())
+
+    def test_unknown_renderer(self, simple_mc_file: Path):
+        """Test that an unknown renderer is rejected."""
+        quiz = MarkdownParser().parse_file(str(simple_mc_file))
+
+        with pytest.raises(GenerationError, match="Unknown renderer"):
+            QTIGenerator(quiz, renderer="jinja")
+
+    def test_parallel_write_matches_serial(self, monkeypatch):
+        """Test that items rendered across processes are written in order."""
+        monkeypatch.setattr(assessment, "PARALLEL_MIN_QUESTIONS", 2)
+        quiz = MarkdownParser().parse_content(
+            "".join(_question_block(n) for n in range(1, 8))
+        )
+        expected = io.BytesIO()
+        AssessmentGenerator().write(quiz, expected)
+
+        cache = ItemCache()
+        for generator in (
+            AssessmentGenerator(workers=2, chunk_size=3),
+            AssessmentGenerator(renderer="template", workers=3, chunk_size=2),
+            AssessmentGenerator(item_cache=cache, workers=2, chunk_size=3),
+            AssessmentGenerator(item_cache=cache, workers=2, chunk_size=2),
+        ):
+            output = io.BytesIO()
+            generator.write(QuestionBank.from_quiz(quiz), output)
+            assert output.getvalue() == expected.getvalue()
+        assert cache.hits == len(quiz.questions)
+
+    def test_parallel_write_reports_errors(self, monkeypatch):
+        """Test that errors raised in workers fail the generation."""
+        monkeypatch.setattr(assessment, "PARALLEL_MIN_QUESTIONS", 2)
+        quiz = MarkdownParser().parse_content(
+            "".join(_question_block(n) for n in range(1, 5))
+        )
+        quiz.questions[2].choices[0].is_correct = False
+
+        with pytest.raises(GenerationError, match="has no correct answer"):
+            AssessmentGenerator(workers=2, chunk_size=1).write(quiz, io.BytesIO())
+
+    def test_small_quiz_is_written_serially(self, simple_mc_file: Path, monkeypatch):
+        """Test that quizzes below the threshold do not start workers."""
+        quiz = MarkdownParser().parse_file(str(simple_mc_file))
+
+        def fail(*args, **kwargs):
+            raise AssertionError("started workers")
+
+        monkeypatch.setattr(assessment, "ProcessPoolExecutor", fail)
+        output = io.BytesIO()
+        AssessmentGenerator(workers=4).write(quiz, output)
+        assert b"<item " in output.getvalue()
+
+    def test_compact_write(self, mixed_questions_file: Path):
+        """Test that compact output is the tree serialized without whitespace."""
+        quiz = MarkdownParser().parse_file(str(mixed_questions_file))
+        expected = element_to_bytes(
+            AssessmentGenerator().generate(quiz), pretty_print=False
+        )
+
+        cache = ItemCache()
+        AssessmentGenerator(item_cache=cache).write(quiz, io.BytesIO())
+        for generator in (
+            AssessmentGenerator(compact=True),
+            AssessmentGenerator(renderer="template", compact=True),
+            AssessmentGenerator(item_cache=cache, compact=True),
+        ):
+            output = io.BytesIO()
+            generator.write(quiz, output)
+            assert output.getvalue() == expected
+        assert cache.hits == 0
+
+    def test_compact_package(self, mixed_questions_file: Path, tmp_path: Path):
+        """Test that compact packages hold the same documents, minified."""
+        quiz = MarkdownParser().parse_file(str(mixed_questions_file))
+        pretty_path = QTIGenerator(quiz).generate(str(tmp_path / "pretty.zip"))
+        compact_path = QTIGenerator(quiz, compact=True).generate(
+            str(tmp_path / "compact.zip")
+        )
+
+        parser = etree.XMLParser(remove_blank_text=True)
+        with zipfile.ZipFile(pretty_path) as pretty, zipfile.ZipFile(
+            compact_path
+        ) as compact:
+            for name in pretty.namelist():
+                data = compact.read(name)
+                assert b"\n  " not in data
+                assert etree.tostring(
+                    etree.fromstring(data), method="c14n"
+                ) == etree.tostring(
+                    etree.fromstring(pretty.read(name), parser), method="c14n"
+                )
+
+    @pytest.mark.parametrize(
+        "options", [{}, {"streaming": True, "compress_threads": 2}]
+    )
+    def test_generate_to_file_objects(
+        self, mixed_questions_file: Path, tmp_path: Path, options
+    ):
+        """Test writing packages to seekable and non-seekable file objects."""
+        quiz = MarkdownParser(content_ids=True).parse_file(str(mixed_questions_file))
+        generator = QTIGenerator(quiz, reproducible=True, **options)
+        path = generator.generate(str(tmp_path / "quiz.zip"))
+
+        assert generator.generate_bytes() == path.read_bytes()
+
+        class Pipe(io.RawIOBase):
+            """Write-only stream without tell() or seek()."""
+
+            def __init__(self) -> None:
+                self.data = bytearray()
+
+            def writable(self) -> bool:
+                return True
+
+            def write(self, data) -> int:
+                self.data += data
+                return len(data)
+
+        pipe = Pipe()
+        assert generator.generate(pipe) is None
+        with zipfile.ZipFile(path) as expected, zipfile.ZipFile(
+            io.BytesIO(bytes(pipe.data))
+        ) as streamed:
+            assert streamed.testzip() is None
+            assert streamed.namelist() == expected.namelist()
+            for name in expected.namelist():
+                assert streamed.read(name) == expected.read(name)
+
+
+def _question_block(n: int) -> str:
+    """Return a quiz block with an explicit ID."""
+    return (
+        f"## Question {n}\n[Type: multiple_choice]\n[ID: q{n}]\n"
+        f"Question {n} & more?\n*a) Yes\nb) No <{n}>\n\n"
+    )
+
+
+class TestDocumentTemplates:
+    """Tests for the templates of the manifest and Canvas metadata."""
+
+    @pytest.mark.parametrize(
+        "generator", [ManifestGenerator(), CanvasMetadataGenerator()]
+    )
+    def test_render_matches_generate(self, generator):
+        """Test that rendering writes the serialized tree, escaping included."""
+        for front_matter, assessment_id in (
+            ("title: Plain\n", "ASSESSMENT_001"),
+            (
+                'title: Tom & "Jerry" <quiz>\n'
+                "description: 1 < 2\n"
+                "shuffle_answers: true\n",
+                'A&"B\n/C',
+            ),
+        ):
+            quiz = MarkdownParser().parse_content(
+                f"---\n{front_matter}---\n"
+                "## Question 1\n[Type: true_false]\n[Points: 2]\nQ?\n*a) T\nb) F\n"
+            )
+            expected = element_to_string(
+                generator.generate(quiz, assessment_id), with_declaration=True
+            )
+            assert generator.render(quiz, assessment_id) == expected
+
+    def test_render_rejects_control_characters(self):
+        """Test that invalid XML characters fail as they do with lxml."""
+        quiz = MarkdownParser().parse_content(
+            "## Question 1\n[Type: true_false]\nQ?\n*a) T\nb) F\n"
+        )
+        quiz.metadata.title = "Bell\x07"
+
+        with pytest.raises(GenerationError, match="XML compatible"):
+            ManifestGenerator().render(quiz)
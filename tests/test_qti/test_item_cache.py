@@ -0,0 +1,97 @@
+"""Tests for the item fragment cache."""
+
+import io
+import zipfile
+from pathlib import Path
+
+from text_to_qti.parser.markdown_parser import MarkdownParser
+from text_to_qti.parser.question_bank import QuestionBank
+from text_to_qti.qti.assessment import AssessmentGenerator
+from text_to_qti.qti.generator import QTIGenerator
+from text_to_qti.qti.item_cache import ItemCache
+
+
+def _write(generator: AssessmentGenerator, quiz) -> bytes:
+    output = io.BytesIO()
+    generator.write(quiz, output)
+    return output.getvalue()
+
+
+class TestItemCache:
+    """Tests for ItemCache and its use by the generators."""
+
+    def test_key_depends_on_content(self, mixed_questions_file: Path):
+        """Test that keys follow what the item shows."""
+        quiz = MarkdownParser().parse_file(str(mixed_questions_file))
+        question = quiz.questions[0]
+        cache = ItemCache()
+
+        assert cache.key(question) == cache.key(question.model_copy())
+        assert cache.key(question) == cache.key(QuestionBank.from_quiz(quiz)[0])
+        assert cache.key(question) != cache.key(
+            question.model_copy(update={"feedback": "Other"})
+        )
+        assert cache.key(question) != cache.key(quiz.questions[1])
+
+    def test_lru_eviction(self):
+        """Test that the least recently used fragments are evicted."""
+        cache = ItemCache(max_bytes=10)
+        cache.put("a", b"aaaa")
+        cache.put("b", b"bbbb")
+        assert cache.get("a") == b"aaaa"
+        cache.put("c", b"cccc")
+
+        assert cache.get("b") is None
+        assert cache.get("a") == b"aaaa"
+        assert cache.get("c") == b"cccc"
+        assert len(cache) == 2
+
+    def test_directory_outlives_eviction(self, tmp_path: Path):
+        """Test that fragments in the directory are found by later caches."""
+        cache = ItemCache(max_bytes=1, directory=tmp_path)
+        cache.put("a", b"aaaa")
+        assert len(cache) == 0
+
+        assert ItemCache(directory=tmp_path).get("a") == b"aaaa"
+        cache.clear()
+        assert ItemCache(directory=tmp_path).get("a") is None
+
+    def test_cached_write_matches(self, mixed_questions_file: Path):
+        """Test that cached items are written unchanged by both renderers."""
+        quiz = MarkdownParser().parse_file(str(mixed_questions_file))
+        expected = _write(AssessmentGenerator(), quiz)
+        cache = ItemCache()
+
+        assert _write(AssessmentGenerator(item_cache=cache), quiz) == expected
+        assert cache.misses == len(quiz.questions)
+        generator = AssessmentGenerator(renderer="template", item_cache=cache)
+        assert _write(generator, quiz) == expected
+        assert cache.hits == len(quiz.questions)
+
+    def test_hit_skips_rendering(self, mixed_questions_file: Path, monkeypatch):
+        """Test that items in the cache are not rendered again."""
+        quiz = MarkdownParser().parse_file(str(mixed_questions_file))
+        generator = AssessmentGenerator(item_cache=ItemCache())
+        expected = _write(generator, quiz)
+
+        def fail(*args, **kwargs):
+            raise AssertionError("rendered again")
+
+        monkeypatch.setattr(generator, "_create_item", fail)
+        assert _write(generator, quiz) == expected
+
+    def test_package_matches(self, mixed_questions_file: Path, tmp_path: Path):
+        """Test that QTIGenerator writes the same package with a cache."""
+        quiz = MarkdownParser().parse_file(str(mixed_questions_file))
+        plain_path = QTIGenerator(quiz).generate(str(tmp_path / "plain.zip"))
+        cache = ItemCache()
+        for _ in range(2):
+            cached_path = QTIGenerator(quiz, item_cache=cache).generate(
+                str(tmp_path / "cached.zip")
+            )
+
+        with zipfile.ZipFile(plain_path) as plain, zipfile.ZipFile(
+            cached_path
+        ) as cached:
+            for name in plain.namelist():
+                assert cached.read(name) == plain.read(name)
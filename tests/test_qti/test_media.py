@@ -0,0 +1,209 @@
+"""Tests for bundling the images quizzes reference."""
+
+import io
+import zipfile
+import zlib
+from pathlib import Path
+
+import pytest
+from lxml import etree
+
+from text_to_qti.parser.markdown_parser import MarkdownParser
+from text_to_qti.parser.question_bank import QuestionBank
+from text_to_qti.qti.generator import QTIGenerator
+from text_to_qti.qti.media import FILE_BASE, MediaResolver
+from text_to_qti.qti.package_builder import PackageBuilder
+from text_to_qti.qti.sharding import ShardedGenerator
+from text_to_qti.utils.errors import GenerationError
+
+ASSESSMENT = "ASSESSMENT_001/ASSESSMENT_001.xml"
+MANIFEST_NS = {"m": "http://www.imsglobal.org/xsd/imsccv1p1/imscp_v1p1"}
+
+# Not a valid image, but stored like one
+PNG = b"\x89PNG\r\n\x1a\n" + bytes(range(256)) * 8
+SVG = b'<svg xmlns="http://www.w3.org/2000/svg">' + b"<g/>" * 500 + b"</svg>"
+
+
+@pytest.fixture
+def media_dir(tmp_path: Path) -> Path:
+    """Return a directory of images, one of them copied under another name."""
+    directory = tmp_path / "quiz"
+    (directory / "img").mkdir(parents=True)
+    (directory / "img" / "plot.png").write_bytes(PNG)
+    (directory / "img" / "plot copy.png").write_bytes(PNG)
+    (directory / "img" / "tree.svg").write_bytes(SVG)
+    return directory
+
+
+def _quiz(*texts: str):
+    """Parse a quiz with a question of each text, with feedback."""
+    blocks = [
+        f"## Question {n}\n[Type: true_false]\n[ID: q{n}]\n{text}\n"
+        f"*a) True\nb) False\n\nFeedback: See ![plot](img/plot.png)\n\n"
+        for n, text in enumerate(texts, 1)
+    ]
+    return MarkdownParser().parse_content("---\ntitle: Media\n---\n" + "".join(blocks))
+
+
+class TestMediaResolver:
+    """Tests for MediaResolver."""
+
+    def test_rewrite(self, media_dir: Path):
+        """Test that local references are rewritten and others left alone."""
+        resolver = MediaResolver(media_dir)
+        files = {}
+        text = (
+            '<img alt="p" src="img/plot.png"> <IMG SRC=\'img/tree.svg\'> '
+            '![copy](<img/plot%20copy.png> "Copy") '
+            '<img src="https://example.com/a.png"> ![data](data:image/png;base64,AA)'
+        )
+        rewritten = resolver.rewrite(text, files)
+
+        png, svg = files.values()
+        assert png.href == f"web_resources/media/{png.digest}/plot.png"
+        assert (png.size, png.crc) == (len(PNG), zlib.crc32(PNG))
+        assert png.stored and not svg.stored
+        assert rewritten == (
+            f'<img alt="p" src="{png.reference}"> <IMG SRC=\'{svg.reference}\'> '
+            f'![copy]({png.reference} "Copy") '
+            '<img src="https://example.com/a.png"> ![data](data:image/png;base64,AA)'
+        )
+        assert png.reference == f"{FILE_BASE}/media/{png.digest}/plot.png"
+        # Already rewritten references are kept, with their files
+        again = {}
+        assert resolver.rewrite(rewritten, again) == rewritten
+        assert list(again.values()) == [png, svg]
+
+    @pytest.mark.parametrize("bank", [False, True])
+    def test_bundle(self, media_dir: Path, bank: bool):
+        """Test that questions and feedback of quizzes and banks are rewritten."""
+        quiz = _quiz('<img src="img/tree.svg">', "No images here")
+        source = QuestionBank.from_quiz(quiz) if bank else quiz
+
+        bundled, files = MediaResolver(media_dir).bundle(source)
+        assert isinstance(bundled, QuestionBank) == bank
+        assert [media.path.name for media in files] == ["tree.svg", "plot.png"]
+        first, second = bundled.questions[0], bundled.questions[1]
+        assert first.text == f'<img src="{files[0].reference}">'
+        assert first.feedback == second.feedback == f"See ![plot]({files[1].reference})"
+        assert second.text == "No images here"
+        # The original is unchanged
+        assert quiz.questions[0].text == '<img src="img/tree.svg">'
+
+    def test_no_images(self, media_dir: Path):
+        """Test that a quiz without local images is returned as is."""
+        quiz = MarkdownParser().parse_content(
+            "---\ntitle: T\n---\n## Question 1\n[Type: true_false]\n"
+            '<img src="/courses/1/files/2">\n*a) True\nb) False\n'
+        )
+        assert MediaResolver(media_dir).bundle(quiz) == (quiz, [])
+
+    def test_missing_image(self, media_dir: Path):
+        """Test that a missing file is reported with its question."""
+        with pytest.raises(GenerationError, match="q2: Image not found: img/no.png"):
+            MediaResolver(media_dir).bundle(_quiz("Fine", '<img src="img/no.png">'))
+
+    @pytest.mark.parametrize(
+        "reference",
+        [
+            "![x](../secret.png)",
+            "![x](img/../../secret.png)",
+            "![x](img%2F..%2F..%2Fsecret.png)",
+            '<img src="../secret.png">',
+        ],
+    )
+    def test_parent_reference(self, media_dir: Path, reference: str):
+        """Test that references leaving the base directory are rejected."""
+        (media_dir.parent / "secret.png").write_bytes(PNG)
+        with pytest.raises(GenerationError, match="outside the quiz directory"):
+            MediaResolver(media_dir).bundle(_quiz(reference))
+
+    def test_symlink_escape(self, media_dir: Path):
+        """Test that symbolic links leading outside the directory are rejected."""
+        (media_dir.parent / "secret.png").write_bytes(PNG)
+        try:
+            (media_dir / "img" / "link.png").symlink_to(media_dir.parent / "secret.png")
+        except (NotImplementedError, OSError):
+            pytest.skip("Symbolic links are not supported")
+
+        with pytest.raises(GenerationError, match="outside the quiz directory"):
+            MediaResolver(media_dir).bundle(_quiz("![x](img/link.png)"))
+        # Links within the directory are followed
+        (media_dir / "img" / "inner.png").symlink_to(media_dir / "img" / "plot.png")
+        _, files = MediaResolver(media_dir).bundle(_quiz("![x](img/inner.png)"))
+        assert [media.size for media in files] == [len(PNG)]
+
+
+class TestMediaPackages:
+    """Tests for packages with bundled media."""
+
+    def test_package(self, media_dir: Path, tmp_path: Path):
+        """Test that files are bundled once, with manifest resources."""
+        quiz = _quiz('<img src="img/plot copy.png">', '<img src="img/tree.svg">')
+        path = QTIGenerator(quiz, media=MediaResolver(media_dir)).generate(
+            tmp_path / "quiz.zip"
+        )
+
+        with zipfile.ZipFile(path) as zf:
+            assert zf.testzip() is None
+            media = [info for info in zf.infolist() if info.filename.startswith("web")]
+            assert [info.filename.rsplit("/", 1)[1] for info in media] == [
+                "plot copy.png",
+                "tree.svg",
+            ]
+            assert [info.compress_type for info in media] == [
+                zipfile.ZIP_STORED,
+                zipfile.ZIP_DEFLATED,
+            ]
+            assert zf.read(media[0]) == PNG
+            assert zf.read(media[1]) == SVG
+            assert "$IMS-CC-FILEBASE$/media/" in zf.read(ASSESSMENT).decode("utf-8")
+
+            manifest = etree.fromstring(zf.read("imsmanifest.xml"))
+            resources = manifest.findall(
+                ".//m:resource[@type='webcontent']", MANIFEST_NS
+            )
+            assert [r.find("m:file", MANIFEST_NS).get("href") for r in resources] == [
+                info.filename for info in media
+            ]
+
+    def test_package_builder_dedupes(self, media_dir: Path):
+        """Test that files shared by quizzes are bundled once."""
+        quizzes = [_quiz("One"), _quiz('<img src="img/tree.svg">')]
+        data = PackageBuilder(quizzes, media=MediaResolver(media_dir)).generate_bytes()
+
+        with zipfile.ZipFile(io.BytesIO(data)) as zf:
+            names = [name for name in zf.namelist() if name.startswith("web")]
+        assert [name.rsplit("/", 1)[1] for name in names] == ["plot.png", "tree.svg"]
+
+    def test_shards_bundle_their_files(self, media_dir: Path, tmp_path: Path):
+        """Test that each shard holds only the files its questions use."""
+        quiz = _quiz("One", '<img src="img/tree.svg">')
+        quiz.questions[0].feedback = None
+        summary = ShardedGenerator(
+            quiz, max_items=1, media=MediaResolver(media_dir)
+        ).generate(tmp_path / "quiz.zip")
+
+        files = []
+        for shard in summary.shards:
+            with zipfile.ZipFile(shard.path) as zf:
+                files.append(
+                    [n.rsplit("/", 1)[1] for n in zf.namelist() if n.startswith("web")]
+                )
+        assert files == [[], ["tree.svg", "plot.png"]]
+
+    def test_update_reuses_media(self, media_dir: Path, tmp_path: Path):
+        """Test that unchanged files are copied from the previous package."""
+        quiz = _quiz('<img src="img/tree.svg">')
+        resolver = MediaResolver(media_dir)
+        path = QTIGenerator(quiz, media=resolver, compress_level=9).generate(
+            tmp_path / "quiz.zip"
+        )
+        with zipfile.ZipFile(path) as zf:
+            sizes = {info.filename: info.compress_size for info in zf.infolist()}
+
+        QTIGenerator(quiz, media=resolver, compress_level=0, update=True).generate(path)
+        with zipfile.ZipFile(path) as zf:
+            assert zf.testzip() is None
+            for info in zf.infolist():
+                assert info.compress_size == sizes[info.filename]
@@ -0,0 +1,113 @@
+"""Tests for packages holding several quizzes."""
+
+import io
+import zipfile
+from pathlib import Path
+from typing import List
+
+import pytest
+from lxml import etree
+
+from text_to_qti.parser.markdown_parser import MarkdownParser
+from text_to_qti.parser.question_bank import QuestionBank
+from text_to_qti.parser.question_models import Quiz
+from text_to_qti.qti.assessment import AssessmentGenerator
+from text_to_qti.qti.generator import QTIGenerator
+from text_to_qti.qti.item_cache import ItemCache
+from text_to_qti.qti.package_builder import PackageBuilder
+from text_to_qti.qti.utils import element_to_bytes
+from text_to_qti.utils.errors import GenerationError
+
+MANIFEST_NS = {"m": "http://www.imsglobal.org/xsd/imsccv1p1/imscp_v1p1"}
+
+
+@pytest.fixture
+def quizzes(
+    simple_mc_file: Path, simple_tf_file: Path, mixed_questions_file: Path
+) -> List[Quiz]:
+    """Return the fixture quizzes, with IDs derived from content."""
+    parser = MarkdownParser(content_ids=True)
+    return [
+        parser.parse_file(str(path))
+        for path in (simple_mc_file, simple_tf_file, mixed_questions_file)
+    ]
+
+
+class TestPackageBuilder:
+    """Tests for PackageBuilder."""
+
+    def test_package_structure(self, quizzes: List[Quiz]):
+        """Test that every quiz gets its own uniquely named resources."""
+        data = PackageBuilder(quizzes, title="Course").generate_bytes()
+
+        with zipfile.ZipFile(io.BytesIO(data)) as zf:
+            assert zf.namelist() == [
+                "imsmanifest.xml",
+                "ASSESSMENT_001/ASSESSMENT_001.xml",
+                "ASSESSMENT_001/assessment_meta.xml",
+                "ASSESSMENT_002/ASSESSMENT_002.xml",
+                "ASSESSMENT_002/assessment_meta.xml",
+                "ASSESSMENT_003/ASSESSMENT_003.xml",
+                "ASSESSMENT_003/assessment_meta.xml",
+            ]
+            manifest = etree.fromstring(zf.read("imsmanifest.xml"))
+            resources = manifest.findall(".//m:resource", MANIFEST_NS)
+            assert [r.get("identifier") for r in resources] == [
+                "ASSESSMENT_001",
+                "ASSESSMENT_META_001",
+                "ASSESSMENT_002",
+                "ASSESSMENT_META_002",
+                "ASSESSMENT_003",
+                "ASSESSMENT_META_003",
+            ]
+            assert "Course" in zf.read("imsmanifest.xml").decode("utf-8")
+
+            for n, quiz in enumerate(quizzes, 1):
+                assessment_id = f"ASSESSMENT_{n:03d}"
+                expected = AssessmentGenerator().generate(quiz, assessment_id)
+                assert zf.read(f"{assessment_id}/{assessment_id}.xml") == (
+                    element_to_bytes(expected)
+                )
+                metadata = etree.fromstring(
+                    zf.read(f"{assessment_id}/assessment_meta.xml")
+                )
+                assert metadata.get("identifier") == assessment_id
+                assert metadata.findtext("{*}title") == quiz.metadata.title
+
+    def test_single_quiz_matches_qti_generator(self, quizzes: List[Quiz]):
+        """Test that a package of one quiz is the usual package."""
+        builder = PackageBuilder([quizzes[2]], reproducible=True)
+        generator = QTIGenerator(quizzes[2], reproducible=True)
+        assert builder.generate_bytes() == generator.generate_bytes()
+
+    @pytest.mark.parametrize("renderer", ["lxml", "template"])
+    def test_parallel_matches_serial(
+        self, quizzes: List[Quiz], tmp_path: Path, renderer: str
+    ):
+        """Test that rendering quizzes across processes writes the same bytes."""
+        sources = quizzes + [QuestionBank.from_quiz(quizzes[2])]
+        serial = PackageBuilder(sources, renderer=renderer, reproducible=True)
+        parallel = PackageBuilder(
+            sources,
+            renderer=renderer,
+            item_cache=ItemCache(directory=tmp_path / "items"),
+            workers=2,
+            reproducible=True,
+        )
+        assert parallel.generate_bytes() == serial.generate_bytes()
+        assert list((tmp_path / "items").iterdir())
+
+    def test_parallel_errors(self, quizzes: List[Quiz]):
+        """Test that errors in worker processes are reported."""
+        broken = quizzes[0].model_copy(deep=True)
+        for choice in broken.questions[0].choices:
+            choice.is_correct = False
+
+        builder = PackageBuilder([quizzes[1], broken], renderer="template", workers=2)
+        with pytest.raises(GenerationError, match="has no correct answer"):
+            builder.generate_bytes()
+
+    def test_no_quizzes(self):
+        """Test that an empty package is rejected."""
+        with pytest.raises(GenerationError, match="No quizzes"):
+            PackageBuilder([])
@@ -0,0 +1,184 @@
+"""Tests for sharding large quizzes into several packages."""
+
+import zipfile
+from pathlib import Path
+
+import pytest
+
+from text_to_qti.parser.markdown_parser import MarkdownParser
+from text_to_qti.parser.question_bank import QuestionBank
+from text_to_qti.qti.generator import QTIGenerator
+from text_to_qti.qti.sharding import ShardedGenerator
+from text_to_qti.qti.templates import render_item_bytes
+from text_to_qti.utils.errors import GenerationError
+
+ASSESSMENT = "ASSESSMENT_001/ASSESSMENT_001.xml"
+
+
+def _quiz(count: int):
+    """Parse a quiz of ``count`` questions of varying length."""
+    blocks = [
+        f"## Question {n}\n[Type: multiple_choice]\n[ID: q{n}]\n"
+        f"Question {n}{' long' * (n % 5 * 40)}?\n*a) Yes\nb) No\n\n"
+        for n in range(1, count + 1)
+    ]
+    return MarkdownParser().parse_content("---\ntitle: Bank\n---\n" + "".join(blocks))
+
+
+class TestShardedGenerator:
+    """Tests for ShardedGenerator."""
+
+    def test_plan_by_items(self):
+        """Test splitting by question count."""
+        assert ShardedGenerator(_quiz(7), max_items=3).plan() == [
+            (0, 3),
+            (3, 6),
+            (6, 7),
+        ]
+
+    @pytest.mark.parametrize("compact", [False, True])
+    def test_shards_by_bytes(self, tmp_path: Path, compact: bool):
+        """Test that shards stay under the byte limit and are packed fully."""
+        quiz = _quiz(30)
+        max_bytes = 12_000
+        summary = ShardedGenerator(quiz, max_bytes=max_bytes, compact=compact).generate(
+            tmp_path / "bank.zip"
+        )
+
+        assert len(summary.shards) > 2
+        ranges = ShardedGenerator(quiz, max_bytes=max_bytes, compact=compact).plan()
+        assert ranges[0][0] == 0 and ranges[-1][1] == len(quiz.questions)
+        for shard, (start, stop) in zip(summary.shards, ranges):
+            with zipfile.ZipFile(shard.path) as zf:
+                size = zf.getinfo(ASSESSMENT).file_size
+            assert size <= max_bytes
+            if stop < len(quiz.questions):
+                # The next question would not have fit, given the room kept
+                # for the longest shard title
+                item = render_item_bytes(quiz.questions[stop], not compact)
+                assert size + len(item) > max_bytes - len(" (30/30)")
+
+    def test_summary(self, tmp_path: Path):
+        """Test shard paths, titles and the question map."""
+        quiz = _quiz(25)
+        summary = ShardedGenerator(quiz, max_items=10).generate(
+            str(tmp_path / "bank.zip")
+        )
+
+        assert [shard.path.name for shard in summary.shards] == [
+            "bank-1.zip",
+            "bank-2.zip",
+            "bank-3.zip",
+        ]
+        assert [shard.title for shard in summary.shards] == [
+            "Bank (1/3)",
+            "Bank (2/3)",
+            "Bank (3/3)",
+        ]
+        assert summary.question_shards["q1"] == 1
+        assert summary.question_shards["q25"] == 3
+        assert list(summary.question_shards) == [q.id for q in quiz.questions]
+        assert summary.to_dict()["shards"][2] == {
+            "number": 3,
+            "path": str(tmp_path / "bank-3.zip"),
+            "title": "Bank (3/3)",
+            "questions": 5,
+        }
+        with zipfile.ZipFile(summary.shards[1].path) as zf:
+            assessment = zf.read(ASSESSMENT).decode("utf-8")
+        assert 'title="Bank (2/3)"' in assessment
+        assert 'ident="q11"' in assessment and 'ident="q10"' not in assessment
+
+    def test_single_shard(self, tmp_path: Path):
+        """Test that a quiz within the limits is packaged as usual."""
+        quiz = _quiz(5)
+        summary = ShardedGenerator(quiz, max_items=10, reproducible=True).generate(
+            tmp_path / "bank.zip"
+        )
+
+        assert [(s.path, s.title) for s in summary.shards] == [
+            (tmp_path / "bank.zip", "Bank")
+        ]
+        expected = QTIGenerator(quiz, reproducible=True).generate_bytes()
+        assert (tmp_path / "bank.zip").read_bytes() == expected
+
+    def test_parallel_matches_serial(self, tmp_path: Path):
+        """Test that shards generated across processes are the same."""
+        bank = QuestionBank.from_quiz(_quiz(25))
+        serial = ShardedGenerator(bank, max_items=10, reproducible=True).generate(
+            tmp_path / "serial" / "bank.zip"
+        )
+        parallel = ShardedGenerator(
+            bank, max_items=10, workers=2, reproducible=True
+        ).generate(tmp_path / "parallel" / "bank.zip")
+
+        for a, b in zip(serial.shards, parallel.shards):
+            assert a.path.read_bytes() == b.path.read_bytes()
+
+    def test_stale_shards_removed(self, tmp_path: Path):
+        """Test that shards of an earlier run with more shards are removed."""
+        quiz = _quiz(10)
+        ShardedGenerator(quiz, max_items=3).generate(tmp_path / "bank.zip")
+        (tmp_path / "bank-2024.zip").write_bytes(b"kept")
+
+        summary = ShardedGenerator(quiz, max_items=5).generate(tmp_path / "bank.zip")
+        assert summary.removed == [tmp_path / "bank-3.zip", tmp_path / "bank-4.zip"]
+        assert sorted(path.name for path in tmp_path.iterdir()) == [
+            "bank-1.zip",
+            "bank-2.zip",
+            "bank-2024.zip",
+            "bank.shards.json",
+        ]
+
+        summary = ShardedGenerator(quiz, max_items=10).generate(tmp_path / "bank.zip")
+        assert summary.removed == [tmp_path / "bank-1.zip", tmp_path / "bank-2.zip"]
+        assert (tmp_path / "bank-2024.zip").read_bytes() == b"kept"
+
+    def test_unlisted_files_kept(self, tmp_path: Path):
+        """Test that files no summary lists are kept, whatever their names."""
+        for name in ("bank-1.zip", "bank-7.zip", "bank-2024.zip"):
+            (tmp_path / name).write_bytes(b"kept")
+        # A summary can only name shards of the output path
+        (tmp_path / "bank.shards.json").write_text(
+            '{"shards": [{"path": "../bank-9.zip"}, {"path": "other.zip"}]}'
+        )
+        (tmp_path / "other.zip").write_bytes(b"kept")
+
+        summary = ShardedGenerator(_quiz(4), max_items=2).generate(
+            tmp_path / "bank.zip"
+        )
+        assert summary.removed == []
+        for name in ("bank-7.zip", "bank-2024.zip", "other.zip"):
+            assert (tmp_path / name).read_bytes() == b"kept"
+
+    def test_generator_options(self, tmp_path: Path, monkeypatch):
+        """Test that the QTI version and streaming reach each shard."""
+        seen = []
+
+        def generate(self, output_path=None):
+            seen.append((self.version, self.streaming))
+
+        monkeypatch.setattr(QTIGenerator, "generate", generate)
+        ShardedGenerator(_quiz(4), max_items=2, version="2.1", streaming=True).generate(
+            tmp_path / "bank.zip"
+        )
+        assert seen == [("2.1", True), ("2.1", True)]
+
+    def test_streaming_matches(self, tmp_path: Path):
+        """Test that streamed shards hold the same documents."""
+        quiz = _quiz(6)
+        plain, streamed = (
+            ShardedGenerator(quiz, max_items=4, streaming=streaming).generate(
+                tmp_path / str(streaming) / "bank.zip"
+            )
+            for streaming in (False, True)
+        )
+        for a, b in zip(plain.shards, streamed.shards):
+            with zipfile.ZipFile(a.path) as za, zipfile.ZipFile(b.path) as zb:
+                assert za.namelist() == zb.namelist()
+                assert za.read(ASSESSMENT) == zb.read(ASSESSMENT)
+
+    def test_invalid_limit(self):
+        """Test that limits below 1 are rejected."""
+        with pytest.raises(GenerationError, match="max_items"):
+            ShardedGenerator(_quiz(2), max_items=0)
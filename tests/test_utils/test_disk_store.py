@@ -0,0 +1,70 @@
+"""Tests for the directory store shared by the on-disk caches."""
+
+import os
+from pathlib import Path
+
+import pytest
+
+from text_to_qti.utils.disk_store import DiskStore
+
+
+@pytest.fixture
+def store(tmp_path: Path) -> DiskStore:
+    """Return an empty store."""
+    return DiskStore(tmp_path / "store", ".entry")
+
+
+class TestDiskStore:
+    """Tests for DiskStore."""
+
+    def test_round_trip(self, store: DiskStore):
+        """Test that entries are written whole, without temporary files."""
+        assert store.read("a") is None
+        assert store.write("a", b"first")
+        assert store.write("a", b"second")
+
+        assert store.read("a") == b"second"
+        assert [path.name for path in store.directory.iterdir()] == ["a.entry"]
+
+    def test_read_records_use(self, store: DiskStore):
+        """Test that reading an entry makes it the most recently used."""
+        store.write("a", b"aaaa")
+        os.utime(store.path("a"), (1000, 1000))
+        store.read("a")
+        assert store.path("a").stat().st_mtime > 1000
+
+    def test_read_when_touch_fails(self, store: DiskStore, monkeypatch):
+        """Test that an entry is returned when its use cannot be recorded."""
+        store.write("a", b"aaaa")
+
+        def fail(*args, **kwargs):
+            raise PermissionError("read-only")
+
+        monkeypatch.setattr(os, "utime", fail)
+        assert store.read("a") == b"aaaa"
+
+    def test_evict_least_recently_used(self, store: DiskStore):
+        """Test that the oldest entries go until the total fits."""
+        for age, key in enumerate("abc"):
+            store.write(key, b"x" * 10)
+            os.utime(store.path(key), (1000 + age, 1000 + age))
+        store.read("a")
+
+        store.evict(20)
+        assert sorted(path.stem for path in store.directory.iterdir()) == ["a", "c"]
+
+    def test_other_files_untouched(self, store: DiskStore):
+        """Test that files without the suffix are not counted or removed."""
+        other = store.directory / "other.quiz"
+        other.write_bytes(b"y" * 100)
+        store.write("a", b"x")
+
+        store.evict(1)
+        assert store.read("a") == b"x"
+        store.clear()
+        assert list(store.directory.iterdir()) == [other]
+
+    def test_write_failure(self, store: DiskStore):
+        """Test that a failed write is reported, not raised."""
+        store.directory.rmdir()
+        assert not store.write("a", b"x")